@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""Benchmarks filters, aggregates and sorts over the numeric attributes
+of Places, run on the objects and on the column store.
+
+Usage: ./benchmarks/bench_columns.py [number_of_objects] [repeat]
+
+Runs in a temporary directory, so the file.json of the project is
+never touched. It stores `number_of_objects` Places with random values
+and prints the best of `repeat` runs of each query, as a loop over
+storage.all(Place) and through storage.columns(Place). The column store
+uses NumPy if it can be imported; pass -a as the first argument to run
+it on array.array only.
+"""
+import os
+import sys
+import atexit
+import random
+import shutil
+import tempfile
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+atexit.register(shutil.rmtree, os.getcwd(), True)
+
+from models import storage  # noqa: E402
+from models.engine import columns  # noqa: E402
+from models.place import Place  # noqa: E402
+
+QUERIES = [
+    ("price < 100 and guests >= 4",
+     lambda objs: [o for o in objs
+                   if o.price_by_night < 100 and o.max_guest >= 4],
+     lambda store: store.select(("price_by_night", "<", 100),
+                                ("max_guest", ">=", 4))),
+    ("mean price of 3+ rooms",
+     lambda objs: (lambda v: sum(v) / len(v))(
+         [o.price_by_night for o in objs if o.number_rooms >= 3]),
+     lambda store: store.aggregate("mean", "price_by_night",
+                                   ("number_rooms", ">=", 3))),
+    ("max latitude",
+     lambda objs: max(o.latitude for o in objs),
+     lambda store: store.aggregate("max", "latitude")),
+    ("10 cheapest",
+     lambda objs: sorted(objs, key=lambda o: o.price_by_night)[:10],
+     lambda store: store.sort("price_by_night", limit=10)),
+    ("all by price",
+     lambda objs: sorted(objs, key=lambda o: o.price_by_night),
+     lambda store: store.sort("price_by_night")),
+]
+
+
+def main(count, times):
+    """Stores count Places and prints the time of every query."""
+    rand = random.Random(98)
+    for i in range(count):
+        storage.new(Place.from_dict({
+            "price_by_night": rand.randrange(20, 500),
+            "max_guest": rand.randrange(1, 10),
+            "number_rooms": rand.randrange(1, 6),
+            "latitude": rand.uniform(-90, 90),
+            "longitude": rand.uniform(-180, 180)}))
+    store = storage.columns(Place)
+    backend = "array" if columns.numpy is None else "numpy"
+    print("{} places, best of {}, columns on {}".format(
+        count, times, backend))
+    print("  {:<30} {:>10} {:>10}".format("query", "objects", "columns"))
+    for name, scan, query in QUERIES:
+        objs = storage.all(Place).values()
+        slow = min(repeat(lambda: scan(objs), number=1, repeat=times))
+        fast = min(repeat(lambda: query(store), number=1, repeat=times))
+        print("  {:<30} {:8.2f}ms {:8.2f}ms".format(name, slow * 1e3,
+                                                    fast * 1e3))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if len(args) > 0 and args[0] == "-a":
+        columns.numpy = None
+        args = args[1:]
+    count = int(args[0]) if len(args) > 0 else 100000
+    times = int(args[1]) if len(args) > 1 else 5
+    main(count, times)
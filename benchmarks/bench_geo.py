@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""Benchmarks storage.nearby() and storage.within() against computing
+the distance of every Place.
+
+Usage: ./benchmarks/bench_geo.py [number_of_objects] [repeat]
+
+Runs in a temporary directory, so the file.json of the project is
+never touched. It stores `number_of_objects` Places, half of them
+spread over the world and half around a few cities, and prints the
+time to build the spatial index and the best of `repeat` runs of each
+search, as a scan and through the index.
+"""
+import os
+import sys
+import atexit
+import random
+import shutil
+import tempfile
+from time import perf_counter
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+atexit.register(shutil.rmtree, os.getcwd(), True)
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.engine.geo import distance, in_box  # noqa: E402
+
+CITIES = [(48.8566, 2.3522), (40.7128, -74.0060), (35.6762, 139.6503),
+          (-33.8688, 151.2093), (-1.2921, 36.8219)]
+
+
+def scan_nearby(lat, lng, km):
+    """Returns the Places within km of the point, by scanning."""
+    found = []
+    for obj in storage.all(Place).values():
+        dist = distance(lat, lng, obj.latitude, obj.longitude)
+        if dist <= km:
+            found.append((dist, obj))
+    found.sort(key=lambda item: item[0])
+    return [obj for dist, obj in found]
+
+
+def scan_within(south, west, north, east):
+    """Returns the Places inside the box, by scanning."""
+    return [obj for obj in storage.all(Place).values()
+            if in_box((obj.latitude, obj.longitude), south, west, north,
+                      east)]
+
+
+SEARCHES = [
+    ("within 5 km of Paris",
+     lambda: scan_nearby(48.8566, 2.3522, 5),
+     lambda: storage.nearby(Place, 48.8566, 2.3522, 5)),
+    ("within 50 km of Nairobi",
+     lambda: scan_nearby(-1.2921, 36.8219, 50),
+     lambda: storage.nearby(Place, -1.2921, 36.8219, 50)),
+    ("within 100 km in the Pacific",
+     lambda: scan_nearby(0.0, -150.0, 100),
+     lambda: storage.nearby(Place, 0.0, -150.0, 100)),
+    ("box around Manhattan",
+     lambda: scan_within(40.70, -74.02, 40.80, -73.93),
+     lambda: storage.within(Place, 40.70, -74.02, 40.80, -73.93)),
+]
+
+
+def main(count, times):
+    """Stores count Places and prints the time of every search."""
+    rand = random.Random(98)
+    for i in range(count):
+        if i % 2 == 0:
+            lat, lng = rand.uniform(-90, 90), rand.uniform(-180, 180)
+        else:
+            lat, lng = rand.choice(CITIES)
+            lat, lng = rand.gauss(lat, 0.3), rand.gauss(lng, 0.3)
+        storage.new(Place.from_dict({"latitude": lat, "longitude": lng}))
+    start = perf_counter()
+    storage.within(Place, 0, 0, 0, 0)
+    print("{} places, index built in {:.2f}s, best of {}".format(
+        count, perf_counter() - start, times))
+    print("  {:<32} {:>10} {:>10} {:>8}".format("search", "scan", "index",
+                                                "found"))
+    for name, scan, search in SEARCHES:
+        slow = min(repeat(scan, number=1, repeat=times))
+        fast = min(repeat(search, number=1, repeat=times))
+        print("  {:<32} {:8.2f}ms {:8.2f}ms {:8}".format(
+            name, slow * 1e3, fast * 1e3, len(search())))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    times = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    main(count, times)
@@ -0,0 +1,122 @@
+#!/usr/bin/python3
+"""Benchmarks the keys of the FileStorage object map.
+
+Usage: ./benchmarks/bench_keys.py [number_of_objects] [repeat]
+
+Runs in a temporary directory, so the file.json of the project is
+never touched. It prints the memory taken per key by the current
+"<class name>.<id>" strings and by the compact representations that
+were considered, then the best time per lookup of `repeat` runs over
+`number_of_objects` Places, through storage.get() and the console.
+"""
+import os
+import sys
+import atexit
+import shutil
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+from timeit import repeat
+from uuid import UUID
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+atexit.register(shutil.rmtree, os.getcwd(), True)
+
+from console import my_command, parse  # noqa: E402
+from models import storage  # noqa: E402
+from models.base_model import classes  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def key_size(make, ids):
+    """Returns the bytes per key taken by the keys make() builds for
+    ids."""
+    tracemalloc.start()
+    try:
+        keys = [make(id) for id in ids]
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (size - sys.getsizeof(keys)) / len(keys)
+
+
+def legacy_get(ids):
+    """Returns a function looking ids up the way get() did, building
+    keys with str.format()."""
+    objs = storage.all()
+
+    def run():
+        for id in ids:
+            objs.get("{}.{}".format("Place", id))
+    return run
+
+
+def get(ids):
+    """Returns a function looking ids up through storage.get()."""
+    def run():
+        for id in ids:
+            storage.get("Place", id)
+    return run
+
+
+class legacy_command(my_command):
+    """The console with the original do_show(), looking the object up
+    once to check the id and once to print it."""
+
+    def do_show(self, arg):
+        args_lst = parse(arg)
+        if len(args_lst) == 0:
+            print("** class name missing **")
+        elif args_lst[0] not in classes:
+            print("** class doesn't exist **")
+        elif len(args_lst) == 1:
+            print("** instance id missing **")
+        elif storage.get(args_lst[0], args_lst[1]) is None:
+            print("** no instance found **")
+        else:
+            print(storage.get(args_lst[0], args_lst[1]))
+
+
+def show(cmd, ids, out):
+    """Returns a function running the show command of cmd on ids."""
+
+    def run():
+        with redirect_stdout(out):
+            for id in ids:
+                cmd.onecmd("show Place " + id)
+    return run
+
+
+def main(count, times):
+    """Fills the store with count Places and prints the results."""
+    ids = [Place().id for i in range(count)]
+    print("{} objects, best of {}".format(count, times))
+    print("memory per key")
+    for name, make in [
+            ('"Place.<id>" str (kept)', lambda id: "Place." + id),
+            ("(class name, int) tuple", lambda id: ("Place", UUID(id).int)),
+            ("(class name, bytes) tuple",
+             lambda id: ("Place", UUID(id).bytes)),
+            ("class byte + 16-byte bytes",
+             lambda id: b"\x04" + UUID(id).bytes)]:
+        print("  {:<34} {:7.1f} B".format(name, key_size(make, ids)))
+    with open(os.devnull, "w") as out:
+        variants = [
+            ("get, str.format() (original)", legacy_get(ids)),
+            ("get, f-string", get(ids)),
+            ("show, two lookups (original)",
+             show(legacy_command(), ids, out)),
+            ("show, one lookup", show(my_command(), ids, out)),
+        ]
+        print("time per lookup")
+        for name, func in variants:
+            best = min(repeat(func, number=1, repeat=times))
+            print("  {:<34} {:7.3f} us".format(name, best / count * 1e6))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    times = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    main(count, times)
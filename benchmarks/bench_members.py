@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""Benchmarks storage.having() against testing the amenity_ids of every
+Place.
+
+Usage: ./benchmarks/bench_members.py [number_of_objects] [repeat]
+
+Runs in a temporary directory, so the file.json of the project is
+never touched. It stores `number_of_objects` Places holding up to 8 of
+40 amenities, common ones more often, and prints the time to build the
+index and the best of `repeat` runs of each filter, as a scan of
+storage.all() and through the index.
+"""
+import os
+import sys
+import atexit
+import random
+import shutil
+import tempfile
+from time import perf_counter
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+atexit.register(shutil.rmtree, os.getcwd(), True)
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+AMENITIES = ["amenity-{}".format(i) for i in range(40)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(AMENITIES))]
+
+
+def scan(all_of=(), any_of=()):
+    """Returns the Places holding the amenities, by scanning."""
+    return {key: obj for key, obj in storage.all(Place).items()
+            if all(value in obj.amenity_ids for value in all_of) and
+            (len(any_of) == 0 or
+             any(value in obj.amenity_ids for value in any_of))}
+
+
+FILTERS = [
+    ("common AND common", ([AMENITIES[0], AMENITIES[1]], ())),
+    ("common AND rare", ([AMENITIES[0], AMENITIES[35]], ())),
+    ("3 common amenities", (AMENITIES[:3], ())),
+    ("common OR rare", ((), [AMENITIES[2], AMENITIES[30]])),
+    ("A AND (B OR C)", ([AMENITIES[0]], [AMENITIES[5], AMENITIES[20]])),
+]
+
+
+def main(count, times):
+    """Stores count Places and prints the time of every filter."""
+    rand = random.Random(98)
+    for i in range(count):
+        storage.new(Place.from_dict({"amenity_ids": list(set(rand.choices(
+            AMENITIES, WEIGHTS, k=rand.randrange(9))))}))
+    start = perf_counter()
+    storage.having(Place, "amenity_ids", ["none"])
+    print("{} places, index built in {:.2f}s, best of {}".format(
+        count, perf_counter() - start, times))
+    print("  {:<20} {:>10} {:>10} {:>8}".format("filter", "scan", "index",
+                                                "found"))
+    for name, (all_of, any_of) in FILTERS:
+        slow = min(repeat(lambda: scan(all_of, any_of), number=1,
+                          repeat=times))
+        fast = min(repeat(lambda: storage.having(Place, "amenity_ids",
+                                                 all_of, any_of),
+                          number=1, repeat=times))
+        found = storage.having(Place, "amenity_ids", all_of, any_of)
+        print("  {:<20} {:8.2f}ms {:8.2f}ms {:8}".format(
+            name, slow * 1e3, fast * 1e3, len(found)))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    times = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    main(count, times)
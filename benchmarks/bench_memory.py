@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+"""Benchmarks the memory held by regular and compact (slotted) Places,
+and by reloaded Reviews with and without string interning.
+
+Usage: ./benchmarks/bench_memory.py [number_of_objects]
+
+Runs in a temporary directory, so the file.json of the project is
+never touched. For each variant it builds `number_of_objects` objects
+and prints the memory traced by tracemalloc per object and in total.
+Places are built from records, as reload() does. Reviews are saved,
+each pointing to one of 1000 Places and Users, and reloaded.
+"""
+import os
+import sys
+import atexit
+import shutil
+import tempfile
+import tracemalloc
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+atexit.register(shutil.rmtree, os.getcwd(), True)
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.review import Review  # noqa: E402
+from models.compact import compact  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+
+
+def measure(cls, count):
+    """Returns the bytes traced while count instances of cls built from
+    Place records are alive."""
+    tracemalloc.start()
+    try:
+        objs = [cls.from_dict({
+            "id": "{:08d}-0000-4000-8000-000000000000".format(i),
+            "created_at": "2017-09-28T21:05:54.119427",
+            "updated_at": "2017-09-28T21:05:54.119572",
+            "city_id": "city-{}".format(i % 100),
+            "user_id": "user-{}".format(i % 1000),
+            "name": "Place", "description": "",
+            "number_rooms": i % 5, "number_bathrooms": 1,
+            "max_guest": i % 8, "price_by_night": i % 500,
+            "latitude": 37.0, "longitude": -122.0})
+            for i in range(count)]
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del objs
+    return size
+
+
+def measure_reload(interned):
+    """Returns the bytes traced while the objects of file.json reloaded
+    with or without interning are alive."""
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__cache = {}
+    saved = vars(FileStorage)["_FileStorage__intern"]
+    if not interned:
+        FileStorage._FileStorage__intern = staticmethod(lambda rec: rec)
+    tracemalloc.start()
+    try:
+        storage.reload()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+        FileStorage._FileStorage__intern = saved
+    FileStorage._FileStorage__objects = {}
+    return size
+
+
+def report(name, size, count, base):
+    """Prints the size of count objects relative to base."""
+    print("{:<36} {:7.1f} B/object {:8.1f} MiB  {:+6.1f}%".format(
+        name, size / count, size / (1 << 20), (size / base - 1) * 100))
+
+
+def main(count):
+    """Prints the memory held by count objects of each variant."""
+    print("{} objects".format(count))
+    base = measure(Place, count)
+    report("Place (__dict__)", base, count, base)
+    report("compact Place (__slots__)", measure(compact(Place), count),
+           count, base)
+    places = [str(uuid4()) for i in range(1000)]
+    users = [str(uuid4()) for i in range(1000)]
+    FileStorage._FileStorage__objects = {}
+    for i in range(count):
+        storage.new(Review.from_dict({"place_id": places[i % 1000],
+                                      "user_id": users[i * 7 % 1000],
+                                      "text": "Great"}))
+    storage.save()
+    base = measure_reload(False)
+    report("reloaded Review", base, count, base)
+    report("reloaded Review, interned", measure_reload(True), count, base)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
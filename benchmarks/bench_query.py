@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""Benchmarks storage.query() against filtering storage.all() in
+Python.
+
+Usage: ./benchmarks/bench_query.py [number_of_objects] [repeat]
+
+Runs in a temporary directory, so the file.json of the project is
+never touched. It stores `number_of_objects` Places with random values
+and prints the best of `repeat` runs of each question, asked as a scan
+of storage.all() and as a query. It then saves them, reloads them in
+lazy mode and prints the time and the number of objects built to
+answer the first question both ways.
+"""
+import os
+import sys
+import atexit
+import random
+import shutil
+import tempfile
+from time import perf_counter
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+atexit.register(shutil.rmtree, os.getcwd(), True)
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+
+QUESTIONS = [
+    ("10 cheapest with price < 100 and 4+ guests",
+     lambda: sorted((o for o in storage.all().values()
+                     if type(o) is Place and o.price_by_night < 100 and
+                     o.max_guest >= 4),
+                    key=lambda o: o.price_by_night)[:10],
+     lambda: storage.query(Place).where("price_by_night", "<", 100)
+     .where("max_guest", ">=", 4).order_by("price_by_night").limit(10)
+     .all()),
+    ("places of one city",
+     lambda: [o for o in storage.all().values()
+              if type(o) is Place and o.city_id == "city-7"],
+     lambda: storage.query(Place).where(city_id="city-7").all()),
+    ("any place for 9 guests",
+     lambda: next((o for o in storage.all().values()
+                   if type(o) is Place and o.max_guest == 9), None),
+     lambda: storage.query(Place).where(max_guest=9).first()),
+]
+
+
+def main(count, times):
+    """Stores count Places and prints the time of every question."""
+    rand = random.Random(98)
+    for i in range(count):
+        storage.new(Place.from_dict({
+            "city_id": "city-{}".format(rand.randrange(1000)),
+            "price_by_night": rand.randrange(20, 500),
+            "max_guest": rand.randrange(1, 10),
+            "number_rooms": rand.randrange(1, 6),
+            "latitude": rand.uniform(-90, 90),
+            "longitude": rand.uniform(-180, 180)}))
+    storage.query(Place).first()
+    storage.find(Place, city_id="")
+    print("{} places, best of {}".format(count, times))
+    print("  {:<44} {:>10} {:>10}".format("question", "all()", "query()"))
+    for name, scan, query in QUESTIONS:
+        slow = min(repeat(scan, number=1, repeat=times))
+        fast = min(repeat(query, number=1, repeat=times))
+        print("  {:<44} {:8.2f}ms {:8.2f}ms".format(name, slow * 1e3,
+                                                    fast * 1e3))
+    storage.save()
+    FileStorage._FileStorage__lazy = True
+    print("after a lazy reload, first question")
+    for name, ask in (("all()", QUESTIONS[0][1]),
+                      ("query()", QUESTIONS[0][2])):
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        start = perf_counter()
+        ask()
+        elapsed = perf_counter() - start
+        print("  {:<10} {:8.2f}ms {:8} objects built".format(
+            name, elapsed * 1e3, len(FileStorage._FileStorage__objects)))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    times = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    main(count, times)
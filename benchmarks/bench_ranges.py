@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""Benchmarks the range indexes of FileStorage against sorting
+storage.all() in Python.
+
+Usage: ./benchmarks/bench_ranges.py [number_of_objects] [repeat]
+
+Runs in a temporary directory, so the file.json of the project is
+never touched. It stores `number_of_objects` Places with random prices
+and update times, and prints the best of `repeat` runs of each report,
+computed by sorting storage.all() and as a query. It then times the
+save() of one Place, which moves it in the updated_at index.
+"""
+import os
+import sys
+import atexit
+import random
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+atexit.register(shutil.rmtree, os.getcwd(), True)
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+SINCE = datetime(2024, 6, 1)
+
+REPORTS = [
+    ("20 most recently updated",
+     lambda: sorted((o for o in storage.all().values() if type(o) is Place),
+                    key=lambda o: o.updated_at, reverse=True)[:20],
+     lambda: storage.query(Place).order_by("updated_at", reverse=True)
+     .limit(20).all()),
+    ("updated since June, oldest first",
+     lambda: sorted((o for o in storage.all().values()
+                     if type(o) is Place and o.updated_at >= SINCE),
+                    key=lambda o: o.updated_at),
+     lambda: storage.query(Place).where("updated_at", ">=", SINCE)
+     .order_by("updated_at").all()),
+    ("price between 100 and 105",
+     lambda: [o for o in storage.all().values()
+              if type(o) is Place and 100 <= o.price_by_night <= 105],
+     lambda: storage.query(Place).where("price_by_night", ">=", 100)
+     .where("price_by_night", "<=", 105).all()),
+    ("10 most expensive",
+     lambda: sorted((o for o in storage.all().values() if type(o) is Place),
+                    key=lambda o: o.price_by_night, reverse=True)[:10],
+     lambda: storage.query(Place).order_by("price_by_night", reverse=True)
+     .limit(10).all()),
+]
+
+
+def main(count, times):
+    """Stores count Places and prints the time of every report."""
+    rand = random.Random(98)
+    start = datetime(2024, 1, 1)
+    for i in range(count):
+        storage.new(Place.from_dict({
+            "price_by_night": rand.randrange(20, 500),
+            "updated_at": (start + timedelta(
+                seconds=rand.randrange(200 * 86400))).isoformat()}))
+    storage.query(Place).first()
+    print("{} places, best of {}".format(count, times))
+    print("  {:<36} {:>10} {:>10}".format("report", "sorted()", "query()"))
+    for name, scan, query in REPORTS:
+        slow = min(repeat(scan, number=1, repeat=times))
+        fast = min(repeat(query, number=1, repeat=times))
+        print("  {:<36} {:8.2f}ms {:8.2f}ms".format(name, slow * 1e3,
+                                                    fast * 1e3))
+    storage.save()
+    pl = next(iter(storage.all(Place).values()))
+    elapsed = min(repeat(pl.save, number=1, repeat=times))
+    print("  {:<36} {:8.2f}ms".format("save() of one place", elapsed * 1e3))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    times = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    main(count, times)
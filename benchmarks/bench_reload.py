@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+"""Benchmarks FileStorage.reload() from JSON and binary snapshots, and
+against the original eval()-based reload.
+
+Usage: ./benchmarks/bench_reload.py [number_of_objects] [repeat]
+
+Runs in a temporary directory, so the file.json of the project is
+never touched. For each variant it prints the best time of `repeat`
+reloads of a store holding `number_of_objects` Places followed by one
+get(), which is what a console command pays at startup.
+"""
+import os
+import sys
+import json
+import atexit
+import shutil
+import tempfile
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+atexit.register(shutil.rmtree, os.getcwd(), True)
+
+from models import storage  # noqa: E402
+from models.base_model import BaseModel  # noqa: E402, F401
+from models.user import User  # noqa: E402, F401
+from models.state import State  # noqa: E402, F401
+from models.city import City  # noqa: E402, F401
+from models.place import Place  # noqa: E402
+from models.amenity import Amenity  # noqa: E402, F401
+from models.review import Review  # noqa: E402, F401
+from models.engine import binary_snapshot  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+
+
+def legacy_reload():
+    """The original reload(): json.load() the whole file and look each
+    class up with eval()."""
+    FileStorage._FileStorage__objects = {}
+    with open("file.json") as f:
+        obj_dict = json.load(f)
+    for o in obj_dict.values():
+        cls_name = o["__class__"]
+        del o["__class__"]
+        storage.new(eval(cls_name)(**o))
+
+
+def reload(binary, lazy, key):
+    """Returns a function reloading the store in the given mode and
+    getting the object of key."""
+    cls_name, id = key.split(".", 1)
+
+    def run():
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+        FileStorage._FileStorage__cache = {}
+        FileStorage._FileStorage__binary = binary
+        FileStorage._FileStorage__file_path = \
+            "file.bin" if binary else "file.json"
+        FileStorage._FileStorage__lazy = lazy
+        storage.reload()
+        storage.get(cls_name, id)
+    return run
+
+
+def main(count, times):
+    """Fills file.json and file.bin with count Places and prints the
+    timings."""
+    for i in range(count):
+        pl = Place()
+        pl.name = "Place {}".format(i)
+        pl.city_id = "city-{}".format(i % 100)
+        pl.price_by_night = i % 500
+    storage.save()
+    binary_snapshot.json_to_binary("file.json", "file.bin")
+    key = "Place." + pl.id
+    variants = [
+        ("JSON, eager, eval() (original)", legacy_reload),
+        ("JSON, eager", reload(False, False, key)),
+        ("JSON, lazy", reload(False, True, key)),
+        ("binary, eager", reload(True, False, key)),
+        ("binary, lazy (mmap)", reload(True, True, key)),
+    ]
+    print("{} objects, best of {}".format(count, times))
+    base = None
+    for name, func in variants:
+        best = min(repeat(func, number=1, repeat=times))
+        base = base or best
+        print("{:<36} {:9.2f} ms  {:+6.1f}%".format(
+            name, best * 1000, (best / base - 1) * 100))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    times = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    main(count, times)
@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+"""Benchmarks FileStorage.save() against the original truncating save.
+
+Usage: ./benchmarks/bench_save.py [number_of_objects] [repeat]
+
+Runs in a temporary directory, so the file.json of the project is
+never touched. For each variant it prints the best time of `repeat`
+full saves of a store holding `number_of_objects` Places.
+"""
+import os
+import sys
+import json
+import atexit
+import shutil
+import tempfile
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+atexit.register(shutil.rmtree, os.getcwd(), True)
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+
+
+def legacy_save():
+    """The original save(): truncate file.json and json.dump() a dict
+    of every to_dict()."""
+    ob_dct = storage.all()
+    obj_dict = {obj: ob_dct[obj].to_dict() for obj in ob_dct.keys()}
+    with open("file.json", "w") as f:
+        json.dump(obj_dict, f)
+
+
+def atomic_save(fsync, fsync_dir=False):
+    """Returns a function running a full FileStorage.save() with the
+    given fsync settings."""
+    def save():
+        FileStorage._FileStorage__fsync = fsync
+        FileStorage._FileStorage__fsync_dir = fsync_dir
+        FileStorage._FileStorage__cache = {}
+        storage.save()
+    return save
+
+
+def main(count, times):
+    """Fills the store with count Places and prints the timings."""
+    for i in range(count):
+        pl = Place()
+        pl.name = "Place {}".format(i)
+        pl.city_id = "city-{}".format(i % 100)
+        pl.price_by_night = i % 500
+    variants = [
+        ("truncate + json.dump (original)", legacy_save),
+        ("temp + rename", atomic_save(False)),
+        ("temp + fsync + rename", atomic_save(True)),
+        ("temp + fsync + rename + dir fsync", atomic_save(True, True)),
+    ]
+    print("{} objects, best of {}".format(count, times))
+    base = None
+    for name, func in variants:
+        best = min(repeat(func, number=1, repeat=times))
+        base = base or best
+        print("{:<36} {:9.2f} ms  {:+6.1f}%".format(
+            name, best * 1000, (best / base - 1) * 100))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    times = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    main(count, times)
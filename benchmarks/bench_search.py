@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""Benchmarks storage.search() against scanning the text of every
+Review.
+
+Usage: ./benchmarks/bench_search.py [number_of_objects] [repeat]
+
+Runs in a temporary directory, so the file.json of the project is
+never touched. It stores `number_of_objects` Reviews of 40 words drawn
+from a vocabulary where a few words are common and most are rare, and
+prints the time to build the index and the best of `repeat` runs of
+each search, as a scan of storage.all() and through the index.
+"""
+import os
+import sys
+import atexit
+import random
+import shutil
+import tempfile
+from time import perf_counter
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+atexit.register(shutil.rmtree, os.getcwd(), True)
+
+from models import storage  # noqa: E402
+from models.review import Review  # noqa: E402
+from models.engine.text import tokenize  # noqa: E402
+
+VOCABULARY = ["word{}".format(i) for i in range(20000)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+
+def scan(text):
+    """Returns the Reviews holding every word of text, by scanning."""
+    words = set(tokenize(text))
+    return {key: obj for key, obj in storage.all(Review).items()
+            if words.issubset(tokenize(obj.text))}
+
+
+SEARCHES = [
+    ("a common word", "word0"),
+    ("a rare word", "word15000"),
+    ("common AND rare", "word0 word15000"),
+    ("two rare words", "word9000 word12000"),
+]
+
+
+def main(count, times):
+    """Stores count Reviews and prints the time of every search."""
+    rand = random.Random(98)
+    for i in range(count):
+        storage.new(Review.from_dict({"text": " ".join(
+            rand.choices(VOCABULARY, WEIGHTS, k=40))}))
+    start = perf_counter()
+    storage.search(Review, "")
+    print("{} reviews, index built in {:.2f}s, best of {}".format(
+        count, perf_counter() - start, times))
+    print("  {:<20} {:>10} {:>10} {:>8}".format("search", "scan", "index",
+                                                "found"))
+    for name, text in SEARCHES:
+        slow = min(repeat(lambda: scan(text), number=1, repeat=times))
+        fast = min(repeat(lambda: storage.search(Review, text), number=1,
+                          repeat=times))
+        print("  {:<20} {:8.2f}ms {:8.2f}ms {:8}".format(
+            name, slow * 1e3, fast * 1e3,
+            len(storage.search(Review, text))))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    times = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    main(count, times)
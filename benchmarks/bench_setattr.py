@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+"""Benchmarks the bookkeeping of BaseModel attribute writes.
+
+Usage: ./benchmarks/bench_setattr.py [number_of_objects] [repeat]
+
+Runs in a temporary directory, so the file.json of the project is
+never touched. It stores `number_of_objects` Places, builds every index
+of the class, and prints the best of `repeat` runs of each write, in
+microseconds, next to a write to a plain object. Saves are deferred by
+group commit, so BaseModel.save() is timed without the file write.
+"""
+import os
+import sys
+import atexit
+import shutil
+import tempfile
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+atexit.register(shutil.rmtree, os.getcwd(), True)
+
+from models import storage  # noqa: E402
+from models.amenity import Amenity  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+
+NUMBER = 10000
+
+
+class Plain:
+    """An object without storage bookkeeping."""
+    pass
+
+
+def main(count, times):
+    """Stores count Places and prints the time of every write."""
+    for i in range(count):
+        storage.new(Place.from_dict({"name": "Place {}".format(i),
+                                     "price_by_night": i % 500,
+                                     "latitude": 48.0, "longitude": 2.0}))
+    plain, am, pl = Plain(), Amenity(), Place()
+    storage.find(Place, city_id="", user_id="")
+    storage.query(Place).where("price_by_night", "<", 0).first()
+    storage.within(Place, 0, 0, 1, 1)
+    storage.search(Place, "place")
+    storage.having(Place, "amenity_ids")
+    FileStorage._FileStorage__group_size = 1 << 30
+    writes = [
+        ("plain object", lambda: setattr(plain, "name", "x")),
+        ("Amenity (no index)", lambda: setattr(am, "name", "x")),
+        ("Place.number_bathrooms (no index)",
+         lambda: setattr(pl, "number_bathrooms", 1)),
+        ("Place.name (TextIndex)", lambda: setattr(pl, "name", "x")),
+        ("Place.price_by_night (RangeIndex, ColumnStore)",
+         lambda: setattr(pl, "price_by_night", 1)),
+        ("Amenity.save()", am.save),
+        ("Place.save()", pl.save),
+    ]
+    print("{} places, best of {}, {} writes each".format(
+        count, times, NUMBER))
+    for name, write in writes:
+        best = min(repeat(write, number=NUMBER, repeat=times))
+        print("  {:<48} {:8.2f}us".format(name, best / NUMBER * 1e6))
+    FileStorage._FileStorage__group_size = 0
+    FileStorage._FileStorage__deferred = 0
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    times = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    main(count, times)
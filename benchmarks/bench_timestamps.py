@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""Benchmarks the per-object cost of BaseModel timestamps.
+
+Usage: ./benchmarks/bench_timestamps.py [number_of_objects] [repeat]
+
+Runs in a temporary directory, so the file.json of the project is
+never touched. It prints the best time per object of `repeat` runs
+over `number_of_objects` records, for parsing both timestamps of a
+record, for building the object from it with the constructor and
+with from_dict() (reload), and for to_dict() (save).
+"""
+import os
+import sys
+import atexit
+import shutil
+import tempfile
+from datetime import datetime
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+atexit.register(shutil.rmtree, os.getcwd(), True)
+
+from models.base_model import parse_datetime  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def legacy_parse(text):
+    """The original parsing of a timestamp."""
+    return datetime.strptime(text, "%Y-%m-%dT%H:%M:%S.%f")
+
+
+def parse_all(parse, records):
+    """Returns a function parsing the timestamps of records."""
+    def run():
+        for rec in records:
+            parse(rec["created_at"])
+            parse(rec["updated_at"])
+    return run
+
+
+def build_all(parse, records):
+    """Returns a function building a Place from each of records with
+    parse_datetime() replaced by parse."""
+    import models.base_model
+
+    def run():
+        saved = models.base_model.parse_datetime
+        models.base_model.parse_datetime = parse
+        try:
+            for rec in records:
+                Place(**rec)
+        finally:
+            models.base_model.parse_datetime = saved
+    return run
+
+
+def from_dict_all(records):
+    """Returns a function building a Place from each of records with
+    from_dict()."""
+    def run():
+        for rec in records:
+            Place.from_dict(rec)
+    return run
+
+
+def to_dict_all(objs):
+    """Returns a function calling to_dict() on each of objs."""
+    def run():
+        for obj in objs:
+            obj.to_dict()
+    return run
+
+
+def main(count, times):
+    """Builds count Places and prints the timings per object."""
+    objs = [Place(id=str(i), created_at=datetime.today().isoformat(),
+                  updated_at=datetime.today().isoformat(), name="Place")
+            for i in range(count)]
+    records = [obj.to_dict() for obj in objs]
+    for rec in records:
+        del rec["__class__"]
+    variants = [
+        ("parse, strptime (original)", parse_all(legacy_parse, records)),
+        ("parse, fromisoformat", parse_all(parse_datetime, records)),
+        ("reload, strptime (original)", build_all(legacy_parse, records)),
+        ("reload, fromisoformat", build_all(parse_datetime, records)),
+        ("reload, from_dict()", from_dict_all(records)),
+        ("save, to_dict()", to_dict_all(objs)),
+    ]
+    print("{} objects, best of {}".format(count, times))
+    for name, func in variants:
+        best = min(repeat(func, number=1, repeat=times))
+        print("{:<36} {:9.3f} us/object".format(name, best / count * 1e6))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    times = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    main(count, times)
@@ -2,15 +2,10 @@
 """The script defines the HBnB console"""
 import re
 import cmd
+from ast import literal_eval
 
 from models import storage
-from models.base_model import BaseModel
-from models.user import User
-from models.state import State
-from models.city import City
-from models.place import Place
-from models.amenity import Amenity
-from models.review import Review
+from models.base_model import classes
 from shlex import split
 
 
@@ -41,15 +36,6 @@ class my_command(cmd.Cmd):
     """
 
     prompt = "(hbnb) "
-    __classes = {
-        "BaseModel",
-        "User",
-        "State",
-        "City",
-        "Place",
-        "Amenity",
-        "Review"
-    }
 
     def emptyline(self):
         """This does nothing upon receiving an empty line."""
@@ -63,7 +49,9 @@ class my_command(cmd.Cmd):
             "show": self.do_show,
             "destroy": self.do_destroy,
             "count": self.do_count,
-            "update": self.do_update
+            "update": self.do_update,
+            "nearby": self.do_nearby,
+            "search": self.do_search
         }
         rem = re.search(r"\.", arg)
         if rem is not None:
@@ -79,11 +67,13 @@ class my_command(cmd.Cmd):
 
     def do_quit(self, arg):
         """This quits command to exit the program."""
+        storage.flush()
         return True
 
     def do_EOF(self, arg):
         """The EOF signal to exit the program."""
         print("")
+        storage.flush()
         return True
 
     def do_create(self, arg):
@@ -93,10 +83,10 @@ class my_command(cmd.Cmd):
         args_lst = parse(arg)
         if len(args_lst) == 0:
             print("** class name missing **")
-        elif args_lst[0] not in my_command.__classes:
+        elif args_lst[0] not in classes:
             print("** class doesn't exist **")
         else:
-            print(eval(args_lst[0])().id)
+            print(classes[args_lst[0]]().id)
             storage.save()
 
     def do_show(self, arg):
@@ -105,60 +95,103 @@ class my_command(cmd.Cmd):
         a given id.
         """
         args_lst = parse(arg)
-        obj_dict = storage.all()
         if len(args_lst) == 0:
             print("** class name missing **")
-        elif args_lst[0] not in my_command.__classes:
+        elif args_lst[0] not in classes:
             print("** class doesn't exist **")
         elif len(args_lst) == 1:
             print("** instance id missing **")
-        elif "{}.{}".format(args_lst[0], args_lst[1]) not in obj_dict:
-            print("** no instance found **")
         else:
-            print(obj_dict["{}.{}".format(args_lst[0], args_lst[1])])
+            obj = storage.get(args_lst[0], args_lst[1])
+            if obj is None:
+                print("** no instance found **")
+            else:
+                print(obj)
 
     def do_destroy(self, arg):
         """Usage: destroy <class> <id> or <class>.destroy(<id>)
         Deletes a class instance of a given id."""
         args_lst = parse(arg)
-        obj_dict = storage.all()
         if len(args_lst) == 0:
             print("** class name missing **")
-        elif args_lst[0] not in my_command.__classes:
+        elif args_lst[0] not in classes:
             print("** class doesn't exist **")
         elif len(args_lst) == 1:
             print("** instance id missing **")
-        elif "{}.{}".format(args_lst[0], args_lst[1]) not in obj_dict.keys():
-            print("** no instance found **")
         else:
-            del obj_dict["{}.{}".format(args_lst[0], args_lst[1])]
-            storage.save()
+            obj = storage.get(args_lst[0], args_lst[1])
+            if obj is None:
+                print("** no instance found **")
+            else:
+                storage.delete(obj)
+                storage.save()
 
     def do_all(self, arg):
         """Usage: all or all <class> or <class>.all()
         Displays a string representations of all instances of a given class.
         If no class is specified, displays all instantiated objects."""
         args_lst = parse(arg)
-        if len(args_lst) > 0 and args_lst[0] not in my_command.__classes:
+        if len(args_lst) > 0 and args_lst[0] not in classes:
             print("** class doesn't exist **")
         else:
-            result_lst = []
-            for obj in storage.all().values():
-                if len(args_lst) > 0 and args_lst[0] == obj.__class__.__name__:
-                    result_lst.append(obj.__str__())
-                elif len(args_lst) == 0:
-                    result_lst.append(obj.__str__())
-            print(result_lst)
+            if len(args_lst) > 0:
+                objs = storage.all(args_lst[0]).values()
+            else:
+                objs = storage.all().values()
+            print([obj.__str__() for obj in objs])
 
     def do_count(self, arg):
         """Usage: count <class> or <class>.count()
         Retrieves the number of instances of a given class."""
         args_lst = parse(arg)
-        count = 0
-        for obj in storage.all().values():
-            if args_lst[0] == obj.__class__.__name__:
-                count += 1
-        print(count)
+        if len(args_lst) == 0:
+            print("** class name missing **")
+        else:
+            print(storage.count(args_lst[0]))
+
+    def do_nearby(self, arg):
+        """Usage: nearby <class> <latitude> <longitude> <km> or
+       <class>.nearby(<latitude>, <longitude>, <km>)
+        Displays string representations of the instances of a given class
+        within km kilometres of a point, nearest first."""
+        args_lst = parse(arg)
+        if len(args_lst) == 0:
+            print("** class name missing **")
+            return False
+        if args_lst[0] not in classes:
+            print("** class doesn't exist **")
+            return False
+        if len(getattr(classes[args_lst[0]], "_located", ())) != 2:
+            print("** class has no location **")
+            return False
+        for i, name in enumerate(("latitude", "longitude", "distance")):
+            if len(args_lst) < i + 2:
+                print("** {} missing **".format(name))
+                return False
+        try:
+            point = [float(value) for value in args_lst[1:4]]
+        except ValueError:
+            print("** invalid number **")
+            return False
+        objs = storage.nearby(args_lst[0], *point)
+        print([obj.__str__() for obj in objs])
+
+    def do_search(self, arg):
+        """Usage: search <class> <keywords> or <class>.search(<keywords>)
+        Displays string representations of the instances of a given class
+        whose text holds every keyword."""
+        args_lst = parse(arg)
+        if len(args_lst) == 0:
+            print("** class name missing **")
+        elif args_lst[0] not in classes:
+            print("** class doesn't exist **")
+        elif len(getattr(classes[args_lst[0]], "_searchable", ())) == 0:
+            print("** class isn't searchable **")
+        elif len(args_lst) == 1:
+            print("** keywords missing **")
+        else:
+            objs = storage.search(args_lst[0], " ".join(args_lst[1:]))
+            print([obj.__str__() for obj in objs.values()])
 
     def do_update(self, arg):
         """Usage: update <class> <id> <attribute_name> <attribute_value> or
@@ -167,46 +200,46 @@ class my_command(cmd.Cmd):
         Updates a class instance of a given id by adding or updating
         a given attribute key/value pair or dictionary."""
         args_lst = parse(arg)
-        obj_dict = storage.all()
 
         if len(args_lst) == 0:
             print("** class name missing **")
             return False
-        if args_lst[0] not in my_command.__classes:
+        if args_lst[0] not in classes:
             print("** class doesn't exist **")
             return False
         if len(args_lst) == 1:
             print("** instance id missing **")
             return False
-        if "{}.{}".format(args_lst[0], args_lst[1]) not in obj_dict.keys():
+        obj = storage.get(args_lst[0], args_lst[1])
+        if obj is None:
             print("** no instance found **")
             return False
         if len(args_lst) == 2:
             print("** attribute name missing **")
             return False
+        attrs = None
         if len(args_lst) == 3:
             try:
-                type(eval(args_lst[2])) != dict
-            except NameError:
+                attrs = literal_eval(args_lst[2])
+            except (ValueError, SyntaxError):
                 print("** value missing **")
                 return False
 
-        if len(args_lst) == 4:
-            obj = obj_dict["{}.{}".format(args_lst[0], args_lst[1])]
-            if args_lst[2] in obj.__class__.__dict__.keys():
-                valtype = type(obj.__class__.__dict__[args_lst[2]])
-                obj.__dict__[args_lst[2]] = valtype(args_lst[3])
+        defaults = getattr(type(obj), "_defaults", obj.__class__.__dict__)
+        if len(args_lst) >= 4:
+            if args_lst[2] in defaults.keys():
+                valtype = type(defaults[args_lst[2]])
+                setattr(obj, args_lst[2], valtype(args_lst[3]))
             else:
-                obj.__dict__[args_lst[2]] = args_lst[3]
-        elif type(eval(args_lst[2])) == dict:
-            obj = obj_dict["{}.{}".format(args_lst[0], args_lst[1])]
-            for k, v in eval(args_lst[2]).items():
-                if (k in obj.__class__.__dict__.keys() and
-                        type(obj.__class__.__dict__[k]) in {str, int, float}):
-                    valtype = type(obj.__class__.__dict__[k])
-                    obj.__dict__[k] = valtype(v)
+                setattr(obj, args_lst[2], args_lst[3])
+        elif isinstance(attrs, dict):
+            for k, v in attrs.items():
+                if (k in defaults.keys() and
+                        type(defaults[k]) in {str, int, float}):
+                    valtype = type(defaults[k])
+                    setattr(obj, k, valtype(v))
                 else:
-                    obj.__dict__[k] = v
+                    setattr(obj, k, v)
         storage.save()
 
 
@@ -0,0 +1,26 @@
+#!/usr/bin/python3
+"""Converts a FileStorage snapshot between JSON and the binary format.
+
+Usage: ./convert_snapshot.py to-binary|to-json SRC DST
+
+Importing the models package reloads the storage of the current
+directory, replaying and repairing its journal. The converter only
+needs the codec, so it sets HBNB_STORAGE_RELOAD=0 first: SRC and DST
+are the only files it reads or writes.
+"""
+import os
+import sys
+
+os.environ["HBNB_STORAGE_RELOAD"] = "0"
+
+from models.engine import binary_snapshot  # noqa: E402
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] not in ("to-binary", "to-json"):
+        print(__doc__.strip().splitlines()[2], file=sys.stderr)
+        sys.exit(2)
+    if sys.argv[1] == "to-binary":
+        binary_snapshot.json_to_binary(sys.argv[2], sys.argv[3])
+    else:
+        binary_snapshot.binary_to_json(sys.argv[2], sys.argv[3])
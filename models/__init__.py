@@ -1,7 +1,20 @@
 #!/usr/bin/python3
 """ This is the ___init__ magic method for models directory"""
-from models.engine.file_storage import FileStorage
+import atexit
+from os import getenv
+from models import amenity, city, place, review, state, user  # noqa: F401
 
+if getenv("HBNB_COMPACT_MODELS") == "1":
+    from models.compact import install
+    install()
 
-storage = FileStorage()
-storage.reload()
+
+if getenv("HBNB_TYPE_STORAGE") == "db":
+    from models.engine.db_storage import DBStorage
+    storage = DBStorage()
+else:
+    from models.engine.file_storage import FileStorage
+    storage = FileStorage()
+if getenv("HBNB_STORAGE_RELOAD") != "0":
+    storage.reload()
+atexit.register(storage.flush)
@@ -6,9 +6,25 @@ from uuid import uuid4
 from datetime import datetime
 
 
+classes = {}
+"""dict: the model class names mapped to the classes, filled in as
+BaseModel and its subclasses are defined."""
+
+
 class BaseModel:
     """The script epresents the BaseModel of the
-    HBnB project."""
+    HBnB project.
+
+    Attributes:
+        _ranged (tuple): the attributes FileStorage keeps in order.
+    """
+
+    _ranged = ("created_at", "updated_at")
+
+    def __init_subclass__(cls, **kwargs):
+        """Registers the new model class in classes by its name."""
+        super().__init_subclass__(**kwargs)
+        classes[cls.__name__] = cls
 
     def __init__(self, *args, **kwargs):
         """This initialize a new BaseModel.
@@ -17,21 +33,64 @@ class BaseModel:
             *args (any): Unused.
             **kwargs (dict): Key/value pairs of attributes.
         """
-        dt_format = "%Y-%m-%dT%H:%M:%S.%f"
         self.id = str(uuid4())
         self.created_at = datetime.today()
         self.updated_at = datetime.today()
         if len(kwargs) != 0:
             for k, v in kwargs.items():
                 if k == "created_at" or k == "updated_at":
-                    self.__dict__[k] = datetime.strptime(v, dt_format)
+                    self.__dict__[k] = parse_datetime(v)
                 else:
                     self.__dict__[k] = v
         else:
             models.storage.new(self)
 
+    @classmethod
+    def from_dict(cls, attrs):
+        """Returns the instance of cls described by the to_dict()
+        dictionary attrs, without adding it to storage.
+
+        Unlike cls(**attrs), the id and timestamps are only generated
+        when attrs lacks them, and attributes are set directly rather
+        than reported to storage as changes.
+
+        Args:
+            attrs (dict): Key/value pairs of attributes. A __class__
+                key is ignored.
+        """
+        obj = cls.__new__(cls)
+        attr_dict = obj.__dict__
+        if "id" not in attrs:
+            attr_dict["id"] = str(uuid4())
+        for k in ("created_at", "updated_at"):
+            if k not in attrs:
+                attr_dict[k] = datetime.today()
+        for k, v in attrs.items():
+            if k == "created_at" or k == "updated_at":
+                attr_dict[k] = parse_datetime(v)
+            elif k != "__class__":
+                attr_dict[k] = v
+        return obj
+
+    def __setattr__(self, name, value):
+        """Sets the attribute name and marks it as changed in storage."""
+        models.storage.preserve(self)
+        super().__setattr__(name, value)
+        models.storage.touch(self, name)
+
+    def __delattr__(self, name):
+        """Deletes the attribute name and marks the instance as changed
+        in storage."""
+        models.storage.preserve(self)
+        super().__delattr__(name)
+        models.storage.touch(self)
+
     def save(self):
-        """Update updated_at with the current datetime."""
+        """Update updated_at with the current datetime.
+
+        Setting updated_at already marks the instance as changed, so
+        storage only reindexes updated_at.
+        """
         self.updated_at = datetime.today()
         models.storage.save()
 
@@ -52,3 +111,19 @@ class BaseModel:
         BaseModel instance."""
         clname = self.__class__.__name__
         return "[{}] ({}) {}".format(clname, self.id, self.__dict__)
+
+
+classes[BaseModel.__name__] = BaseModel
+
+
+def parse_datetime(text):
+    """Returns the datetime of the ISO 8601 text written by to_dict().
+
+    datetime.fromisoformat() is several times faster than strptime().
+    Text it rejects but the "%Y-%m-%dT%H:%M:%S.%f" format of older
+    files accepts, such as unpadded fields, falls back to strptime().
+    """
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return datetime.strptime(text, "%Y-%m-%dT%H:%M:%S.%f")
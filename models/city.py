@@ -9,7 +9,10 @@ class City(BaseModel):
     Attributes:
         state_id (str): the state id.
         name (str): the name of the city.
+        _indexed (tuple): the attributes FileStorage indexes by value.
     """
 
     state_id = ""
     name = ""
+
+    _indexed = ("state_id",)
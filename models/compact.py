@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+"""The script defines the compact variants of the model classes.
+
+install(), which models calls when HBNB_COMPACT_MODELS=1, replaces
+every model class in the registry (but not in its module) with a
+subclass of the same name keeping the id, the timestamps and the
+declared attributes in __slots__ rather than in a per-instance dict.
+Other attributes, such as the ones do_update adds, go to an overflow
+dict.
+
+The __dict__ of a compact instance is an Attributes mapping over its
+set slots and its overflow dict, so code reading or writing __dict__
+works on both kinds of instances.
+"""
+from collections.abc import MutableMapping
+from models.base_model import BaseModel, classes
+
+_instance_dict = BaseModel.__dict__["__dict__"].__get__
+
+
+class Attributes(MutableMapping):
+    """Represents the attributes of a compact instance as a dict-like
+    mapping, the slots that are set first.
+
+    Like writes to a __dict__, writes to it bypass __setattr__.
+    """
+
+    def __init__(self, obj):
+        """Initialize the mapping of the attributes of obj.
+
+        Args:
+            obj (CompactModel): the compact instance.
+        """
+        self.__obj = obj
+        self.__slots = type(obj)._slots
+
+    def __getitem__(self, name):
+        slot = self.__slots.get(name)
+        if slot is None:
+            return _instance_dict(self.__obj)[name]
+        try:
+            return slot.__get__(self.__obj)
+        except AttributeError:
+            raise KeyError(name)
+
+    def __setitem__(self, name, value):
+        slot = self.__slots.get(name)
+        if slot is None:
+            _instance_dict(self.__obj)[name] = value
+        else:
+            slot.__set__(self.__obj, value)
+
+    def __delitem__(self, name):
+        slot = self.__slots.get(name)
+        if slot is None:
+            del _instance_dict(self.__obj)[name]
+            return
+        try:
+            slot.__delete__(self.__obj)
+        except AttributeError:
+            raise KeyError(name)
+
+    def __iter__(self):
+        for name, slot in self.__slots.items():
+            try:
+                slot.__get__(self.__obj)
+            except AttributeError:
+                continue
+            yield name
+        yield from list(_instance_dict(self.__obj))
+
+    def __len__(self):
+        return sum(1 for name in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def copy(self):
+        """Returns a dict of the attributes."""
+        return dict(self)
+
+
+class CompactModel:
+    """Represents the behaviour shared by the compact model classes.
+
+    Attributes:
+        _defaults (mappingproxy): the namespace of the model class,
+            holding the defaults of the declared attributes.
+        _slots (dict): the slot names mapped to their descriptors.
+    """
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        """Returns the class default of the unset slot name."""
+        try:
+            return type(self)._defaults[name]
+        except KeyError:
+            raise AttributeError("'{}' object has no attribute '{}'".format(
+                type(self).__name__, name)) from None
+
+
+def compact(cls):
+    """Returns the compact variant of the model class cls, registered
+    under the same name.
+
+    Args:
+        cls (type): BaseModel or one of its subclasses.
+    """
+    names = ["id", "created_at", "updated_at"]
+    names += [name for name, value in vars(cls).items()
+              if not name.startswith("_") and
+              isinstance(value, (str, int, float, list))]
+    namespace = {
+        "__slots__": tuple(names),
+        "__module__": cls.__module__,
+        "__qualname__": cls.__qualname__,
+        "__doc__": cls.__doc__,
+        "__dict__": property(Attributes, doc="The attributes of the "
+                             "instance, as an Attributes mapping."),
+        "_defaults": vars(cls),
+    }
+    compact_cls = type(cls.__name__, (CompactModel, cls), namespace)
+    compact_cls._slots = {name: vars(compact_cls)[name] for name in names}
+    return compact_cls
+
+
+def install():
+    """Replaces every model class in the registry with its compact
+    variant, so storage and the console build compact instances.
+
+    Only the models.base_model.classes entries are swapped: the module
+    attributes, such as models.place.Place, stay the regular classes, so
+    their class attributes keep their default values. Code building
+    instances directly from an imported class gets dict-backed ones,
+    which storage holds alongside the compact ones; look the class up in
+    classes to get the compact variant.
+    """
+    for cls in list(classes.values()):
+        if not issubclass(cls, CompactModel):
+            compact(cls)
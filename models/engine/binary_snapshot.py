@@ -0,0 +1,297 @@
+#!/usr/bin/python3
+"""The script defines the binary snapshot format of FileStorage.
+
+A snapshot file holds the records of every object, read through mmap
+so that opening it costs the same whatever the number of records:
+
+    magic           b"HBNBSNP1"
+    records         created_at and updated_at as two little-endian
+                    int64 microseconds since 1970-01-01, then the other
+                    attributes as UTF-8 JSON
+    tables          one per class, of (16-byte UUID, uint64 offset,
+                    uint32 length) entries sorted by UUID
+    directory       JSON object mapping class names to [table offset,
+                    number of entries, {other id: [offset, length]}]
+    footer          uint64 offset of the directory
+
+Ids that are not canonical UUIDs and timestamps that would not read
+back as the same text are kept in the directory and in the JSON part
+of their record, so every record reads back equal to the one written.
+convert_snapshot.py converts file.json to this format and back.
+"""
+import json
+import mmap
+import struct
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+from uuid import UUID
+from models.engine import json_stream
+
+MAGIC = b"HBNBSNP1"
+_times = struct.Struct("<qq")
+_entry = struct.Struct("<16sQI")
+_footer = struct.Struct("<Q")
+_epoch = datetime(1970, 1, 1)
+_microsecond = timedelta(microseconds=1)
+_NO_TIME = -(1 << 63)
+
+
+def write(f, records):
+    """Writes a snapshot of records to the binary file f.
+
+    Args:
+        f (file): the binary file to write to, at its start.
+        records (iterable): the (key, record) pairs to write, where key
+            is "<class name>.<id>" and record a to_dict() dictionary.
+    """
+    f.write(MAGIC)
+    pos = len(MAGIC)
+    tables = {}
+    for key, rec in records:
+        cls_name, id = key.split(".", 1)
+        data = _encode(cls_name, id, rec)
+        f.write(data)
+        table, others = tables.setdefault(cls_name, ([], {}))
+        uid = _uuid_bytes(id)
+        if uid is None:
+            others[id] = [pos, len(data)]
+        else:
+            table.append(_entry.pack(uid, pos, len(data)))
+        pos += len(data)
+    directory = {}
+    for cls_name, (table, others) in tables.items():
+        table.sort()
+        directory[cls_name] = [pos, len(table), others]
+        f.write(b"".join(table))
+        pos += len(table) * _entry.size
+    f.write(json.dumps(directory).encode())
+    f.write(_footer.pack(pos))
+
+
+class Snapshot:
+    """Represents a snapshot file mapped in memory.
+
+    Records are decoded only when they are accessed, through the
+    Section of their class.
+    """
+
+    def __init__(self, path):
+        """Maps the snapshot at path and reads its directory.
+
+        Args:
+            path (str): the snapshot file name.
+
+        Raises:
+            ValueError: if path is not a snapshot file.
+        """
+        with open(path, "rb") as f:
+            try:
+                self.__buf = mmap.mmap(f.fileno(), 0,
+                                       access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError("Not a binary snapshot: " + path)
+        buf = self.__buf
+        if len(buf) < len(MAGIC) + _footer.size or \
+                buf[:len(MAGIC)] != MAGIC:
+            buf.close()
+            raise ValueError("Not a binary snapshot: " + path)
+        end = len(buf) - _footer.size
+        start = _footer.unpack_from(buf, end)[0]
+        directory = json.loads(buf[start:end])
+        self.__sections = {
+            cls_name: Section(buf, cls_name, *entry)
+            for cls_name, entry in directory.items()}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Unmaps the file. Its sections can no longer be read."""
+        self.__buf.close()
+
+    def sections(self):
+        """Returns the {class name: Section} dict of the snapshot."""
+        return dict(self.__sections)
+
+    def items(self):
+        """Yields the (key, record) pairs of every record."""
+        for section in self.__sections.values():
+            yield from section.items()
+
+    def __len__(self):
+        return sum(len(s) for s in self.__sections.values())
+
+
+class Section(MutableMapping):
+    """Represents the records of one class of a Snapshot as a
+    {key: record} mapping, decoding a record on every access.
+
+    Records set or deleted are kept in memory over the mapped ones, so
+    a section can stand in for the dict of a class in FileStorage.
+    """
+
+    def __init__(self, buf, cls_name, table, count, others):
+        """Initialize a Section over the mapped snapshot buf.
+
+        Args:
+            buf (mmap): the mapped snapshot.
+            cls_name (str): the class name of the records.
+            table (int): the offset of the UUID table.
+            count (int): the number of entries in the UUID table.
+            others (dict): other ids mapped to [offset, length].
+        """
+        self.cls_name = cls_name
+        self.__buf = buf
+        self.__table = table
+        self.__count = count
+        self.__others = others
+        self.__added = {}
+        self.__removed = set()
+
+    def __locate(self, key):
+        """Returns the (id, offset, length) of the mapped record of key,
+        or None."""
+        prefix = self.cls_name + "."
+        if not key.startswith(prefix):
+            return None
+        id = key[len(prefix):]
+        if id in self.__others:
+            return (id, *self.__others[id])
+        uid = _uuid_bytes(id)
+        if uid is None:
+            return None
+        lo, hi = 0, self.__count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = _entry.unpack_from(self.__buf,
+                                       self.__table + mid * _entry.size)
+            if entry[0] < uid:
+                lo = mid + 1
+            elif entry[0] > uid:
+                hi = mid
+            else:
+                return (id, entry[1], entry[2])
+        return None
+
+    def __mapped(self):
+        """Yields the (id, offset, length) of every mapped record."""
+        for i in range(self.__count):
+            uid, offset, length = _entry.unpack_from(
+                self.__buf, self.__table + i * _entry.size)
+            yield str(UUID(bytes=uid)), offset, length
+        for id, (offset, length) in self.__others.items():
+            yield id, offset, length
+
+    def __getitem__(self, key):
+        if key in self.__added:
+            return self.__added[key]
+        found = None if key in self.__removed else self.__locate(key)
+        if found is None:
+            raise KeyError(key)
+        return _decode(self.__buf, self.cls_name, *found)
+
+    def __setitem__(self, key, rec):
+        if key not in self.__added and self.__locate(key) is not None:
+            self.__removed.add(key)
+        self.__added[key] = rec
+
+    def __delitem__(self, key):
+        if key in self.__added:
+            del self.__added[key]
+        elif key not in self.__removed and self.__locate(key) is not None:
+            self.__removed.add(key)
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in self.__added:
+            return True
+        return key not in self.__removed and self.__locate(key) is not None
+
+    def __iter__(self):
+        prefix = self.cls_name + "."
+        for id, offset, length in self.__mapped():
+            if prefix + id not in self.__removed:
+                yield prefix + id
+        yield from list(self.__added)
+
+    def __len__(self):
+        return self.__count + len(self.__others) - len(self.__removed) + \
+            len(self.__added)
+
+    def items(self):
+        """Yields the (key, record) pairs of the section."""
+        prefix = self.cls_name + "."
+        for id, offset, length in self.__mapped():
+            key = prefix + id
+            if key not in self.__removed:
+                yield key, _decode(self.__buf, self.cls_name, id, offset,
+                                   length)
+        yield from list(self.__added.items())
+
+
+def _uuid_bytes(id):
+    """Returns the 16 bytes of id if it's a canonical UUID, or None."""
+    try:
+        uid = UUID(id)
+    except (ValueError, TypeError, AttributeError):
+        return None
+    return uid.bytes if str(uid) == id else None
+
+
+def _micros(text):
+    """Returns the microseconds since the epoch of the ISO text, or
+    _NO_TIME if it would not read back as the same text."""
+    try:
+        dt = datetime.fromisoformat(text)
+    except (ValueError, TypeError):
+        return _NO_TIME
+    if dt.tzinfo is not None or dt.isoformat() != text:
+        return _NO_TIME
+    return (dt - _epoch) // _microsecond
+
+
+def _encode(cls_name, id, rec):
+    """Returns the bytes of the record rec of cls_name.id."""
+    rest = dict(rec)
+    if rest.get("id") == id:
+        del rest["id"]
+    if rest.get("__class__") == cls_name:
+        del rest["__class__"]
+    times = []
+    for name in ("created_at", "updated_at"):
+        us = _micros(rest.get(name))
+        if us != _NO_TIME:
+            del rest[name]
+        times.append(us)
+    return _times.pack(*times) + json.dumps(rest).encode()
+
+
+def _decode(buf, cls_name, id, offset, length):
+    """Returns the record of cls_name.id stored at offset in buf."""
+    created, updated = _times.unpack_from(buf, offset)
+    rest = json.loads(buf[offset + _times.size:offset + length])
+    rec = {"id": id}
+    if created != _NO_TIME:
+        rec["created_at"] = (_epoch + created * _microsecond).isoformat()
+    if updated != _NO_TIME:
+        rec["updated_at"] = (_epoch + updated * _microsecond).isoformat()
+    rec.update(rest)
+    rec.setdefault("__class__", cls_name)
+    return rec
+
+
+def json_to_binary(json_path, binary_path):
+    """Converts the JSON file json_path to the snapshot binary_path."""
+    with open(json_path) as src, open(binary_path, "wb") as dst:
+        write(dst, json_stream.iter_object(src))
+
+
+def binary_to_json(binary_path, json_path):
+    """Converts the snapshot binary_path to the JSON file json_path."""
+    with Snapshot(binary_path) as snap, open(json_path, "w") as dst:
+        json_stream.write_object(dst, (json_stream.fragment(k, v)
+                                       for k, v in snap.items()))
@@ -0,0 +1,207 @@
+#!/usr/bin/python3
+"""The script defines the bitmap sets and the membership index
+FileStorage keeps of the list attributes of a model class, such as the
+amenity_ids of Place.
+
+Every indexed object gets a small integer position, and each value
+found in the lists maps to the Bitmap of the positions of the objects
+holding it, so "holds a and b" and "holds a or b" are bitwise AND and
+OR of bitmaps.
+"""
+
+CHUNK_BITS = 12
+"""int: the log2 of the number of positions per chunk of a Bitmap."""
+
+_CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+
+class Bitmap:
+    """Represents a set of positive integers as chunks of bits.
+
+    Like a roaring bitmap, positions are split into chunks of 4096,
+    each stored as an int of bits, and chunks holding no position are
+    left out. Setting a bit only copies its chunk, and AND and OR only
+    visit the chunks of their operands.
+    """
+
+    def __init__(self, positions=()):
+        """Initialize a new Bitmap.
+
+        Args:
+            positions (iterable): the positions the bitmap holds.
+        """
+        self.__chunks = {}
+        for position in positions:
+            self.add(position)
+
+    @classmethod
+    def __from_chunks(cls, chunks):
+        """Returns a new Bitmap of the {chunk: bits} dict chunks."""
+        bitmap = cls()
+        bitmap.__chunks = chunks
+        return bitmap
+
+    def __len__(self):
+        return sum(bin(bits).count("1") for bits in self.__chunks.values())
+
+    def __bool__(self):
+        return len(self.__chunks) != 0
+
+    def __contains__(self, position):
+        bits = self.__chunks.get(position >> CHUNK_BITS, 0)
+        return bits >> (position & _CHUNK_MASK) & 1 == 1
+
+    def __iter__(self):
+        for chunk in sorted(self.__chunks):
+            bits = self.__chunks[chunk]
+            base = chunk << CHUNK_BITS
+            while bits:
+                low = bits & -bits
+                yield base + low.bit_length() - 1
+                bits ^= low
+
+    def __eq__(self, other):
+        if not isinstance(other, Bitmap):
+            return NotImplemented
+        return self.__chunks == other.__chunks
+
+    def __and__(self, other):
+        small, large = sorted((self.__chunks, other.__chunks), key=len)
+        chunks = {}
+        for chunk, bits in small.items():
+            bits &= large.get(chunk, 0)
+            if bits:
+                chunks[chunk] = bits
+        return Bitmap.__from_chunks(chunks)
+
+    def __or__(self, other):
+        chunks = dict(self.__chunks)
+        for chunk, bits in other.__chunks.items():
+            chunks[chunk] = chunks.get(chunk, 0) | bits
+        return Bitmap.__from_chunks(chunks)
+
+    def __repr__(self):
+        return "Bitmap({})".format(list(self))
+
+    def add(self, position):
+        """Adds position to the bitmap."""
+        chunk = position >> CHUNK_BITS
+        self.__chunks[chunk] = self.__chunks.get(chunk, 0) | \
+            1 << (position & _CHUNK_MASK)
+
+    def discard(self, position):
+        """Removes position from the bitmap if it's inside."""
+        chunk = position >> CHUNK_BITS
+        bits = self.__chunks.get(chunk, 0) & ~(1 << (position & _CHUNK_MASK))
+        if bits:
+            self.__chunks[chunk] = bits
+        else:
+            self.__chunks.pop(chunk, None)
+
+
+class MembershipIndex:
+    """Represents an index from the values held in a list attribute of
+    a model class to the Bitmap of the objects holding them.
+
+    Values that are unhashable, and attribute values that are not
+    lists, tuples or sets, are left out. Lists changed in place are not
+    seen: the attribute must be set to a new list, so storage reindexes
+    the object.
+
+    Attributes:
+        attr (str): the indexed attribute name.
+        attrs (tuple): the attribute names the index reads, (attr,).
+    """
+
+    def __init__(self, attr):
+        """Initialize a new, empty MembershipIndex.
+
+        Args:
+            attr (str): the list attribute name to index.
+        """
+        self.attr = attr
+        self.attrs = (attr,)
+        self.__position = {}
+        self.__entries = []
+        self.__free = []
+        self.__values_of = {}
+        self.__bitmaps = {}
+
+    def __len__(self):
+        return len(self.__position)
+
+    def add(self, key, obj):
+        """Indexes obj under key by the values of its current list."""
+        self.discard(key)
+        if len(self.__free) != 0:
+            position = self.__free.pop()
+            self.__entries[position] = (key, obj)
+        else:
+            position = len(self.__entries)
+            self.__entries.append((key, obj))
+        self.__position[key] = position
+        values = getattr(obj, self.attr, None)
+        held = set()
+        if isinstance(values, (list, tuple, set, frozenset)):
+            for value in values:
+                try:
+                    held.add(value)
+                except TypeError:
+                    continue
+        for value in held:
+            bitmap = self.__bitmaps.get(value)
+            if bitmap is None:
+                bitmap = self.__bitmaps[value] = Bitmap()
+            bitmap.add(position)
+        self.__values_of[key] = held
+
+    def discard(self, key):
+        """Removes key from the index if it's inside."""
+        position = self.__position.pop(key, None)
+        if position is None:
+            return
+        for value in self.__values_of.pop(key):
+            bitmap = self.__bitmaps[value]
+            bitmap.discard(position)
+            if not bitmap:
+                del self.__bitmaps[value]
+        self.__entries[position] = None
+        self.__free.append(position)
+
+    def bitmap(self, value):
+        """Returns the Bitmap of the positions of the objects holding
+        value. It must not be changed."""
+        try:
+            return self.__bitmaps.get(value, _EMPTY)
+        except TypeError:
+            return _EMPTY
+
+    def having(self, all_of=(), any_of=()):
+        """Returns a {key: object} dict of the objects holding every
+        value of all_of and, if any_of is not empty, one of its values.
+
+        Args:
+            all_of (iterable): the values the objects must all hold.
+            any_of (iterable): the values of which the objects must hold
+                at least one.
+        """
+        all_of = list(all_of)
+        any_of = list(any_of)
+        if len(all_of) == 0 and len(any_of) == 0:
+            return {key: obj for key, obj in filter(None, self.__entries)}
+        bitmaps = sorted(map(self.bitmap, all_of), key=len)
+        if len(any_of) != 0:
+            union = _EMPTY
+            for value in any_of:
+                union = union | self.bitmap(value)
+            bitmaps.append(union)
+        found = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            if not found:
+                break
+            found = found & bitmap
+        entries = self.__entries
+        return dict(entries[position] for position in found)
+
+
+_EMPTY = Bitmap()
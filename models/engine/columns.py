@@ -0,0 +1,297 @@
+#!/usr/bin/python3
+"""The script defines the columnar store FileStorage keeps of the
+numeric attributes of a model class.
+
+Each attribute is held in an array.array of int64 or float64 values,
+one row per object. When NumPy is installed, filters, aggregates and
+sorts run on NumPy views of those arrays; otherwise they run through
+map(), compress() and the builtins, without reading the objects.
+"""
+import operator
+from array import array
+from heapq import merge, nlargest, nsmallest
+from itertools import compress, islice, repeat
+from numbers import Real
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    ">": operator.gt,
+}
+"""dict: the comparison operators conditions can use."""
+
+AGGREGATES = ("count", "sum", "min", "max", "mean")
+"""tuple: the functions aggregate() can compute."""
+
+
+class ColumnStore:
+    """Represents the numeric attributes of the objects of a model class
+    as one column per attribute.
+
+    A condition is an (attribute, operator, number) tuple, such as
+    ("price_by_night", "<", 100). Objects whose value of an attribute is
+    not a number of the column's type, such as NaN or a float in an int
+    column, are kept aside for it: they are compared in Python and left
+    out of its aggregates. Sorts order the numbers among them by value
+    with the others, and the rest last.
+
+    Attributes:
+        attrs (tuple): the attribute names held in columns.
+    """
+
+    def __init__(self, defaults):
+        """Initialize a new, empty ColumnStore.
+
+        Args:
+            defaults (dict): the attribute names mapped to their class
+                defaults, whose type (int or float) sets the column type.
+        """
+        self.attrs = tuple(defaults)
+        self.__keys = []
+        self.__objs = []
+        self.__row = {}
+        self.__columns = {attr: array("d" if isinstance(value, float)
+                                      else "q")
+                          for attr, value in defaults.items()}
+        self.__odd = {attr: set() for attr in self.attrs}
+
+    def __len__(self):
+        return len(self.__keys)
+
+    def __contains__(self, key):
+        return key in self.__row
+
+    def add(self, key, obj):
+        """Sets the row of key to the current attribute values of obj."""
+        row = self.__row.get(key)
+        if row is None:
+            row = self.__row[key] = len(self.__keys)
+            self.__keys.append(key)
+            self.__objs.append(obj)
+            for col in self.__columns.values():
+                col.append(0)
+        else:
+            self.__objs[row] = obj
+        for attr, col in self.__columns.items():
+            value = _cell(getattr(obj, attr, None), col.typecode)
+            if value is None:
+                self.__odd[attr].add(key)
+                col[row] = 0
+            else:
+                self.__odd[attr].discard(key)
+                col[row] = value
+
+    def discard(self, key):
+        """Removes key from the store if it's inside, moving the last
+        row into its place."""
+        row = self.__row.pop(key, None)
+        if row is None:
+            return
+        last = len(self.__keys) - 1
+        if row != last:
+            moved = self.__keys[row] = self.__keys[last]
+            self.__objs[row] = self.__objs[last]
+            self.__row[moved] = row
+            for col in self.__columns.values():
+                col[row] = col[last]
+        self.__keys.pop()
+        self.__objs.pop()
+        for col in self.__columns.values():
+            col.pop()
+        for odd in self.__odd.values():
+            odd.discard(key)
+
+    def select(self, *conditions):
+        """Returns a {key: object} dict of the objects matching every
+        condition, or of every object if none is given."""
+        return self.__entries(self.__rows(conditions))
+
+    def aggregate(self, func, attr, *conditions):
+        """Returns func of the values of attr of the objects matching
+        every condition, or None for the min, max or mean of no value.
+
+        Args:
+            func (str): one of "count", "sum", "min", "max" or "mean".
+            attr (str): the attribute to aggregate.
+            *conditions (tuple): the conditions objects must match.
+        """
+        if func not in AGGREGATES:
+            raise ValueError("Unknown aggregate: {}".format(func))
+        rows = self.__rows(conditions, attr)
+        col = self.__columns[attr]
+        if numpy is not None:
+            values = _view(col)[rows]
+            if func == "count":
+                return len(values)
+            if func != "sum" and len(values) == 0:
+                return None
+            return getattr(values, func)().item()
+        if isinstance(rows, range):
+            values = col
+        else:
+            values = list(map(col.__getitem__, rows))
+        if func == "count":
+            return len(values)
+        if func == "sum":
+            return sum(values, 0 if col.typecode == "q" else 0.0)
+        if len(values) == 0:
+            return None
+        if func == "mean":
+            return sum(values) / len(values)
+        return min(values) if func == "min" else max(values)
+
+    def sort(self, attr, *conditions, reverse=False, limit=None):
+        """Returns the list of the objects matching every condition,
+        ordered by attr, with the objects whose attr is not a number, or
+        is NaN, last. Objects of equal value keep their row order.
+
+        Args:
+            attr (str): the attribute to order by.
+            *conditions (tuple): the conditions objects must match.
+            reverse (bool): whether to order by descending value.
+            limit (int): the maximum number of objects to return.
+        """
+        col = self.__columns[attr]
+        rows = self.__rows(conditions, attr)
+        if numpy is not None:
+            values = _view(col)[rows]
+            if limit is not None and 0 < limit < len(values):
+                # Keep the rows up to the limit-th value, ties included,
+                # so that only those are sorted.
+                if reverse:
+                    kth = numpy.partition(values, -limit)[-limit]
+                    keep = numpy.flatnonzero(values >= kth)
+                else:
+                    kth = numpy.partition(values, limit - 1)[limit - 1]
+                    keep = numpy.flatnonzero(values <= kth)
+                rows, values = rows[keep], values[keep]
+            if reverse:
+                rows = rows[::-1][numpy.argsort(values[::-1],
+                                                kind="stable")][::-1]
+            else:
+                rows = rows[numpy.argsort(values, kind="stable")]
+            rows = rows[:limit].tolist()
+        elif limit is None:
+            rows = sorted(rows, key=col.__getitem__, reverse=reverse)
+        elif reverse:
+            rows = nlargest(limit, rows, key=col.__getitem__)
+        else:
+            rows = nsmallest(limit, rows, key=col.__getitem__)
+        odd = [row for row in self.__odd_rows((attr,))
+               if self.__matches(row, conditions)]
+        numbers = {}
+        for row in odd:
+            value = getattr(self.__objs[row], attr, None)
+            if isinstance(value, Real) and value == value:
+                numbers[row] = value
+        if len(numbers) != 0:
+            # Numbers of another type than the column's, such as floats
+            # in an int column, are merged in by value.
+            sign = -1 if reverse else 1
+            merged = merge(
+                ((sign * col[row], row) for row in rows),
+                sorted((sign * value, row) for row, value in numbers.items()))
+            rows = [row for value, row in islice(merged, limit)]
+            odd = [row for row in odd if row not in numbers]
+        if limit is None or len(rows) < limit:
+            rows += odd[:None if limit is None else limit - len(rows)]
+        return list(map(self.__objs.__getitem__, rows))
+
+    def __entries(self, rows):
+        """Returns the {key: object} dict of rows, in their order."""
+        if numpy is not None and not isinstance(rows, list):
+            rows = rows.tolist()
+        return dict(zip(map(self.__keys.__getitem__, rows),
+                        map(self.__objs.__getitem__, rows)))
+
+    def __rows(self, conditions, attr=None):
+        """Returns the rows matching conditions in ascending order,
+        leaving out the rows whose attr is not a number.
+
+        The rows are a NumPy array if NumPy is installed, and a list or
+        a range otherwise.
+        """
+        for name, op, value in conditions:
+            if name not in self.__columns:
+                raise KeyError(name)
+            if op not in OPERATORS:
+                raise ValueError("Unknown operator: {}".format(op))
+            if not isinstance(value, Real):
+                raise TypeError("Not a number: {!r}".format(value))
+        odd = self.__odd_rows(name for name, op, value in conditions)
+        excluded = self.__odd_rows(() if attr is None else (attr,))
+        if numpy is not None:
+            mask = numpy.ones(len(self.__keys), dtype=bool)
+            for name, op, value in conditions:
+                values = _view(self.__columns[name])
+                mask &= OPERATORS[op](values, value)
+                del values
+            for row in odd:
+                mask[row] = self.__matches(row, conditions)
+            mask[excluded] = False
+            return numpy.flatnonzero(mask)
+        rows = range(len(self.__keys))
+        for name, op, value in conditions:
+            col = self.__columns[name]
+            values = col if isinstance(rows, range) else \
+                map(col.__getitem__, rows)
+            rows = list(compress(rows, map(OPERATORS[op], values,
+                                           repeat(value))))
+        if len(odd) != 0 or len(excluded) != 0:
+            rows = set(rows).difference(odd, excluded)
+            rows.update(row for row in odd
+                        if self.__matches(row, conditions))
+            rows = sorted(rows.difference(excluded))
+        return rows
+
+    def __odd_rows(self, attrs):
+        """Returns the sorted rows whose value of one of attrs is not a
+        number."""
+        keys = set()
+        for attr in attrs:
+            keys.update(self.__odd[attr])
+        return sorted(self.__row[key] for key in keys)
+
+    def __matches(self, row, conditions):
+        """Returns whether the object of row matches conditions,
+        comparing its attribute values in Python."""
+        obj = self.__objs[row]
+        for name, op, value in conditions:
+            try:
+                if not OPERATORS[op](getattr(obj, name, None), value):
+                    return False
+            except TypeError:
+                return False
+        return True
+
+
+def _cell(value, typecode):
+    """Returns value as stored in a column of typecode, or None if it
+    is not a number of the column's type or is NaN."""
+    if typecode == "q":
+        if isinstance(value, int) and -(1 << 63) <= value < 1 << 63:
+            return value
+        return None
+    if isinstance(value, (int, float)) and value == value:
+        try:
+            return float(value)
+        except OverflowError:
+            return None
+    return None
+
+
+def _view(col):
+    """Returns a NumPy array sharing the memory of the column col.
+
+    The column cannot be resized while the view exists, so views must
+    not outlive the method that takes them.
+    """
+    return numpy.frombuffer(col, dtype=col.typecode)
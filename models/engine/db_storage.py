@@ -0,0 +1,564 @@
+#!/usr/bin/python3
+"""The script defines the DBStorage class."""
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from os import getenv
+from models.base_model import classes
+from models.engine.geo import bounding_box, closest, in_box, located
+from models.engine.query import MISSING, Query, matches, ordered, take
+from models.engine.text import tokenize
+
+
+class DBStorage:
+    """The script represents a storage engine backed by SQLite.
+
+    Every model class has its own table, with the id as primary key, a
+    column per declared class attribute and an "extra" column holding
+    the other attributes as JSON. Attribute columns have no type
+    affinity, so values read back with the type they were written with,
+    as in FileStorage. Attributes listed in a model's
+    _indexed or _ranged tuple get an SQL index; the ones of _ranged
+    attributes are built on the expression queries compare, so range
+    conditions and orders on them use the index. The _located
+    attributes share an index, which within() and nearby() narrow to a
+    box before checking positions in Python. search() keeps the rows
+    whose _searchable columns contain every word, then checks the words
+    of the objects in Python, and having() does the same with the JSON
+    of the values of _members columns.
+
+    Objects read or created are kept in an identity map. New, changed
+    and deleted objects are written to the database before any query
+    and on save(), which commits; rows of unchanged objects are never
+    rewritten.
+
+    query() runs in SQL the conditions and the order on declared
+    attributes whose values are of the attribute's type, and on the
+    timestamps for naive datetime values, and the limit when every
+    condition does; the rest is done in Python, where the objects found
+    are also checked against every condition.
+
+    Attributes:
+        __db_path (str): Name of the SQLite database file.
+        __conn (sqlite3.Connection): The open database connection.
+        __objects (dict): Identity map of the objects by key.
+        __dirty (dict): Keys of new or changed objects mapped to them.
+        __deleted (dict): Keys of deleted objects mapped to their class.
+        __in_transaction (bool): Whether save() must leave committing
+            to transaction().
+    """
+    __db_path = getenv("HBNB_DB_PATH", "hbnb.db")
+    __conn = None
+    __objects = {}
+    __dirty = {}
+    __deleted = {}
+    __in_transaction = False
+
+    def all(self, cls=None):
+        """Returns the dictionary of every object, or a dictionary of
+        the objects of class cls (a class or a class name)."""
+        self.__write()
+        if cls is None:
+            for cls in classes.values():
+                self.__select(cls, "")
+            return DBStorage.__objects
+        cls = self.__class(cls)
+        if cls is None:
+            return {}
+        return self.__select(cls, "")
+
+    def count(self, cls=None):
+        """Returns the number of objects, or of objects of class cls
+        (a class or a class name)."""
+        self.__write()
+        if cls is None:
+            tables = list(classes.values())
+        else:
+            cls = self.__class(cls)
+            tables = [] if cls is None else [cls]
+        return sum(DBStorage.__conn.execute(
+            'SELECT COUNT(*) FROM "{}"'.format(c.__name__)).fetchone()[0]
+            for c in tables)
+
+    def get(self, cls, id):
+        """Returns the object of class cls (a class or a class name)
+        with the given id, or None if there is none."""
+        cls = self.__class(cls)
+        if cls is None:
+            return None
+        key = f"{cls.__name__}.{id}"
+        if key in DBStorage.__objects:
+            return DBStorage.__objects[key]
+        if key in DBStorage.__deleted:
+            return None
+        found = self.__select(cls, 'WHERE "id" = ?', (id,))
+        return found.get(key)
+
+    def find(self, cls, **equals):
+        """Returns a dictionary of the objects of class cls whose
+        attributes are equal to the values given as keywords.
+
+        Declared attributes are compared in SQL as query() compares
+        them, missing values reading as the class default, and the
+        others in Python.
+        """
+        self.__write()
+        cls = self.__class(cls)
+        if cls is None:
+            return {}
+        where = []
+        params = []
+        for attr, value in equals.items():
+            column = self.__sql_column(cls, attr, value, params)
+            if column is not None:
+                where.append("{} = ?".format(column))
+                params.append(self.__to_column(value))
+        found = self.__select(cls, self.__where(where), params)
+        return {key: obj for key, obj in found.items()
+                if all(getattr(obj, attr, None) == value
+                       for attr, value in equals.items())}
+
+    def query(self, cls):
+        """Returns a Query on the objects of class cls (a class or a
+        class name)."""
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return Query(cls, self.__run)
+
+    def __run(self, cls_name, conditions, order, reverse, limit):
+        """Yields the objects of the class named cls_name matching
+        conditions, ordered by the attribute order if it's not None, up
+        to limit objects if it's not None."""
+        cls = self.__class(cls_name)
+        if cls is None or limit == 0:
+            return
+        self.__write()
+        where = []
+        params = []
+        rest = []
+        for cond in conditions:
+            column = self.__sql_column(cls, cond[0], cond[2], params)
+            if column is None:
+                rest.append(cond)
+            else:
+                where.append("{} {} ?".format(
+                    column, "=" if cond[1] == "==" else cond[1]))
+                params.append(self.__to_column(cond[2]))
+        if order is not None and \
+                self.__sql_column(cls, order, None, []) is None:
+            found = self.__select(cls, self.__where(where), params)
+            objs = (obj for obj in found.values() if matches(obj, conditions))
+            yield from ordered(objs, lambda obj: getattr(obj, order, MISSING),
+                               reverse, limit)
+            return
+        sql_limit = limit if len(rest) == 0 else None
+        for part, order_by in self.__order_parts(cls, order, reverse):
+            if sql_limit is not None:
+                order_by += " LIMIT {:d}".format(sql_limit)
+            found = self.__select(cls, self.__where(where + part) + order_by,
+                                  params)
+            objs = [obj for obj in found.values() if matches(obj, conditions)]
+            yield from take(objs, limit)
+            if limit is not None:
+                limit -= min(limit, len(objs))
+                if limit == 0:
+                    return
+                if sql_limit is not None:
+                    sql_limit = limit
+
+    def __order_parts(self, cls, order, reverse):
+        """Returns the list of (conditions, ORDER BY clause) pairs of the
+        SQL queries yielding the objects of cls ordered by the attribute
+        order, in turn.
+
+        SQLite orders numbers before text, so a declared attribute is
+        read in two parts, as FileStorage orders it: the values of its
+        type in order, then the others. Both parts are ranges of the
+        expression its SQL index is built on.
+        """
+        if order is None:
+            return [([], "")]
+        columns = self.__columns(cls)
+        column = self.__indexed_column(order, columns.get(order))
+        desc = " DESC" if reverse else ""
+        order_by = " ORDER BY {0}{1}, rowid{1}".format(column, desc)
+        if order not in columns:
+            return [([], order_by)]
+        if isinstance(columns[order], str):
+            typed = "{0} >= '' AND {0} < x''".format(column)
+        else:
+            typed = "{} < ''".format(column)
+        return [([typed], order_by),
+                (["NOT ({})".format(typed)], " ORDER BY rowid")]
+
+    @staticmethod
+    def __where(conditions):
+        """Returns the WHERE clause of the SQL conditions, or an empty
+        string if there are none."""
+        if len(conditions) == 0:
+            return ""
+        return "WHERE " + " AND ".join(conditions)
+
+    def within(self, cls, south, west, north, east):
+        """Returns a dictionary of the objects of class cls (a class or
+        a class name) positioned inside the box, or an empty one if cls
+        has no _located attributes.
+
+        A box whose west edge is east of its east edge crosses the
+        180th meridian.
+        """
+        cls = self.__class(cls)
+        if cls is None or len(getattr(cls, "_located", ())) != 2:
+            return {}
+        found = self.__select_box(cls, south, west, north, east)
+        return {key: obj for key, obj in found.items()
+                if in_box(located(obj, cls._located), south, west, north,
+                          east)}
+
+    def nearby(self, cls, latitude, longitude, km, limit=None):
+        """Returns the list of the objects of class cls (a class or a
+        class name) within km kilometres of the point, nearest first, up
+        to limit objects if it's not None.
+
+        Returns an empty list if cls has no _located attributes.
+        """
+        cls = self.__class(cls)
+        if cls is None or len(getattr(cls, "_located", ())) != 2:
+            return []
+        found = self.__select_box(cls, *bounding_box(latitude, longitude,
+                                                     km))
+        found = closest(latitude, longitude, km, found.items(),
+                        cls._located)
+        return [obj for dist, key, obj in take(found, limit)]
+
+    def search(self, cls, text):
+        """Returns a dictionary of the objects of class cls (a class or
+        a class name) whose _searchable attributes hold every word of
+        text, or an empty one if cls has no _searchable attributes.
+
+        Words are compared case-insensitively, as tokenize() splits
+        them.
+        """
+        cls = self.__class(cls)
+        words = set(tokenize(text))
+        attrs = getattr(cls, "_searchable", ())
+        if cls is None or len(attrs) == 0 or len(words) == 0:
+            return {}
+        self.__write()
+        where = []
+        params = []
+        for word in words:
+            where.append("({})".format(" OR ".join(
+                'casefold("{}") LIKE ? ESCAPE \'!\''.format(attr)
+                for attr in attrs)))
+            params += ["%{}%".format(word.replace("_", "!_"))] * len(attrs)
+        found = self.__select(cls, "WHERE " + " AND ".join(where), params)
+        matching = {}
+        for key, obj in found.items():
+            held = set()
+            for attr in attrs:
+                held.update(tokenize(getattr(obj, attr, None)))
+            if words.issubset(held):
+                matching[key] = obj
+        return matching
+
+    def having(self, cls, attr, all_of=(), any_of=()):
+        """Returns a dictionary of the objects of class cls (a class or
+        a class name) whose list attr holds every value of all_of and,
+        if any_of is not empty, one of its values.
+
+        Returns an empty dictionary if attr is not one of the _members
+        attributes of cls.
+        """
+        cls = self.__class(cls)
+        if attr not in getattr(cls, "_members", ()):
+            return {}
+        all_of = list(all_of)
+        any_of = list(any_of)
+        self.__write()
+        like = '"{}" LIKE ? ESCAPE \'!\''.format(attr)
+        where = []
+        params = []
+        for value in all_of:
+            where.append(like)
+            params.append(self.__json_pattern(value))
+        if len(any_of) != 0:
+            where.append("({})".format(" OR ".join([like] * len(any_of))))
+            params += map(self.__json_pattern, any_of)
+        clause = "WHERE " + " AND ".join(where) if where else ""
+        found = self.__select(cls, clause, params)
+        matching = {}
+        for key, obj in found.items():
+            values = getattr(obj, attr, None)
+            if not isinstance(values, (list, tuple, set, frozenset)):
+                values = ()
+            if all(value in values for value in all_of) and \
+                    (len(any_of) == 0 or
+                     any(value in values for value in any_of)):
+                matching[key] = obj
+        return matching
+
+    @staticmethod
+    def __json_pattern(value):
+        """Returns the LIKE pattern, escaped by "!", of the JSON lists
+        holding value."""
+        text = json.dumps(value)
+        for char in "!%_":
+            text = text.replace(char, "!" + char)
+        return "%{}%".format(text)
+
+    def __select_box(self, cls, south, west, north, east):
+        """Returns a {key: object} dict of the objects of cls whose
+        _located columns may be inside the box."""
+        self.__write()
+        defaults = self.__columns(cls)
+        lat, lng = (self.__indexed_column(attr, defaults.get(attr))
+                    for attr in cls._located)
+        if west <= east:
+            clause = "WHERE {0} BETWEEN ? AND ? AND {1} BETWEEN ? AND ?"
+        else:
+            clause = "WHERE {0} BETWEEN ? AND ? AND ({1} >= ? OR {1} <= ?)"
+        return self.__select(cls, clause.format(lat, lng),
+                             (south, north, west, east))
+
+    def new(self, obj):
+        """Sets obj in the identity map and marks it for writing."""
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        DBStorage.__objects[key] = obj
+        DBStorage.__dirty[key] = obj
+        DBStorage.__deleted.pop(key, None)
+
+    def touch(self, obj, *names):
+        """Marks obj as changed since the last save."""
+        key = f"{obj.__class__.__name__}.{obj.__dict__.get('id')}"
+        if DBStorage.__objects.get(key) is obj:
+            DBStorage.__dirty[key] = obj
+
+    def preserve(self, obj):
+        """Does nothing: transactions are rolled back by SQLite."""
+        pass
+
+    def delete(self, obj=None):
+        """Deletes obj from the database if it's inside."""
+        if obj is None:
+            return
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        DBStorage.__objects.pop(key, None)
+        DBStorage.__dirty.pop(key, None)
+        DBStorage.__deleted[key] = obj.__class__
+
+    def save(self):
+        """Writes the new, changed and deleted objects and commits."""
+        self.__write()
+        if not DBStorage.__in_transaction:
+            DBStorage.__conn.commit()
+
+    def flush(self):
+        """Does nothing: save() never defers writes."""
+        pass
+
+    @contextmanager
+    def transaction(self):
+        """Returns a context manager committing once when the block
+        exits normally, and rolling the database back if it raises.
+
+        After a rollback the identity map is emptied, so objects are
+        read again from the database.
+        """
+        if DBStorage.__in_transaction:
+            yield self
+            return
+        DBStorage.__in_transaction = True
+        try:
+            yield self
+            self.__write()
+        except BaseException:
+            DBStorage.__conn.rollback()
+            DBStorage.__objects = {}
+            DBStorage.__dirty = {}
+            DBStorage.__deleted = {}
+            raise
+        finally:
+            DBStorage.__in_transaction = False
+        DBStorage.__conn.commit()
+
+    def reload(self):
+        """Opens the database, creating missing tables and indexes,
+        and empties the identity map."""
+        if DBStorage.__conn is not None:
+            DBStorage.__conn.close()
+        conn = sqlite3.connect(DBStorage.__db_path)
+        conn.row_factory = sqlite3.Row
+        conn.create_function("casefold", 1, _casefold, deterministic=True)
+        for name, cls in classes.items():
+            columns = ['"{}"'.format(col) for col in self.__columns(cls)]
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS "{}" ("id" TEXT PRIMARY KEY, '
+                '"created_at" TEXT, "updated_at" TEXT, {}"extra" TEXT)'
+                .format(name, "".join(c + ", " for c in columns)))
+            for attr in getattr(cls, "_indexed", ()):
+                conn.execute(
+                    'CREATE INDEX IF NOT EXISTS "{0}_{1}" ON "{0}" ("{1}")'
+                    .format(name, attr))
+            defaults = self.__columns(cls)
+            for attr in getattr(cls, "_ranged", ()):
+                conn.execute(
+                    'CREATE INDEX IF NOT EXISTS "{0}_{1}" ON "{0}" ({2})'
+                    .format(name, attr,
+                            self.__indexed_column(attr, defaults.get(attr))))
+            located_attrs = getattr(cls, "_located", ())
+            if len(located_attrs) == 2:
+                conn.execute(
+                    'CREATE INDEX IF NOT EXISTS "{}_location" ON "{}" ({})'
+                    .format(name, name, ", ".join(
+                        self.__indexed_column(attr, defaults.get(attr))
+                        for attr in located_attrs)))
+        conn.commit()
+        DBStorage.__conn = conn
+        DBStorage.__objects = {}
+        DBStorage.__dirty = {}
+        DBStorage.__deleted = {}
+
+    def __write(self):
+        """Writes the rows of the new, changed and deleted objects."""
+        conn = DBStorage.__conn
+        for key, cls in DBStorage.__deleted.items():
+            conn.execute('DELETE FROM "{}" WHERE "id" = ?'.format(
+                cls.__name__), (key.split(".", 1)[1],))
+        for obj in DBStorage.__dirty.values():
+            row = self.__to_row(obj)
+            conn.execute('INSERT OR REPLACE INTO "{}" ({}) VALUES ({})'.format(
+                obj.__class__.__name__,
+                ", ".join('"{}"'.format(col) for col in row),
+                ", ".join("?" for col in row)), list(row.values()))
+        DBStorage.__deleted = {}
+        DBStorage.__dirty = {}
+
+    def __select(self, cls, clause, params=()):
+        """Returns a {key: object} dict of the rows of cls matching the
+        SQL clause, preferring objects already in the identity map."""
+        found = {}
+        rows = DBStorage.__conn.execute(
+            'SELECT * FROM "{}" {}'.format(cls.__name__, clause), params)
+        for row in rows:
+            key = f"{cls.__name__}.{row['id']}"
+            obj = DBStorage.__objects.get(key)
+            if obj is None:
+                obj = cls.from_dict(self.__from_row(cls, row))
+                DBStorage.__objects[key] = obj
+            found[key] = obj
+        return found
+
+    def __to_row(self, obj):
+        """Returns the {column: value} dict of obj.
+
+        A declared attribute whose value its column cannot hold as is,
+        such as a list set to a str attribute or a str set to a list
+        attribute, is kept in the "extra" column instead.
+        """
+        attrs = obj.to_dict()
+        del attrs["__class__"]
+        row = {"id": attrs.pop("id"), "created_at": attrs.pop("created_at"),
+               "updated_at": attrs.pop("updated_at")}
+        for col, default in self.__columns(obj.__class__).items():
+            value = attrs.get(col)
+            if isinstance(default, list):
+                fits = value is None or isinstance(value, list)
+            else:
+                fits = value is None or isinstance(value, (str, int, float))
+            row[col] = self.__to_column(attrs.pop(col, None)) if fits \
+                else None
+        row["extra"] = json.dumps(attrs)
+        return row
+
+    def __from_row(self, cls, row):
+        """Returns the keyword arguments building the object of row."""
+        kwargs = json.loads(row["extra"] or "{}")
+        kwargs.update(id=row["id"], created_at=row["created_at"],
+                      updated_at=row["updated_at"])
+        for col, default in self.__columns(cls).items():
+            if row[col] is not None:
+                value = row[col]
+                if isinstance(default, list):
+                    try:
+                        value = json.loads(value)
+                    except (TypeError, ValueError):
+                        pass
+                kwargs[col] = value
+        return kwargs
+
+    def __sql_column(self, cls, attr, value, params):
+        """Returns the SQL expression of attr in the table of cls, or None
+        if attr is not a declared attribute, or value (unless None) is not
+        of its type, so the comparison cannot run in SQL.
+
+        Missing values read as the class default, appended to params,
+        or written in the expression for _ranged and _located
+        attributes, to match their SQL index.
+        """
+        if attr == "id":
+            return '"id"' if value is None or isinstance(value, str) else None
+        if attr in ("created_at", "updated_at"):
+            # Timestamps are stored as isoformat() text, which sorts in
+            # time order for naive datetimes.
+            if value is None or isinstance(value, datetime) and \
+                    value.tzinfo is None:
+                return '"{}"'.format(attr)
+            return None
+        columns = self.__columns(cls)
+        if attr not in columns or isinstance(columns[attr], list):
+            return None
+        default = columns[attr]
+        if value is not None:
+            if isinstance(value, bool) or \
+                    not isinstance(value, (str, int, float)) or \
+                    isinstance(value, str) != isinstance(default, str):
+                return None
+        if attr in getattr(cls, "_ranged", ()) or \
+                attr in getattr(cls, "_located", ()):
+            return self.__indexed_column(attr, default)
+        params.append(default)
+        return 'COALESCE("{}", ?)'.format(attr)
+
+    @staticmethod
+    def __indexed_column(attr, default):
+        """Returns the SQL expression of the _ranged or _located
+        attribute attr whose class default is default (None for the
+        timestamps), which its SQL index is built on."""
+        if default is None:
+            return '"{}"'.format(attr)
+        if isinstance(default, str):
+            default = "'{}'".format(default.replace("'", "''"))
+        return 'COALESCE("{}", {})'.format(attr, default)
+
+    @staticmethod
+    def __to_column(value):
+        """Returns value as stored in an SQLite column."""
+        if value is None or isinstance(value, (str, int, float)):
+            return value
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return json.dumps(value)
+
+    @staticmethod
+    def __columns(cls):
+        """Returns the declared public attributes of cls mapped to their
+        default values."""
+        defaults = getattr(cls, "_defaults", vars(cls))
+        return {name: value for name, value in defaults.items()
+                if not name.startswith("_") and
+                isinstance(value, (str, int, float, list))}
+
+    @staticmethod
+    def __class(cls):
+        """Returns the model class named cls, or cls if it's a class."""
+        if isinstance(cls, str):
+            return classes.get(cls)
+        return cls
+
+
+def _casefold(text):
+    """Returns text casefolded, for the casefold() SQL function, or
+    None if it is not a string."""
+    return text.casefold() if isinstance(text, str) else None
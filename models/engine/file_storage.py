@@ -1,50 +1,1040 @@
 #!/usr/bin/python3
 """The script defines the FileStorage class."""
+import os
 import json
-from models.base_model import BaseModel
-from models.user import User
-from models.state import State
-from models.city import City
-from models.place import Place
-from models.amenity import Amenity
-from models.review import Review
+import threading
+from contextlib import contextmanager
+from os import getenv, remove, rename, replace
+from os.path import abspath, dirname, getsize
+from sys import intern
+from datetime import datetime
+from itertools import chain
+from numbers import Real
+from operator import itemgetter
+from time import monotonic
+from models.engine import binary_snapshot, json_stream, registry
+from models.engine.columns import OPERATORS
+from models.engine.query import MISSING, Query, matches, ordered, take
+from models.base_model import classes, parse_datetime
 
 
 class FileStorage:
     """The script represent an abstracted storage engine.
 
+    save() writes __objects to the __file_path snapshot, in JSON or in
+    the binary_snapshot format (HBNB_STORAGE_FORMAT=binary), through a
+    temporary file fsynced (unless HBNB_STORAGE_FSYNC=0) and renamed
+    over it. In journal mode (HBNB_STORAGE_JOURNAL=1) it appends the
+    changes since the last save to __journal_path instead, and a
+    background thread compacts the journal into the snapshot. In lazy
+    mode (HBNB_STORAGE_LAZY=1) reload() only builds objects from their
+    records when asked for.
+
+    BaseModel reports attribute writes through touch(), so a save only
+    serializes changed objects. save() calls can be grouped
+    (HBNB_STORAGE_GROUP_SIZE, HBNB_STORAGE_GROUP_WINDOW) or buffered in
+    a transaction().
+
+    Objects are indexed by class name, and the attributes a model
+    declares in _indexed, _ranged, _members, _columnar, _located and
+    _searchable get the indexes of registry.KINDS. Each is built on the
+    first find(), query(), having(), columns(), within(), nearby() or
+    search() needing it, then kept up to date on every write.
+
     Attributes:
+        __binary (bool): Whether the snapshot is in the binary format.
         __file_path (str): Name of the file to save objects to.
+        __journal_path (str): Name of the append-only journal file.
+        __rotated_path (str): Name of the journal being compacted.
+        __journal (bool): Whether save() appends to the journal instead
+            of rewriting __file_path.
+        __compact_size (int): Journal size in bytes that triggers a
+            compaction.
+        __compact_age (float): Journal age in seconds that triggers a
+            compaction.
         __objects (dict): Dictionary of instantiated objects.
+        __changed (dict): Keys changed or deleted since the last save,
+            mapped to the set of changed attribute names, or to None
+            when the whole object changed.
+        __cache (dict): Keys mapped to (object, '"key": {json}') pairs
+            as last written to a JSON snapshot, for objects holding no
+            list or dict.
+        __containers (dict): In journal mode, keys of objects holding
+            lists or dicts mapped to (object, JSON of those values)
+            pairs as last journaled or loaded.
+        __by_class (dict): Class names mapped to {key: object} dicts.
+        __indexed (dict): The __objects dict __by_class was built for.
+        __indexed_len (int): Number of objects held by __by_class.
+        __exposed (bool): Whether all() returned __objects since
+            __by_class was last checked against it.
+        __registry (dict): Class names mapped to {(kind, attribute):
+            index} dicts of the indexes built so far, with a None
+            attribute for the kinds covering several attributes.
+        __covering (dict): Class names mapped to {attribute: indexes}
+            dicts of the built indexes reading each attribute, filled
+            as touch() needs them.
+        __lazy (bool): Whether reload() defers building objects.
+        __pending (dict): Class names mapped to {key: record} dicts, or
+            binary_snapshot.Section mappings, of the records reload() has
+            not built objects from yet.
+        __references (dict): Class names mapped to the names of the
+            foreign key attributes their records are interned on.
+        __fsync (bool): Whether writes are fsynced before returning.
+        __fsync_dir (bool): Whether renames are made durable by
+            fsyncing the directory of __file_path.
+        __group_size (int): Number of save() calls per write, or 0.
+        __group_window (float): Seconds save() calls are deferred, or 0.
+        __deferred (int): Number of save() calls not written yet.
+        __deferred_since (float): monotonic() time of the oldest save()
+            not written yet.
+        __undo (dict): Inside a transaction, keys mapped to (object,
+            attributes) pairs of their state before it, with a None
+            object for keys that were absent. None otherwise.
     """
-    __file_path = "file.json"
+    __binary = getenv("HBNB_STORAGE_FORMAT") == "binary"
+    __file_path = "file.bin" if __binary else "file.json"
+    __journal_path = "file.json.log"
+    __rotated_path = "file.json.log.1"
+    __journal = getenv("HBNB_STORAGE_JOURNAL") == "1"
+    __compact_size = int(getenv("HBNB_JOURNAL_MAX_BYTES", 4 << 20))
+    __compact_age = float(getenv("HBNB_JOURNAL_MAX_AGE", 300))
     __objects = {}
+    __changed = {}
+    __cache = {}
+    __containers = {}
+    __by_class = {}
+    __indexed = None
+    __indexed_len = 0
+    __exposed = False
+    __registry = {}
+    __covering = {}
+    __lazy = getenv("HBNB_STORAGE_LAZY") == "1"
+    __pending = {}
+    __references = {}
+    __fsync = getenv("HBNB_STORAGE_FSYNC", "1") != "0"
+    __fsync_dir = getenv("HBNB_STORAGE_FSYNC_DIR") == "1"
+    __group_size = int(getenv("HBNB_STORAGE_GROUP_SIZE", 0))
+    __group_window = float(getenv("HBNB_STORAGE_GROUP_WINDOW", 0))
+    __deferred = 0
+    __deferred_since = None
+    __undo = None
+    __lock = threading.Lock()
+    __compactor = None
+    __journal_since = None
+
+    def all(self, cls=None):
+        """Returns the dictionary __objects, or a dictionary of the
+        objects of class cls (a class or a class name).
+
+        Changes made to the returned __objects are picked up by the
+        next call to the storage, which checks its class index against
+        it; the dict must not be kept to change it later.
+        """
+        if cls is None:
+            for cls_name in list(FileStorage.__pending):
+                self.__hydrate(cls_name)
+            FileStorage.__exposed = True
+            return FileStorage.__objects
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__hydrate(cls)
+        return dict(self.__class_index().get(cls, {}))
+
+    def count(self, cls=None):
+        """Returns the number of objects, or of objects of class cls
+        (a class or a class name)."""
+        pending = FileStorage.__pending
+        if cls is None:
+            return len(FileStorage.__objects) + \
+                sum(len(recs) for recs in pending.values())
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return len(self.__class_index().get(cls, {})) + \
+            len(pending.get(cls, {}))
+
+    def get(self, cls, id):
+        """Returns the object of class cls (a class or a class name)
+        with the given id, or None if there is none."""
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        key = f"{cls}.{id}"
+        obj = FileStorage.__objects.get(key)
+        if obj is None and key in FileStorage.__pending.get(cls, {}):
+            obj = self.__build(key, FileStorage.__pending[cls].pop(key))
+        return obj
+
+    def find(self, cls, **equals):
+        """Returns a dictionary of the objects of class cls whose
+        attributes are equal to the values given as keywords.
+
+        Lookups start from the smallest indexed candidate set, and fall
+        back to the objects of cls when no keyword is indexed.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__hydrate(cls)
+        conditions = [(attr, "==", value) for attr, value in equals.items()]
+        return {key: obj
+                for key, obj in self.__candidates(cls, conditions).items()
+                if matches(obj, conditions)}
+
+    def query(self, cls):
+        """Returns a Query on the objects of class cls (a class or a
+        class name)."""
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return Query(cls, self.__run)
+
+    def __run(self, cls_name, conditions, order, reverse, limit):
+        """Yields the objects of the class named cls_name matching
+        conditions, ordered by the attribute order if it's not None, up
+        to limit objects if it's not None.
+
+        The objects come from the smallest ValueIndex lookup of the ==
+        conditions, else from the RangeIndex of the order or of the
+        narrowest range the conditions bound, else from the ColumnStore
+        for _columnar orders and conditions, else from a scan. Pending
+        records are matched as records, and only those returned are
+        built.
+        """
+        model = classes.get(cls_name)
+        if model is None or limit == 0:
+            return
+        pending = FileStorage.__pending.get(cls_name, {})
+        candidates = self.__candidates(cls_name, conditions)
+        objs = None
+        if len(pending) == 0 and \
+                candidates is self.__class_index().get(cls_name, {}):
+            # Only the structure the plan uses is built: a RangeIndex to
+            # order by or bound a _ranged attribute, else the ColumnStore
+            # to order by or filter _columnar attributes.
+            ranged = getattr(model, "_ranged", ())
+            columns = getattr(model, "_columnar", ())
+            columnar = [cond for cond in conditions
+                        if cond[0] in columns and isinstance(cond[2], Real)]
+            if order in ranged:
+                yield from self.__walk(self.__index("range", cls_name, order),
+                                       conditions, reverse, limit)
+                return
+            if order in columns:
+                rest = [cond for cond in conditions if cond not in columnar]
+                objs = self.__index("column", cls_name).sort(
+                    order, *columnar, reverse=reverse,
+                    limit=limit if len(rest) == 0 else None)
+                yield from take((obj for obj in objs if matches(obj, rest)),
+                                limit)
+                return
+            bounded = {attr for attr, op, value in conditions
+                       if attr in ranged and op != "!="}
+            index = self.__narrowest([self.__index("range", cls_name, attr)
+                                      for attr in ranged if attr in bounded],
+                                     conditions)
+            if index is not None:
+                objs = self.__walk(index, conditions, False,
+                                   limit if order is None else None)
+            elif len(columnar) != 0 and limit is None:
+                candidates = self.__index("column", cls_name).select(
+                    *columnar)
+        # Matches are collected before the first yield, so the caller may
+        # change the store while iterating.
+        if objs is None:
+            objs = list(take((obj for obj in candidates.values()
+                              if matches(obj, conditions)),
+                             limit if order is None else None))
+        records = self.__matching_records(cls_name, conditions)
+        if order is None:
+            yield from objs
+            if limit is not None:
+                limit -= len(objs)
+            yield from take((self.get(cls_name, id) for id, rec in records),
+                            limit)
+            return
+        rows = [(getattr(obj, order, MISSING), obj, None) for obj in objs]
+        defaults = getattr(model, "_defaults", vars(model))
+        rows += [(self.__record_value(rec, order, defaults), None, id)
+                 for id, rec in records]
+        for value, obj, id in ordered(rows, itemgetter(0), reverse, limit):
+            yield obj if id is None else self.get(cls_name, id)
+
+    @staticmethod
+    def __walk(index, conditions, reverse, limit):
+        """Returns the list of the objects of the RangeIndex index
+        matching conditions, in its order, up to limit objects if it's
+        not None.
+
+        Only the range the conditions bound is walked, then the objects
+        the index keeps unordered. Objects of the range are not checked
+        against the conditions setting its bounds.
+        """
+        low, high = index.bounds(conditions)
+        rest = []
+        for cond in conditions:
+            bounds = index.bounds([cond])
+            if bounds == (None, None) or bounds[0] not in (None, low) or \
+                    bounds[1] not in (None, high):
+                rest.append(cond)
+        objs = index.irange(low, high, reverse)
+        if len(rest) != 0:
+            objs = (obj for obj in objs if matches(obj, rest))
+        unordered = (obj for obj in index.unordered().values()
+                     if matches(obj, conditions))
+        return list(take(chain(objs, unordered), limit))
+
+    @staticmethod
+    def __narrowest(indexes, conditions):
+        """Returns the RangeIndex of indexes whose range bounded by
+        conditions holds the fewest objects, or None if conditions bound
+        none of them."""
+        narrowest = None
+        for index in indexes:
+            low, high = index.bounds(conditions)
+            if low is not None or high is not None:
+                count = index.count(low, high)
+                if narrowest is None or count < narrowest[0]:
+                    narrowest = (count, index)
+        return None if narrowest is None else narrowest[1]
+
+    def __candidates(self, cls_name, conditions):
+        """Returns the {key: object} dict of the built objects of the
+        class named cls_name, or the smallest ValueIndex lookup of the
+        == conditions, a superset of the objects matching them."""
+        candidates = self.__class_index().get(cls_name, {})
+        indexed = getattr(classes.get(cls_name), "_indexed", ())
+        for attr, op, value in conditions:
+            if op == "==" and attr in indexed:
+                found = self.__index("value", cls_name, attr).lookup(value)
+                if len(found) < len(candidates):
+                    candidates = found
+        return candidates
+
+    def __matching_records(self, cls_name, conditions):
+        """Yields the (id, record) pairs of the pending records of the
+        class named cls_name matching conditions, without building
+        objects."""
+        recs = FileStorage.__pending.get(cls_name, {})
+        if len(recs) == 0:
+            return
+        model = classes[cls_name]
+        defaults = getattr(model, "_defaults", vars(model))
+        prefix = len(cls_name) + 1
+        for key in list(recs):
+            rec = recs.get(key)
+            if rec is None:
+                continue
+            for attr, op, value in conditions:
+                try:
+                    if not OPERATORS[op](
+                            self.__record_value(rec, attr, defaults), value):
+                        break
+                except TypeError:
+                    break
+            else:
+                yield key[prefix:], rec
+
+    @staticmethod
+    def __record_value(rec, attr, defaults):
+        """Returns the value of attr in the object of the record rec,
+        defaulting to its class default in defaults."""
+        if attr not in rec:
+            return defaults.get(attr, MISSING)
+        value = rec[attr]
+        if attr in ("created_at", "updated_at"):
+            try:
+                return parse_datetime(value)
+            except (ValueError, TypeError):
+                pass
+        return value
+
+    def columns(self, cls):
+        """Returns the ColumnStore of the _columnar attributes of class
+        cls (a class or a class name), or None if it declares none."""
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__hydrate(cls)
+        return self.__index("column", cls)
+
+    def within(self, cls, south, west, north, east):
+        """Returns a dictionary of the objects of class cls (a class or
+        a class name) positioned inside the box, or an empty one if cls
+        has no _located attributes.
 
-    def all(self):
-        """Returns the dictionary __objects."""
-        return FileStorage.__objects
+        A box whose west edge is east of its east edge crosses the
+        180th meridian.
+        """
+        grid = self.__grid(cls)
+        if grid is None:
+            return {}
+        return grid.within(south, west, north, east)
+
+    def nearby(self, cls, latitude, longitude, km, limit=None):
+        """Returns the list of the objects of class cls (a class or a
+        class name) within km kilometres of the point, nearest first, up
+        to limit objects if it's not None.
+
+        Returns an empty list if cls has no _located attributes.
+        """
+        grid = self.__grid(cls)
+        if grid is None:
+            return []
+        found = grid.nearby(latitude, longitude, km)
+        return [obj for dist, key, obj in take(found, limit)]
+
+    def __grid(self, cls):
+        """Returns the GridIndex of class cls (a class or a class name),
+        or None if it has no _located attributes."""
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__hydrate(cls)
+        return self.__index("location", cls)
+
+    def search(self, cls, text):
+        """Returns a dictionary of the objects of class cls (a class or
+        a class name) whose _searchable attributes hold every word of
+        text, or an empty one if cls has no _searchable attributes.
+
+        Words are compared case-insensitively, as tokenize() splits
+        them.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__hydrate(cls)
+        index = self.__index("text", cls)
+        if index is None:
+            return {}
+        return index.search(text)
+
+    def having(self, cls, attr, all_of=(), any_of=()):
+        """Returns a dictionary of the objects of class cls (a class or
+        a class name) whose list attr holds every value of all_of and,
+        if any_of is not empty, one of its values.
+
+        Returns an empty dictionary if attr is not one of the _members
+        attributes of cls. Lists changed in place rather than replaced
+        are not reindexed.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        if attr not in getattr(classes.get(cls), "_members", ()):
+            return {}
+        self.__hydrate(cls)
+        return self.__index("member", cls, attr).having(all_of, any_of)
 
     def new(self, obj):
         """Sets in __objects obj with key <obj_class_name>.id"""
         obj_c_nm = obj.__class__.__name__
-        FileStorage.__objects["{}.{}".format(obj_c_nm, obj.id)] = obj
+        key = f"{obj_c_nm}.{obj.id}"
+        undo = FileStorage.__undo
+        if undo is not None and key not in undo:
+            old = self.get(obj_c_nm, obj.id)
+            undo[key] = (old, None if old is None else old.__dict__.copy())
+        FileStorage.__pending.get(obj_c_nm, {}).pop(key, None)
+        self.__add(key, obj)
+        FileStorage.__changed[key] = None
+
+    def __build(self, key, rec):
+        """Builds the object of the record rec and sets it under key,
+        keeping the serialized form of rec cached."""
+        obj = classes[rec["__class__"]].from_dict(self.__intern(rec))
+        self.__add(key, obj)
+        held = _containers(rec)
+        entry = FileStorage.__cache.get(key)
+        if entry is not None and entry[0] is rec:
+            if len(held) == 0:
+                FileStorage.__cache[key] = (obj, entry[1])
+            else:
+                del FileStorage.__cache[key]
+        if FileStorage.__journal and len(held) != 0:
+            FileStorage.__containers[key] = (obj, json.dumps(held))
+        return obj
+
+    @staticmethod
+    def __intern(rec):
+        """Interns in place the class name of the record rec and the
+        values of the foreign keys its class declares (attributes ending
+        in _id or _ids), and returns rec."""
+        cls_name = rec["__class__"] = intern(rec["__class__"])
+        names = FileStorage.__references.get(cls_name)
+        if names is None:
+            names = tuple(name for name in dir(classes[cls_name])
+                          if not name.startswith("_") and
+                          name.endswith(("_id", "_ids")))
+            FileStorage.__references[cls_name] = names
+        for name in names:
+            value = rec.get(name)
+            if type(value) is str:
+                rec[name] = intern(value)
+            elif type(value) is list:
+                rec[name] = [intern(v) if type(v) is str else v
+                             for v in value]
+        return rec
+
+    def __hydrate(self, cls_name):
+        """Builds the objects of every pending record of cls_name."""
+        recs = FileStorage.__pending.pop(cls_name, None)
+        if recs is not None:
+            for key, rec in recs.items():
+                self.__build(key, rec)
+
+    def __add(self, key, obj):
+        """Sets obj in __objects and the class index under key."""
+        by_class = self.__class_index()
+        old = FileStorage.__objects.get(key)
+        if old is None:
+            FileStorage.__indexed_len += 1
+        else:
+            del by_class[old.__class__.__name__][key]
+            for index in self.__indexes(old.__class__.__name__):
+                index.discard(key)
+        FileStorage.__objects[key] = obj
+        by_class.setdefault(obj.__class__.__name__, {})[key] = obj
+        for index in self.__indexes(obj.__class__.__name__):
+            index.add(key, obj)
+
+    def __class_index(self):
+        """Returns __by_class, rebuilt first if it is out of date."""
+        objs = FileStorage.__objects
+        stale = FileStorage.__indexed is not objs or \
+            FileStorage.__indexed_len != len(objs)
+        if FileStorage.__exposed and not stale:
+            stale = any(objs.get(key) is not obj
+                        for bucket in FileStorage.__by_class.values()
+                        for key, obj in bucket.items())
+        FileStorage.__exposed = False
+        if stale:
+            by_class = {}
+            for key, obj in objs.items():
+                by_class.setdefault(obj.__class__.__name__, {})[key] = obj
+            FileStorage.__by_class = by_class
+            FileStorage.__registry = {}
+            FileStorage.__covering = {}
+            FileStorage.__indexed = objs
+            FileStorage.__indexed_len = len(objs)
+        return FileStorage.__by_class
+
+    @staticmethod
+    def __indexes(cls_name):
+        """Returns the indexes built on the class named cls_name."""
+        return FileStorage.__registry.get(cls_name, {}).values()
+
+    def __index(self, kind, cls_name, attr=None):
+        """Returns the index of kind (a key of registry.KINDS) of the
+        class named cls_name, over its attribute attr for the kinds
+        covering a single one, building it on first use. Returns None if
+        the class does not declare it."""
+        bucket = self.__class_index().get(cls_name, {})
+        indexes = FileStorage.__registry.get(cls_name, {})
+        index = indexes.get((kind, attr))
+        if index is None:
+            index = registry.build(kind, classes.get(cls_name), attr,
+                                   bucket.items())
+            if index is not None:
+                FileStorage.__registry.setdefault(cls_name, indexes)
+                indexes[(kind, attr)] = index
+                FileStorage.__covering.pop(cls_name, None)
+        return index
+
+    def touch(self, obj, *names):
+        """Marks obj, or only its attributes names, as changed since the
+        last save.
+
+        Called on every attribute write, so classes without indexes skip
+        the reindexing altogether.
+        """
+        cls_name = obj.__class__.__name__
+        key = f"{cls_name}.{obj.__dict__.get('id')}"
+        if FileStorage.__objects.get(key) is not obj:
+            return
+        if cls_name in FileStorage.__registry:
+            self.__reindex(key, obj, names)
+        changed = FileStorage.__changed
+        if len(names) == 0:
+            changed[key] = None
+        elif key not in changed:
+            changed[key] = set(names)
+        elif changed[key] is not None:
+            changed[key].update(names)
+
+    def preserve(self, obj):
+        """Keeps a copy of the attributes of obj before they change, to
+        roll them back if the running transaction fails."""
+        undo = FileStorage.__undo
+        if undo is None:
+            return
+        key = f"{obj.__class__.__name__}.{obj.__dict__.get('id')}"
+        if key not in undo and FileStorage.__objects.get(key) is obj:
+            undo[key] = (obj, obj.__dict__.copy())
+
+    def __reindex(self, key, obj, names=()):
+        """Updates the attribute indexes of obj for the attributes names,
+        or for all of them."""
+        cls_name = obj.__class__.__name__
+        if len(names) == 0:
+            indexes = self.__indexes(cls_name)
+        else:
+            covering = FileStorage.__covering.setdefault(cls_name, {})
+            indexes = set()
+            for name in names:
+                if name not in covering:
+                    covering[name] = [index
+                                      for index in self.__indexes(cls_name)
+                                      if name in index.attrs]
+                indexes.update(covering[name])
+        for index in indexes:
+            index.discard(key)
+            index.add(key, obj)
+
+    @contextmanager
+    def transaction(self):
+        """Returns a context manager grouping changes into one write.
+
+        save() calls in the block are deferred and written once when it
+        exits normally. If it raises, every object added, changed or
+        deleted in it is put back as it was and nothing is written. A
+        transaction opened inside another one joins it.
+        """
+        if FileStorage.__undo is not None:
+            yield self
+            return
+        changed = {k: (set(v) if v is not None else None)
+                   for k, v in FileStorage.__changed.items()}
+        deferred = FileStorage.__deferred
+        since = FileStorage.__deferred_since
+        FileStorage.__undo = {}
+        try:
+            yield self
+        except BaseException:
+            undo = FileStorage.__undo
+            FileStorage.__undo = None
+            FileStorage.__changed = changed
+            self.__rollback(undo)
+            FileStorage.__deferred = deferred
+            FileStorage.__deferred_since = since
+            raise
+        FileStorage.__undo = None
+        if FileStorage.__deferred > deferred:
+            self.__write()
+
+    def __rollback(self, undo):
+        """Puts back the objects recorded in undo, and marks them as
+        changed so the next save writes them whatever the file holds."""
+        changed = FileStorage.__changed
+        for key, (obj, attrs) in undo.items():
+            changed[key] = None
+            if obj is None:
+                self.__remove(key)
+                FileStorage.__cache.pop(key, None)
+                continue
+            obj.__dict__.clear()
+            obj.__dict__.update(attrs)
+            if FileStorage.__objects.get(key) is obj:
+                self.__reindex(key, obj)
+            else:
+                self.__add(key, obj)
+
+    def changes(self, obj):
+        """Returns the set of attribute names of obj changed since the
+        last save, None if all of obj changed, or an empty set if obj
+        is clean."""
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        attrs = FileStorage.__changed.get(key, set())
+        return set(attrs) if attrs is not None else None
+
+    def delete(self, obj=None):
+        """Deletes obj from __objects if it's inside."""
+        if obj is None:
+            return
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        self.preserve(obj)
+        if self.__remove(key) is not None:
+            FileStorage.__changed[key] = None
+            FileStorage.__cache.pop(key, None)
+
+    def __remove(self, key):
+        """Removes key from __objects and the indexes, and returns the
+        object it was set to, or None."""
+        by_class = self.__class_index()
+        old = FileStorage.__objects.pop(key, None)
+        if old is not None:
+            del by_class[old.__class__.__name__][key]
+            for index in self.__indexes(old.__class__.__name__):
+                index.discard(key)
+            FileStorage.__indexed_len -= 1
+        return old
 
     def save(self):
-        """Serializes __objects to the JSON file __file_path."""
+        """Serializes __objects to the JSON file __file_path, or appends
+        the pending changes to __journal_path in journal mode.
+
+        With group commit on, the write is deferred until enough saves
+        were made or the oldest deferred save is old enough. Inside a
+        transaction, it is deferred until the transaction commits.
+        """
+        size = FileStorage.__group_size
+        window = FileStorage.__group_window
+        if FileStorage.__undo is not None:
+            FileStorage.__deferred += 1
+            return
+        if size <= 0 and window <= 0:
+            self.__write()
+            return
+        FileStorage.__deferred += 1
+        if FileStorage.__deferred_since is None:
+            FileStorage.__deferred_since = monotonic()
+        if (size > 0 and FileStorage.__deferred >= size) or \
+                (window > 0 and
+                 monotonic() - FileStorage.__deferred_since >= window):
+            self.flush()
+
+    def flush(self):
+        """Writes the changes of every deferred save() now. Inside a
+        transaction it does nothing, the block being written when it
+        commits."""
+        if FileStorage.__deferred > 0 and FileStorage.__undo is None:
+            self.__write()
+
+    def __write(self):
+        """Writes the snapshot, or appends to the journal. Inside a
+        transaction it does nothing, so a rollback never leaves its
+        changes on disk."""
+        if FileStorage.__undo is not None:
+            return
+        if FileStorage.__journal:
+            self.__append_journal()
+        else:
+            self.wait_compaction()
+            if FileStorage.__binary:
+                self.__write_snapshot(self.__items())
+            else:
+                self.__write_snapshot(self.__fragments())
+            FileStorage.__changed = {}
+            for path in (FileStorage.__journal_path,
+                         FileStorage.__rotated_path):
+                try:
+                    remove(path)
+                except FileNotFoundError:
+                    pass
+        FileStorage.__deferred = 0
+        FileStorage.__deferred_since = None
+
+    @staticmethod
+    def __write_snapshot(members):
+        """Atomically replaces __file_path with the snapshot made of
+        members, leaving __file_path untouched if writing fails.
+
+        members are (key, record) pairs in binary mode, and '"key":
+        {json}' fragments of the JSON object otherwise.
+        """
+        path = FileStorage.__file_path
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            with open(tmp_path, "wb" if FileStorage.__binary else "w") as f:
+                if FileStorage.__binary:
+                    binary_snapshot.write(f, members)
+                else:
+                    json_stream.write_object(f, members)
+                if FileStorage.__fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            replace(tmp_path, path)
+        except BaseException:
+            try:
+                remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        if FileStorage.__fsync and FileStorage.__fsync_dir:
+            fd = os.open(dirname(abspath(path)), os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def __fragments(self):
+        """Yields the '"key": {json}' text of every object and pending
+        record, serializing only those changed since they were cached.
+
+        The cache is updated in place and pruned of keys that are gone,
+        so a save allocates memory for changed objects only. Objects
+        holding lists or dicts are serialized on every save.
+        """
+        changed = FileStorage.__changed
+        cache = FileStorage.__cache
+        for key, obj in FileStorage.__objects.items():
+            entry = cache.get(key)
+            if entry is None or entry[0] is not obj or key in changed:
+                attrs = obj.to_dict()
+                entry = (obj, json_stream.fragment(key, attrs))
+                if len(_containers(attrs)) == 0:
+                    cache[key] = entry
+                else:
+                    cache.pop(key, None)
+            yield entry[1]
+        total = len(FileStorage.__objects)
+        for recs in FileStorage.__pending.values():
+            total += len(recs)
+            for key, rec in recs.items():
+                entry = cache.get(key)
+                if entry is None or entry[0] is not rec:
+                    entry = (rec, json_stream.fragment(key, rec))
+                    cache[key] = entry
+                yield entry[1]
+        if len(cache) > total:
+            for key in [k for k in cache if k not in FileStorage.__objects]:
+                if all(key not in recs
+                       for recs in FileStorage.__pending.values()):
+                    del cache[key]
+
+    def __items(self):
+        """Yields the (key, record) pair of every object and pending
+        record."""
+        for key, obj in FileStorage.__objects.items():
+            yield key, obj.to_dict()
+        for recs in FileStorage.__pending.values():
+            yield from recs.items()
+
+    def __append_journal(self):
+        """Appends the changed and deleted keys to the journal as one
+        line, starting a compaction once the journal is too large or
+        old.
+
+        Objects holding lists or dicts whose JSON differs from the last
+        one journaled are written whole, even without attribute writes.
+        """
+        changed = FileStorage.__changed
         ob_dct = FileStorage.__objects
-        obj_dict = {obj: ob_dct[obj].to_dict() for obj in ob_dct.keys()}
-        with open(FileStorage.__file_path, "w") as f:
-            json.dump(obj_dict, f)
+        containers = FileStorage.__containers
+        for key, (obj, text) in list(containers.items()):
+            if ob_dct.get(key) is not obj:
+                del containers[key]
+            elif changed.get(key, ()) is not None and \
+                    json.dumps(_containers(obj.__dict__)) != text:
+                changed[key] = None
+        if len(changed) == 0:
+            return
+        FileStorage.__changed = {}
+        cache = FileStorage.__cache
+        fragments = []
+        for key, attrs in changed.items():
+            obj = ob_dct.get(key)
+            patch = self.__patch(obj, attrs)
+            cache.pop(key, None)
+            if obj is None:
+                fragment = json_stream.fragment(key, None)
+            elif patch is not None:
+                fragment = json_stream.fragment(key, patch)
+            else:
+                fragment = json_stream.fragment(key, obj.to_dict())
+            fragments.append(fragment)
+            held = {} if obj is None else _containers(obj.__dict__)
+            if len(held) == 0:
+                containers.pop(key, None)
+            else:
+                containers[key] = (obj, json.dumps(held))
+        line = "{" + ", ".join(fragments) + "}\n"
+        with FileStorage.__lock:
+            with open(FileStorage.__journal_path, "a") as f:
+                f.write(line)
+                size = f.tell()
+                if FileStorage.__fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            if FileStorage.__journal_since is None:
+                FileStorage.__journal_since = monotonic()
+            age = monotonic() - FileStorage.__journal_since
+        if size >= FileStorage.__compact_size or \
+                age >= FileStorage.__compact_age:
+            self.start_compaction()
 
-    def reload(self):
-        """This deserialize the JSON file __file_path to __objects, if
-        it exists."""
+    @staticmethod
+    def __patch(obj, attrs):
+        """Returns the serialized attributes attrs of obj, or None when
+        obj must be written as a full record."""
+        if obj is None or attrs is None or "__class__" in attrs:
+            return None
+        patch = {}
+        for name in attrs:
+            if name not in obj.__dict__:
+                return None
+            value = obj.__dict__[name]
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            patch[name] = value
+        return patch
+
+    def start_compaction(self):
+        """Folds the journal into the snapshot in a background thread,
+        unless a compaction is already running."""
+        with FileStorage.__lock:
+            running = FileStorage.__compactor
+            if running is not None and running.is_alive():
+                return running
+            FileStorage.__compactor = threading.Thread(
+                target=self.compact, name="FileStorage-compactor")
+            FileStorage.__compactor.start()
+            return FileStorage.__compactor
+
+    def wait_compaction(self):
+        """Blocks until the running background compaction, if any,
+        has finished."""
+        running = FileStorage.__compactor
+        if running is not None:
+            running.join()
+
+    def compact(self):
+        """Folds the journal into a new __file_path snapshot.
+
+        Only the journal rename holds the writers' lock. A rotated
+        journal left behind by an interrupted compaction is folded
+        first, and the current journal is left for the next run.
+        """
+        with FileStorage.__lock:
+            try:
+                getsize(FileStorage.__rotated_path)
+            except FileNotFoundError:
+                try:
+                    rename(FileStorage.__journal_path,
+                           FileStorage.__rotated_path)
+                except FileNotFoundError:
+                    return
+                FileStorage.__journal_since = None
+        records = self.__records(FileStorage.__rotated_path)
+        if not FileStorage.__binary:
+            records = (json_stream.fragment(k, v) for k, v in records)
+        self.__write_snapshot(records)
+        remove(FileStorage.__rotated_path)
+
+    def __records(self, *journals):
+        """Yields the (key, record) pairs of the __file_path snapshot
+        with the journals applied in order.
+
+        The journals are folded into one change per key first, then the
+        snapshot is parsed one record at a time, so memory is bounded
+        by the journals rather than by the store.
+        """
+        delta = {}
+        for path in journals:
+            self.__replay(path, delta)
         try:
+            for key, rec in self.__read_snapshot():
+                if key in delta:
+                    change = delta.pop(key)
+                    if change is None:
+                        continue
+                    if "__class__" in change:
+                        rec = change
+                    else:
+                        rec.update(change)
+                yield key, rec
+        except FileNotFoundError:
+            pass
+        for key, rec in delta.items():
+            if rec is not None and "__class__" in rec:
+                yield key, rec
+
+    @staticmethod
+    def __read_snapshot():
+        """Yields the (key, record) pairs of the __file_path snapshot."""
+        if FileStorage.__binary:
+            with binary_snapshot.Snapshot(FileStorage.__file_path) as snap:
+                yield from snap.items()
+        else:
             with open(FileStorage.__file_path) as f:
-                obj_dict = json.load(f)
-                for o in obj_dict.values():
-                    cls_name = o["__class__"]
-                    del o["__class__"]
-                    self.new(eval(cls_name)(**o))
+                yield from json_stream.iter_object(f)
+
+    @staticmethod
+    def __replay(path, delta):
+        """Folds the journal at path into delta, which maps keys to a
+        full record, a partial record or None for a deletion.
+
+        Records without a __class__ are partial and update the previous
+        record of their key. A torn line left by an interrupted append is
+        cut off the file, with every record of it, so that later appends
+        start on a fresh line.
+        """
+        try:
+            with open(path, "rb+") as f:
+                good = 0
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("torn journal line")
+                        entry = json.loads(line)
+                    except ValueError:
+                        f.truncate(good)
+                        break
+                    good += len(line)
+                    for key, rec in entry.items():
+                        if rec is None or "__class__" in rec or \
+                                key not in delta:
+                            delta[key] = rec
+                        elif delta[key] is not None:
+                            delta[key].update(rec)
         except FileNotFoundError:
+            pass
+
+    def reload(self):
+        """This deserialize the JSON file __file_path to __objects, if
+        it exists, then replays the journal __journal_path over it.
+
+        Objects are built as their records are parsed, so the file is
+        never held in memory as a whole.
+        """
+        self.wait_compaction()
+        if FileStorage.__lazy and FileStorage.__binary:
+            self.__map_snapshot()
+            return
+        records = self.__records(FileStorage.__rotated_path,
+                                 FileStorage.__journal_path)
+        if not FileStorage.__lazy:
+            for key, o in records:
+                self.__build(key, o)
             return
+        pending = FileStorage.__pending
+        for key, o in records:
+            self.__remove(key)
+            o = {intern(k): v for k, v in self.__intern(o).items()}
+            pending.setdefault(o["__class__"], {})[key] = o
+
+    def __map_snapshot(self):
+        """Sets the sections of the mapped binary snapshot as the
+        pending records, with the journals applied over them.
+
+        Only the journals are parsed; snapshot records are decoded when
+        they are accessed.
+        """
+        delta = {}
+        for path in (FileStorage.__rotated_path, FileStorage.__journal_path):
+            self.__replay(path, delta)
+        try:
+            sections = binary_snapshot.Snapshot(
+                FileStorage.__file_path).sections()
+        except FileNotFoundError:
+            sections = {}
+        pending = FileStorage.__pending
+        for cls_name, section in sections.items():
+            for key in [k for k in self.__class_index().get(cls_name, {})
+                        if k in section]:
+                self.__remove(key)
+            for key, rec in pending.get(cls_name, {}).items():
+                if key not in section:
+                    section[key] = rec
+            pending[cls_name] = section
+        for key, change in delta.items():
+            recs = pending.setdefault(key.split(".", 1)[0], {})
+            if change is None:
+                recs.pop(key, None)
+            elif "__class__" in change:
+                self.__remove(key)
+                recs[key] = change
+            elif key in recs:
+                rec = recs[key]
+                rec.update(change)
+                recs[key] = rec
+
+
+def _containers(attrs):
+    """Returns the {name: value} dict of the list and dict values of the
+    attributes dict attrs, which can change without an attribute
+    write."""
+    return {name: value for name, value in attrs.items()
+            if isinstance(value, (list, dict))}
@@ -0,0 +1,180 @@
+#!/usr/bin/python3
+"""The script defines the spatial index FileStorage keeps of the
+positions of a model class, and the distance helpers shared by the
+storage engines.
+
+Positions are (latitude, longitude) pairs in degrees, and distances
+are great-circle distances in kilometres on a spherical Earth.
+"""
+from math import asin, cos, degrees, floor, radians, sin, sqrt
+from numbers import Real
+
+EARTH_RADIUS = 6371.0088
+"""float: the mean radius of the Earth, in kilometres."""
+
+
+class GridIndex:
+    """Represents a spatial index on the position of the objects of a
+    model class, as a grid of cells of a fixed size in degrees.
+
+    Objects whose position is not a pair of numbers within [-90, 90] and
+    [-180, 180] are left out of the index, and of its results.
+
+    Attributes:
+        attrs (tuple): the (latitude, longitude) attribute names.
+        cell (float): the size of the cells, in degrees.
+    """
+
+    def __init__(self, attrs, cell=0.1):
+        """Initialize a new, empty GridIndex.
+
+        Args:
+            attrs (tuple): the (latitude, longitude) attribute names.
+            cell (float): the size of the cells, in degrees. The default
+                is about 11 km of latitude.
+        """
+        self.attrs = tuple(attrs)
+        self.cell = cell
+        self.__cells = {}
+        self.__cell_of = {}
+
+    def __len__(self):
+        return len(self.__cell_of)
+
+    def add(self, key, obj):
+        """Indexes obj under key by its current position."""
+        position = located(obj, self.attrs)
+        if position is None:
+            return
+        cell = (floor(position[0] / self.cell), floor(position[1] / self.cell))
+        self.__cells.setdefault(cell, {})[key] = obj
+        self.__cell_of[key] = cell
+
+    def discard(self, key):
+        """Removes key from the index if it's inside."""
+        cell = self.__cell_of.pop(key, None)
+        if cell is not None:
+            objs = self.__cells[cell]
+            del objs[key]
+            if len(objs) == 0:
+                del self.__cells[cell]
+
+    def within(self, south, west, north, east):
+        """Returns a {key: object} dict of the objects inside the box.
+
+        A box whose west edge is east of its east edge crosses the
+        180th meridian.
+        """
+        found = {}
+        for objs in self.__box_cells(south, west, north, east):
+            for key, obj in objs.items():
+                if in_box(located(obj, self.attrs), south, west, north,
+                          east):
+                    found[key] = obj
+        return found
+
+    def nearby(self, latitude, longitude, km):
+        """Returns the list of (distance, key, object) tuples of the
+        objects within km kilometres of the point, nearest first."""
+        box = bounding_box(latitude, longitude, km)
+        return closest(latitude, longitude, km,
+                       (item for objs in self.__box_cells(*box)
+                        for item in objs.items()), self.attrs)
+
+    def __box_cells(self, south, west, north, east):
+        """Yields the {key: object} dicts of the cells overlapping the
+        box, walking the occupied cells instead when the box covers
+        more cells than are occupied."""
+        rows = range(floor(south / self.cell), floor(north / self.cell) + 1)
+        if west <= east:
+            cols = [range(floor(west / self.cell),
+                          floor(east / self.cell) + 1)]
+        else:
+            cols = [range(floor(west / self.cell),
+                          floor(180 / self.cell) + 1),
+                    range(floor(-180 / self.cell),
+                          floor(east / self.cell) + 1)]
+        if len(rows) * sum(map(len, cols)) > len(self.__cells):
+            for (row, col), objs in list(self.__cells.items()):
+                if row in rows and any(col in span for span in cols):
+                    yield objs
+            return
+        cells = self.__cells
+        for row in rows:
+            for span in cols:
+                for col in span:
+                    objs = cells.get((row, col))
+                    if objs is not None:
+                        yield objs
+
+
+def distance(lat1, lng1, lat2, lng2):
+    """Returns the great-circle distance in kilometres between two
+    points, by the haversine formula."""
+    lat1, lng1, lat2, lng2 = map(radians, (lat1, lng1, lat2, lng2))
+    h = sin((lat2 - lat1) / 2) ** 2 + \
+        cos(lat1) * cos(lat2) * sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS * asin(min(1.0, sqrt(h)))
+
+
+def bounding_box(latitude, longitude, km):
+    """Returns the (south, west, north, east) box holding every point
+    within km kilometres of the point.
+
+    The box spans every longitude when the circle reaches a pole, and
+    has its west edge east of its east edge when it crosses the 180th
+    meridian.
+    """
+    angle = km / EARTH_RADIUS
+    south = latitude - degrees(angle)
+    north = latitude + degrees(angle)
+    if south <= -90 or north >= 90:
+        return max(south, -90.0), -180.0, min(north, 90.0), 180.0
+    spread = degrees(asin(min(1.0, sin(angle) / cos(radians(latitude)))))
+    west = longitude - spread
+    east = longitude + spread
+    if west < -180:
+        west += 360
+    if east > 180:
+        east -= 360
+    return south, west, north, east
+
+
+def located(obj, attrs):
+    """Returns the (latitude, longitude) position of obj read from its
+    attributes attrs, or None if it is not a pair of numbers within
+    [-90, 90] and [-180, 180]."""
+    lat = getattr(obj, attrs[0], None)
+    lng = getattr(obj, attrs[1], None)
+    if isinstance(lat, Real) and isinstance(lng, Real) and \
+            -90 <= lat <= 90 and -180 <= lng <= 180:
+        return (lat, lng)
+    return None
+
+
+def closest(latitude, longitude, km, items, attrs):
+    """Returns the list of (distance, key, object) tuples of the (key,
+    object) pairs items positioned by their attributes attrs within km
+    kilometres of the point, nearest first."""
+    found = []
+    for key, obj in items:
+        position = located(obj, attrs)
+        if position is not None:
+            dist = distance(latitude, longitude, *position)
+            if dist <= km:
+                found.append((dist, key, obj))
+    found.sort(key=lambda item: item[:2])
+    return found
+
+
+def in_box(position, south, west, north, east):
+    """Returns whether the (latitude, longitude) position is inside the
+    box, or False if position is None."""
+    if position is None:
+        return False
+    lat, lng = position
+    if not south <= lat <= north:
+        return False
+    if west <= east:
+        return west <= lng <= east
+    return lng >= west or lng <= east
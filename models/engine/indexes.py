@@ -0,0 +1,217 @@
+#!/usr/bin/python3
+"""The script defines the secondary indexes kept by FileStorage."""
+from bisect import bisect_left, bisect_right, insort
+
+
+class ValueIndex:
+    """Represents an equality index on one attribute of a model class.
+
+    Objects whose value is unhashable are kept aside and returned as
+    candidates of every lookup, so callers must still compare values.
+
+    Attributes:
+        attr (str): the indexed attribute name.
+        attrs (tuple): the attribute names the index reads, (attr,).
+    """
+
+    def __init__(self, attr):
+        """Initialize a new, empty ValueIndex.
+
+        Args:
+            attr (str): the attribute name to index.
+        """
+        self.attr = attr
+        self.attrs = (attr,)
+        self.__keys = {}
+        self.__value_of = {}
+        self.__unhashable = {}
+
+    def add(self, key, obj):
+        """Indexes obj under key by its current attribute value."""
+        value = getattr(obj, self.attr, _MISSING)
+        try:
+            self.__keys.setdefault(value, {})[key] = obj
+        except TypeError:
+            self.__unhashable[key] = obj
+            return
+        self.__value_of[key] = value
+
+    def discard(self, key):
+        """Removes key from the index if it's inside."""
+        if key in self.__value_of:
+            value = self.__value_of.pop(key)
+            bucket = self.__keys[value]
+            del bucket[key]
+            if len(bucket) == 0:
+                del self.__keys[value]
+        else:
+            self.__unhashable.pop(key, None)
+
+    def lookup(self, value):
+        """Returns a {key: object} dict of the candidates for value."""
+        try:
+            found = self.__keys.get(value, {})
+        except TypeError:
+            found = {}
+        if len(self.__unhashable) != 0:
+            found = dict(found)
+            found.update(self.__unhashable)
+        return found
+
+
+class RangeIndex:
+    """Represents an ordered index on one attribute of a model class, as
+    a list of (value, key) entries kept sorted with bisect.
+
+    Objects whose value is not of the index's types, or cannot be
+    ordered with the others (such as NaN), are kept aside, unordered.
+
+    Attributes:
+        attr (str): the indexed attribute name.
+        attrs (tuple): the attribute names the index reads, (attr,).
+        types (tuple): the types of the values kept in order.
+    """
+
+    def __init__(self, attr, types):
+        """Initialize a new, empty RangeIndex.
+
+        Args:
+            attr (str): the attribute name to index.
+            types (tuple): the types of the values to keep in order.
+        """
+        self.attr = attr
+        self.attrs = (attr,)
+        self.types = types
+        self.__entries = []
+        self.__value_of = {}
+        self.__objs = {}
+        self.__unordered = {}
+
+    def __len__(self):
+        return len(self.__entries) + len(self.__unordered)
+
+    def add(self, key, obj):
+        """Indexes obj under key by its current attribute value."""
+        value = getattr(obj, self.attr, _MISSING)
+        if isinstance(value, self.types) and value == value:
+            try:
+                insort(self.__entries, (value, key))
+            except TypeError:
+                pass
+            else:
+                self.__value_of[key] = value
+                self.__objs[key] = obj
+                return
+        self.__unordered[key] = obj
+
+    def extend(self, items):
+        """Indexes the objects of the (key, object) pairs items, sorting
+        the entries once rather than inserting them one by one."""
+        items = list(items)
+        added = []
+        for key, obj in items:
+            value = getattr(obj, self.attr, _MISSING)
+            if isinstance(value, self.types) and value == value:
+                added.append((value, key))
+            else:
+                self.__unordered[key] = obj
+        try:
+            entries = sorted(self.__entries + added)
+        except TypeError:
+            for key, obj in items:
+                self.add(key, obj)
+            return
+        self.__entries = entries
+        for key, obj in items:
+            if key not in self.__unordered:
+                self.__value_of[key] = getattr(obj, self.attr)
+                self.__objs[key] = obj
+
+    def discard(self, key):
+        """Removes key from the index if it's inside."""
+        if key in self.__value_of:
+            entries = self.__entries
+            del entries[bisect_left(entries, (self.__value_of.pop(key), key))]
+            del self.__objs[key]
+        else:
+            self.__unordered.pop(key, None)
+
+    def bounds(self, conditions):
+        """Returns the (low, high) bounds the first conditions on attr
+        with values of the index's types set, each a (value, inclusive)
+        pair or None when unbounded."""
+        low = high = None
+        for attr, op, value in conditions:
+            if attr != self.attr or not isinstance(value, self.types) or \
+                    value != value:
+                continue
+            if low is None and op in (">", ">=", "=="):
+                low = (value, op != ">")
+            if high is None and op in ("<", "<=", "=="):
+                high = (value, op != "<")
+        return low, high
+
+    def count(self, low=None, high=None):
+        """Returns the number of ordered objects between the bounds low
+        and high."""
+        start, stop = self.__slice(low, high)
+        return max(stop - start, 0)
+
+    def irange(self, low=None, high=None, reverse=False):
+        """Yields the ordered objects between the bounds low and high,
+        by value then key, descending if reverse.
+
+        Args:
+            low (tuple): the (value, inclusive) lower bound, or None.
+            high (tuple): the (value, inclusive) upper bound, or None.
+            reverse (bool): whether to yield by descending value.
+
+        The index must not change while the objects are yielded.
+        """
+        start, stop = self.__slice(low, high)
+        entries = self.__entries
+        objs = self.__objs
+        rows = range(stop - 1, start - 1, -1) if reverse else \
+            range(start, stop)
+        for row in rows:
+            yield objs[entries[row][1]]
+
+    def unordered(self):
+        """Returns a {key: object} dict of the objects kept aside."""
+        return dict(self.__unordered)
+
+    def __slice(self, low, high):
+        """Returns the (start, stop) rows of the entries between the
+        bounds low and high, or (0, 0) if they cannot be compared with
+        the values."""
+        entries = self.__entries
+        start, stop = 0, len(entries)
+        try:
+            if low is not None:
+                if low[1]:
+                    start = bisect_left(entries, (low[0],))
+                else:
+                    start = bisect_right(entries, (low[0], _TOP))
+            if high is not None:
+                if high[1]:
+                    stop = bisect_right(entries, (high[0], _TOP))
+                else:
+                    stop = bisect_left(entries, (high[0],))
+        except TypeError:
+            return 0, 0
+        return start, stop
+
+
+class _Top:
+    """Represents a value greater than any key, to bisect past every
+    entry of a value."""
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return True
+
+
+_MISSING = object()
+_TOP = _Top()
@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""The script defines helpers to stream the top-level JSON object of
+the FileStorage file one record at a time."""
+import json
+import re
+
+_decoder = json.JSONDecoder()
+_space = re.compile(r"[ \t\n\r]*")
+
+
+def fragment(key, value):
+    """Returns the '"key": value' JSON text of one object member."""
+    return json.dumps(key) + ": " + json.dumps(value)
+
+
+def write_object(f, fragments):
+    """Writes a JSON object to the text file f, one member at a time.
+
+    The output matches json.dump() with its default separators.
+
+    Args:
+        f (file): the text file to write to.
+        fragments (iterable): the '"key": value' texts of the members.
+    """
+    f.write("{")
+    sep = ""
+    for text in fragments:
+        f.write(sep)
+        f.write(text)
+        sep = ", "
+    f.write("}")
+
+
+def iter_object(f, chunk_size=1 << 16):
+    """Yields the (key, value) members of the JSON object in the text
+    file f as they are parsed, without loading the whole object.
+
+    Only the member being parsed and one chunk of unread text are held
+    in memory at a time.
+
+    Args:
+        f (file): the text file to read from.
+        chunk_size (int): the number of characters read at a time.
+
+    Raises:
+        ValueError: if f does not hold a single JSON object.
+    """
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        """Appends a chunk to the unparsed part of buf, returning False
+        at the end of f."""
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        buf = buf[pos:] + chunk
+        pos = 0
+        eof = chunk == ""
+        return not eof
+
+    def skip_space():
+        """Moves pos past white space, returning the next character."""
+        nonlocal pos
+        while True:
+            pos = _space.match(buf, pos).end()
+            if pos < len(buf) or not fill():
+                return buf[pos:pos + 1]
+
+    def decode():
+        """Decodes the JSON value at pos, reading more of f while the
+        value may run past the end of buf."""
+        nonlocal pos
+        while True:
+            try:
+                value, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof or not fill():
+                    raise
+                continue
+            if end < len(buf) or eof or not fill():
+                pos = end
+                return value
+
+    if skip_space() != "{":
+        raise ValueError("Expecting a JSON object")
+    pos += 1
+    if skip_space() == "}":
+        return
+    while True:
+        key = decode()
+        if not isinstance(key, str) or skip_space() != ":":
+            raise ValueError("Expecting a string key and ':'")
+        pos += 1
+        skip_space()
+        yield key, decode()
+        sep = skip_space()
+        pos += 1
+        if sep == "}":
+            return
+        if sep != ",":
+            raise ValueError("Expecting ',' or '}'")
+        skip_space()
@@ -0,0 +1,170 @@
+#!/usr/bin/python3
+"""The script defines the Query class returned by storage.query()."""
+from collections import Counter
+from heapq import nlargest, nsmallest
+from itertools import chain, islice
+from numbers import Real
+from operator import itemgetter
+from models.engine.columns import OPERATORS
+
+
+class Query:
+    """Represents a query on the objects of a model class, such as
+
+        storage.query(Place).where("price_by_night", "<", 100)
+        .where(max_guest=4).order_by("price_by_night").limit(10)
+
+    where(), order_by() and limit() return the query, so calls chain.
+    The query is run by its storage engine every time it is iterated,
+    and yields the matching objects; without order_by() they come in
+    no particular order.
+    """
+
+    def __init__(self, cls_name, run):
+        """Initialize a new Query matching every object of cls_name.
+
+        Args:
+            cls_name (str): the class name of the objects to query.
+            run (callable): the function of the storage engine running
+                the query. It takes the class name, the tuple of
+                conditions, the order attribute or None, whether the
+                order is reversed and the limit or None, and returns an
+                iterator over the objects.
+        """
+        self.cls_name = cls_name
+        self.__run = run
+        self.__conditions = []
+        self.__order = None
+        self.__reverse = False
+        self.__limit = None
+
+    def where(self, *condition, **equals):
+        """Adds the condition (attribute, operator, value), and an
+        (attribute, "==", value) condition per keyword, and returns the
+        query.
+
+        Operators are "<", "<=", "==", "!=", ">=" and ">". An object
+        whose value cannot be compared with the condition's does not
+        match it.
+
+        Raises:
+            TypeError: if condition is not attribute, operator, value.
+            ValueError: if the operator is unknown.
+        """
+        if len(condition) != 0:
+            if len(condition) != 3:
+                raise TypeError("where() takes an attribute, an operator "
+                                "and a value")
+            if condition[1] not in OPERATORS:
+                raise ValueError("Unknown operator: {}".format(
+                    condition[1]))
+            self.__conditions.append(condition)
+        for attr, value in equals.items():
+            self.__conditions.append((attr, "==", value))
+        return self
+
+    def order_by(self, attr, reverse=False):
+        """Orders the objects by their value of attr, descending if
+        reverse, and returns the query. The order of objects of equal
+        value is left to the storage engine."""
+        self.__order = attr
+        self.__reverse = reverse
+        return self
+
+    def limit(self, count):
+        """Stops the query after count objects and returns it."""
+        if count < 0:
+            raise ValueError("limit must be positive")
+        self.__limit = count
+        return self
+
+    def __iter__(self):
+        return self.__run(self.cls_name, tuple(self.__conditions),
+                          self.__order, self.__reverse, self.__limit)
+
+    def all(self):
+        """Returns the list of the objects of the query."""
+        return list(self)
+
+    def first(self):
+        """Returns the first object of the query, or None."""
+        limit = 1 if self.__limit is None else min(self.__limit, 1)
+        return next(self.__run(self.cls_name, tuple(self.__conditions),
+                               self.__order, self.__reverse, limit), None)
+
+    def count(self):
+        """Returns the number of objects of the query."""
+        return sum(1 for obj in self)
+
+
+def matches(obj, conditions):
+    """Returns whether the attribute values of obj match every
+    condition."""
+    for attr, op, value in conditions:
+        try:
+            if not OPERATORS[op](getattr(obj, attr, MISSING), value):
+                return False
+        except TypeError:
+            return False
+    return True
+
+
+def ordered(items, value_of, reverse=False, limit=None):
+    """Returns the list of items ordered by value_of(item), stopping at
+    limit items if it's not None. Items of equal value keep their order.
+
+    As in a RangeIndex, values that cannot be ordered with the others,
+    such as NaN, or strings among a majority of numbers, come after the
+    ordered ones in their own order, and items whose value is MISSING
+    come last.
+    """
+    rows = []
+    odd = []
+    missing = []
+    for item in items:
+        value = value_of(item)
+        if value is MISSING:
+            missing.append((value, item))
+        elif value != value:
+            odd.append((value, item))
+        else:
+            rows.append((value, item))
+    try:
+        rows = _sorted(rows, reverse, limit)
+    except TypeError:
+        kind = Counter(_kind(row[0]) for row in rows).most_common(1)[0][0]
+        unsorted = rows
+        try:
+            rows = _sorted([row for row in unsorted if _kind(row[0]) is kind],
+                           reverse, limit)
+        except TypeError:
+            rows, odd = [], unsorted + odd
+        else:
+            odd = [row for row in unsorted
+                   if _kind(row[0]) is not kind] + odd
+    return [item for value, item in take(chain(rows, odd, missing), limit)]
+
+
+def _sorted(rows, reverse, limit):
+    """Returns the (value, item) rows sorted by value, only the first
+    limit ones if it's not None."""
+    if limit is None:
+        return sorted(rows, key=itemgetter(0), reverse=reverse)
+    return (nlargest if reverse else nsmallest)(limit, rows,
+                                                key=itemgetter(0))
+
+
+def _kind(value):
+    """Returns the type values are grouped by when they cannot all be
+    ordered together: Real for numbers, their type otherwise."""
+    return Real if isinstance(value, Real) else type(value)
+
+
+def take(objs, limit):
+    """Returns an iterator over the first limit objs, or all of them if
+    limit is None."""
+    return iter(objs) if limit is None else islice(objs, limit)
+
+
+MISSING = object()
+"""object: the value of the attributes an object lacks."""
@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+"""The script defines the kinds of index FileStorage keeps of the
+attributes a model class declares, and builds them."""
+from datetime import datetime
+from models.engine.bitmaps import MembershipIndex
+from models.engine.columns import ColumnStore
+from models.engine.geo import GridIndex
+from models.engine.indexes import RangeIndex, ValueIndex
+from models.engine.text import TextIndex
+
+KINDS = {
+    "value": "_indexed",
+    "range": "_ranged",
+    "member": "_members",
+    "column": "_columnar",
+    "location": "_located",
+    "text": "_searchable",
+}
+"""dict: the kinds of index mapped to the model attribute naming the
+attributes they cover: a ValueIndex, RangeIndex or MembershipIndex per
+attribute, and a ColumnStore, GridIndex or TextIndex of them all."""
+
+PER_ATTRIBUTE = ("value", "range", "member")
+"""tuple: the kinds of index covering a single attribute."""
+
+
+def build(kind, model, attr, items):
+    """Returns a new index of kind holding the (key, object) pairs items,
+    or None if model does not declare it.
+
+    Args:
+        kind (str): one of the keys of KINDS.
+        model (type): the model class, or None.
+        attr (str): the attribute of a PER_ATTRIBUTE kind, or None.
+        items (iterable): the (key, object) pairs to index.
+    """
+    declared = tuple(getattr(model, KINDS[kind], ()))
+    if kind in PER_ATTRIBUTE and attr not in declared or \
+            kind == "location" and len(declared) != 2 or \
+            len(declared) == 0:
+        return None
+    defaults = getattr(model, "_defaults", vars(model))
+    if kind == "value":
+        index = ValueIndex(attr)
+    elif kind == "member":
+        index = MembershipIndex(attr)
+    elif kind == "range":
+        if attr in ("created_at", "updated_at"):
+            types = (datetime,)
+        elif isinstance(defaults.get(attr), str):
+            types = (str,)
+        else:
+            types = (int, float)
+        index = RangeIndex(attr, types)
+        index.extend(items)
+        return index
+    elif kind == "column":
+        index = ColumnStore({name: defaults[name] for name in declared})
+    elif kind == "location":
+        index = GridIndex(declared)
+    else:
+        index = TextIndex(declared)
+    for key, obj in items:
+        index.add(key, obj)
+    return index
@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""The script defines the inverted index FileStorage keeps of the text
+attributes of a model class, and the tokenizer shared by the storage
+engines."""
+import re
+
+_WORD = re.compile(r"\w+")
+
+
+class TextIndex:
+    """Represents an inverted index on the words of some text attributes
+    of a model class, as a posting list of keys per word.
+
+    Words are the runs of letters, digits and underscores of the values,
+    compared case-insensitively. Values that are not strings hold no
+    words.
+
+    Attributes:
+        attrs (tuple): the indexed attribute names.
+    """
+
+    def __init__(self, attrs):
+        """Initialize a new, empty TextIndex.
+
+        Args:
+            attrs (tuple): the text attribute names to index.
+        """
+        self.attrs = tuple(attrs)
+        self.__postings = {}
+        self.__words_of = {}
+        self.__objs = {}
+
+    def __len__(self):
+        return len(self.__objs)
+
+    def add(self, key, obj):
+        """Indexes obj under key by the words of its current values."""
+        words = set()
+        for attr in self.attrs:
+            words.update(tokenize(getattr(obj, attr, None)))
+        postings = self.__postings
+        for word in words:
+            keys = postings.get(word)
+            if keys is None:
+                keys = postings[word] = set()
+            keys.add(key)
+        self.__words_of[key] = words
+        self.__objs[key] = obj
+
+    def discard(self, key):
+        """Removes key from the index if it's inside."""
+        words = self.__words_of.pop(key, None)
+        if words is None:
+            return
+        del self.__objs[key]
+        postings = self.__postings
+        for word in words:
+            keys = postings[word]
+            keys.discard(key)
+            if len(keys) == 0:
+                del postings[word]
+
+    def search(self, text):
+        """Returns a {key: object} dict of the objects holding every word
+        of text, or an empty one if text holds no words.
+
+        The posting lists are intersected from the shortest one, so the
+        cost follows the size of the lists rather than of the text.
+        """
+        words = set(tokenize(text))
+        if len(words) == 0:
+            return {}
+        postings = sorted((self.__postings.get(word, ()) for word in words),
+                          key=len)
+        keys = set(postings[0])
+        for other in postings[1:]:
+            if len(keys) == 0:
+                break
+            keys.intersection_update(other)
+        objs = self.__objs
+        return {key: objs[key] for key in keys}
+
+
+def tokenize(text):
+    """Returns the list of the casefolded words of text, or an empty list
+    if text is not a string."""
+    if not isinstance(text, str):
+        return []
+    return _WORD.findall(text.casefold())
@@ -18,6 +18,16 @@ class Place(BaseModel):
         latitude (float): the latitude of the place.
         longitude (float): the longitude of the place.
         amenity_ids (list): the list of Amenity ids.
+        _indexed (tuple): the attributes FileStorage indexes by value.
+        _columnar (tuple): the numeric attributes FileStorage keeps in
+            columns.
+        _ranged (tuple): the attributes FileStorage keeps in order.
+        _located (tuple): the (latitude, longitude) attributes of the
+            position of the place.
+        _searchable (tuple): the text attributes FileStorage indexes by
+            word.
+        _members (tuple): the list attributes FileStorage indexes by the
+            values they hold.
     """
 
     city_id = ""
@@ -31,3 +41,11 @@ class Place(BaseModel):
     latitude = 0.0
     longitude = 0.0
     amenity_ids = []
+
+    _indexed = ("city_id", "user_id")
+    _columnar = ("price_by_night", "max_guest", "number_rooms", "latitude",
+                 "longitude")
+    _ranged = ("created_at", "updated_at", "price_by_night")
+    _located = ("latitude", "longitude")
+    _searchable = ("name", "description")
+    _members = ("amenity_ids",)
@@ -10,8 +10,14 @@ class Review(BaseModel):
         place_id (str): the Place id.
         user_id (str): the User id.
         text (str): the text of the review.
+        _indexed (tuple): the attributes FileStorage indexes by value.
+        _searchable (tuple): the text attributes FileStorage indexes by
+            word.
     """
 
     place_id = ""
     user_id = ""
     text = ""
+
+    _indexed = ("place_id", "user_id")
+    _searchable = ("text",)
@@ -10,12 +10,17 @@ Unittest classes:
     Test_cmd_all
     Test_cmd_destroy
     Test_cmd_update
+    Test_cmd_count
+    Test_cmd_nearby
+    Test_cmd_search
 """
 import os
 import sys
 import unittest
 from models import storage
 from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.review import Review
 from console import my_command
 from io import StringIO
 from unittest.mock import patch
@@ -98,10 +103,28 @@ class Test_cmd_help(unittest.TestCase):
             self.assertFalse(my_command().onecmd("help update"))
             self.assertEqual(k, output.getvalue().strip())
 
+    def test_help_nearby(self):
+        k = ("Usage: nearby <class> <latitude> <longitude> <km> or\n       "
+             "<class>.nearby(<latitude>, <longitude>, <km>)\n        "
+             "Displays string representations of the instances of a given "
+             "class\n        within km kilometres of a point, nearest first.")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd("help nearby"))
+            self.assertEqual(k, output.getvalue().strip())
+
+    def test_help_search(self):
+        k = ("Usage: search <class> <keywords> or <class>.search(<keywords>)"
+             "\n        Displays string representations of the instances of "
+             "a given class\n        whose text holds every keyword.")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd("help search"))
+            self.assertEqual(k, output.getvalue().strip())
+
     def test_help(self):
         k = ("Documented commands (type help <topic>):\n"
              "========================================\n"
-             "EOF  all  count  create  destroy  help  quit  show  update")
+             "EOF  all  count  create  destroy  help  nearby  quit  search  "
+             "show  update")
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(my_command().onecmd("help"))
             self.assertEqual(k, output.getvalue().strip())
@@ -1338,6 +1361,30 @@ class Test_cmd_update(unittest.TestCase):
         test_dict = storage.all()["Place.{}".format(tId)].__dict__
         self.assertEqual(7.2, test_dict["latitude"])
 
+    def test_update_ignores_extra_arguments(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            my_command().onecmd("create Place")
+            testId = output.getvalue().strip()
+        testCmd = "update Place {} name Loft extra args".format(testId)
+        self.assertFalse(my_command().onecmd(testCmd))
+        test_dict = storage.all()["Place.{}".format(testId)].__dict__
+        self.assertEqual("Loft", test_dict["name"])
+        self.assertNotIn("extra", test_dict)
+
+    def test_update_keeps_find_index(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            my_command().onecmd("create City")
+            testId = output.getvalue().strip()
+        key = "City.{}".format(testId)
+        storage.find("City", state_id="")
+        my_command().onecmd('update City {} state_id "CA"'.format(testId))
+        self.assertIn(key, storage.find("City", state_id="CA"))
+        testCmd = "update City {} ".format(testId)
+        testCmd += "{'state_id': 'NY'}"
+        my_command().onecmd(testCmd)
+        self.assertNotIn(key, storage.find("City", state_id="CA"))
+        self.assertIn(key, storage.find("City", state_id="NY"))
+
     def test_update_valid_dictionary_space_notation(self):
         with patch("sys.stdout", new=StringIO()) as output:
             my_command().onecmd("create BaseModel")
@@ -1530,6 +1577,12 @@ class Test_cmd_count(unittest.TestCase):
         except IOError:
             pass
 
+    def test_count_missing_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd("count"))
+            self.assertEqual("** class name missing **",
+                             output.getvalue().strip())
+
     def test_count_invalid_class(self):
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(my_command().onecmd("MyModel.count()"))
@@ -1573,5 +1626,144 @@ class Test_cmd_count(unittest.TestCase):
             self.assertEqual("1", output.getvalue().strip())
 
 
+class Test_cmd_nearby(unittest.TestCase):
+    """Unittests for testing the nearby method of the HBNB command
+    interpreter."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.louvre = Place()
+        self.louvre.latitude = 48.8606
+        self.louvre.longitude = 2.3376
+        self.orsay = Place()
+        self.orsay.latitude = 48.8600
+        self.orsay.longitude = 2.3266
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_nearby_missing_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd("nearby"))
+            self.assertEqual("** class name missing **",
+                             output.getvalue().strip())
+
+    def test_nearby_invalid_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd("nearby MyModel 0 0 5"))
+            self.assertEqual("** class doesn't exist **",
+                             output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd("nearby User 0 0 5"))
+            self.assertEqual("** class has no location **",
+                             output.getvalue().strip())
+
+    def test_nearby_missing_arguments(self):
+        for arg, name in (("", "latitude"), (" 48.8", "longitude"),
+                          (" 48.8 2.3", "distance")):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(my_command().onecmd("nearby Place" + arg))
+                self.assertEqual("** {} missing **".format(name),
+                                 output.getvalue().strip())
+
+    def test_nearby_invalid_number(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd("nearby Place 48.8 east 5"))
+            self.assertEqual("** invalid number **",
+                             output.getvalue().strip())
+
+    def test_nearby_objects(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd(
+                "nearby Place 48.8566 2.3522 5"))
+            self.assertEqual(str([str(self.louvre), str(self.orsay)]),
+                             output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd(
+                "Place.nearby(48.8600, 2.3266, 0.5)"))
+            self.assertEqual(str([str(self.orsay)]),
+                             output.getvalue().strip())
+
+
+class Test_cmd_search(unittest.TestCase):
+    """Unittests for testing the search method of the HBNB command
+    interpreter."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.rv1 = Review()
+        self.rv1.text = "Great view, friendly host."
+        self.rv2 = Review()
+        self.rv2.text = "The view was great!"
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_search_missing_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd("search"))
+            self.assertEqual("** class name missing **",
+                             output.getvalue().strip())
+
+    def test_search_invalid_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd("search MyModel view"))
+            self.assertEqual("** class doesn't exist **",
+                             output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd("search User view"))
+            self.assertEqual("** class isn't searchable **",
+                             output.getvalue().strip())
+
+    def test_search_missing_keywords(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd("search Review"))
+            self.assertEqual("** keywords missing **",
+                             output.getvalue().strip())
+
+    def test_search_objects(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd("search Review HOST view"))
+            self.assertEqual(str([str(self.rv1)]), output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd(
+                'Review.search("great view")'))
+            self.assertEqual(2, output.getvalue().count("[Review]"))
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd("search Review views"))
+            self.assertEqual("[]", output.getvalue().strip())
+
+    def test_search_follows_updates(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(my_command().onecmd(
+                'update Review {} text "Noisy street"'.format(self.rv2.id)))
+            self.assertFalse(my_command().onecmd(
+                "destroy Review {}".format(self.rv1.id)))
+            self.assertFalse(my_command().onecmd("search Review noisy"))
+            self.assertEqual(str([str(self.rv2)]), output.getvalue().strip())
+
+
 if __name__ == "__main__":
     unittest.main()
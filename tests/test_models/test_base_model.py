@@ -6,13 +6,16 @@ Unittest classes:
     TestBaseModel_instantiation
     TestBaseModel_save
     TestBaseModel_to_dict
+    TestBaseModel_registry
+    TestBaseModel_from_dict
 """
 import os
 import models
 import unittest
 from datetime import datetime
 from time import sleep
-from models.base_model import BaseModel
+from unittest.mock import patch
+from models.base_model import BaseModel, classes
 
 
 class TestBaseModel_instantiation(unittest.TestCase):
@@ -87,6 +90,26 @@ class TestBaseModel_instantiation(unittest.TestCase):
         self.assertEqual(bm.created_at, cdt)
         self.assertEqual(bm.updated_at, cdt)
 
+    def test_instantiation_with_whole_second_kwargs(self):
+        cdt = datetime(2017, 9, 28, 21, 5, 54)
+        bm = BaseModel(id="345", created_at=cdt.isoformat(),
+                       updated_at=cdt.isoformat())
+        self.assertEqual(bm.created_at, cdt)
+        self.assertEqual(bm.updated_at, cdt)
+
+    def test_instantiation_with_unpadded_kwargs(self):
+        bm = BaseModel(id="345", created_at="2017-9-28T21:05:54.1",
+                       updated_at="2017-09-28T21:05:54.119427")
+        self.assertEqual(bm.created_at, datetime(2017, 9, 28, 21, 5, 54,
+                                                 100000))
+        self.assertEqual(bm.updated_at, datetime(2017, 9, 28, 21, 5, 54,
+                                                 119427))
+
+    def test_instantiation_with_invalid_date_kwargs(self):
+        with self.assertRaises(ValueError):
+            BaseModel(id="345", created_at="yesterday",
+                      updated_at="2017-09-28T21:05:54.119427")
+
 
 class TestBaseModel_save(unittest.TestCase):
     """This script nittests for testing save method of
@@ -140,6 +163,20 @@ class TestBaseModel_save(unittest.TestCase):
         with open("file.json", "r") as f:
             self.assertIn(bmid, f.read())
 
+    def test_save_after_attribute_change_updates_file(self):
+        bm = BaseModel()
+        bm.save()
+        bm.name = "Holberton"
+        bm.save()
+        with open("file.json", "r") as f:
+            self.assertIn('"name": "Holberton"', f.read())
+
+    def test_setattr_marks_attribute_changed(self):
+        bm = BaseModel()
+        bm.save()
+        bm.name = "Holberton"
+        self.assertEqual({"name"}, models.storage.changes(bm))
+
 
 class TestBaseModel_to_dict(unittest.TestCase):
     """Unittests for testing to_dict method of the BaseModel class."""
@@ -191,5 +228,61 @@ class TestBaseModel_to_dict(unittest.TestCase):
             bm.to_dict(None)
 
 
+class TestBaseModel_registry(unittest.TestCase):
+    """Unittests for testing the registry of model classes."""
+
+    def test_models_are_registered(self):
+        self.assertEqual({"BaseModel", "User", "State", "City", "Place",
+                          "Amenity", "Review"}, set(classes))
+        self.assertTrue(issubclass(classes["BaseModel"], BaseModel))
+        self.assertTrue(issubclass(classes["Place"], models.place.Place))
+
+    def test_subclass_is_registered(self):
+        class Host(BaseModel):
+            pass
+        try:
+            self.assertIs(Host, classes["Host"])
+        finally:
+            del classes["Host"]
+
+
+class TestBaseModel_from_dict(unittest.TestCase):
+    """Unittests for testing from_dict class method of the BaseModel
+    class."""
+
+    def test_round_trip(self):
+        bm = BaseModel()
+        bm.name = "Holberton"
+        copy = BaseModel.from_dict(bm.to_dict())
+        self.assertIsNot(bm, copy)
+        self.assertEqual(bm.to_dict(), copy.to_dict())
+        self.assertNotIn("__class__", copy.__dict__)
+        self.assertEqual(datetime, type(copy.created_at))
+
+    def test_not_added_to_storage(self):
+        attrs = {"id": "from-dict-345", "__class__": "BaseModel",
+                 "created_at": "2017-09-28T21:05:54.119427",
+                 "updated_at": "2017-09-28T21:05:54.119572"}
+        bm = BaseModel.from_dict(attrs)
+        self.assertNotIn("BaseModel.from-dict-345", models.storage.all())
+        self.assertEqual("from-dict-345", bm.id)
+        self.assertEqual("BaseModel", attrs["__class__"])
+
+    def test_skips_defaults(self):
+        attrs = BaseModel().to_dict()
+        with patch("models.base_model.uuid4") as uuid4, \
+                patch("models.base_model.datetime") as dt:
+            dt.fromisoformat.side_effect = datetime.fromisoformat
+            BaseModel.from_dict(attrs)
+        uuid4.assert_not_called()
+        dt.today.assert_not_called()
+
+    def test_missing_defaults_are_generated(self):
+        bm = BaseModel.from_dict({"name": "Holberton"})
+        self.assertEqual(str, type(bm.id))
+        self.assertEqual(datetime, type(bm.updated_at))
+        self.assertEqual("Holberton", bm.name)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,180 @@
+#!/usr/bin/python3
+"""The script defines unittests for models/compact.py.
+
+Unittest classes:
+    TestCompact_attributes
+    TestCompact_storage
+"""
+import os
+import models
+import unittest
+import tracemalloc
+from datetime import datetime
+from models.base_model import BaseModel, classes
+from models.compact import CompactModel, compact, install
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.user import User
+
+
+class TestCompact_attributes(unittest.TestCase):
+    """Unittests for testing the attributes of compact instances."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.saved = dict(classes)
+        cls.Place = compact(Place)
+
+    @classmethod
+    def tearDownClass(cls):
+        classes.clear()
+        classes.update(cls.saved)
+
+    def test_is_registered_subclass(self):
+        self.assertIs(self.Place, classes["Place"])
+        self.assertEqual("Place", self.Place.__name__)
+        self.assertTrue(issubclass(self.Place, Place))
+        self.assertTrue(issubclass(self.Place, CompactModel))
+
+    def test_declared_attributes_are_slots(self):
+        self.assertIn("number_rooms", self.Place.__slots__)
+        self.assertIn("id", self.Place.__slots__)
+        self.assertNotIn("_indexed", self.Place.__slots__)
+
+    def test_unset_slot_reads_default(self):
+        pl = self.Place()
+        self.assertEqual(0, pl.number_rooms)
+        self.assertEqual([], pl.amenity_ids)
+        self.assertNotIn("number_rooms", pl.__dict__)
+        pl.number_rooms = 3
+        self.assertEqual(3, pl.number_rooms)
+        self.assertIn("number_rooms", pl.__dict__)
+        del pl.number_rooms
+        self.assertEqual(0, pl.number_rooms)
+
+    def test_missing_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.Place().color
+
+    def test_overflow_attributes(self):
+        pl = self.Place()
+        pl.color = "red"
+        pl.name = "Loft"
+        self.assertEqual("red", pl.color)
+        self.assertEqual({"id", "created_at", "updated_at", "name",
+                          "color"}, set(pl.__dict__))
+        self.assertEqual("red", pl.to_dict()["color"])
+        del pl.color
+        self.assertNotIn("color", pl.__dict__)
+
+    def test_str(self):
+        pl = self.Place()
+        pl.name = "Loft"
+        self.assertEqual("[Place] ({}) {}".format(pl.id, dict(pl.__dict__)),
+                         str(pl))
+        self.assertIn("'name': 'Loft'", str(pl))
+
+    def test_to_dict_and_from_dict(self):
+        pl = self.Place()
+        pl.name = "Loft"
+        pl.max_guest = 4
+        pl.color = "red"
+        copy = self.Place.from_dict(pl.to_dict())
+        self.assertEqual(pl.to_dict(), copy.to_dict())
+        self.assertEqual(datetime, type(copy.created_at))
+
+    def test_smaller_than_regular_instances(self):
+        attrs = {"city_id": "c", "user_id": "u", "name": "Loft",
+                 "description": "", "number_rooms": 1,
+                 "number_bathrooms": 1, "max_guest": 2,
+                 "price_by_night": 3, "latitude": 1.5, "longitude": 2.5}
+        sizes = []
+        for cls in (Place, self.Place):
+            tracemalloc.start()
+            try:
+                objs = [cls.from_dict(dict(attrs, id=str(i)))
+                        for i in range(1000)]
+                sizes.append(tracemalloc.get_traced_memory()[0])
+            finally:
+                tracemalloc.stop()
+            self.assertEqual(1000, len(objs))
+        self.assertLess(sizes[1], sizes[0])
+
+
+class TestCompact_storage(unittest.TestCase):
+    """Unittests for testing compact instances in FileStorage."""
+
+    @classmethod
+    def setUp(self):
+        self.saved = dict(classes)
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__changed = {}
+        install()
+
+    @classmethod
+    def tearDown(self):
+        classes.clear()
+        classes.update(self.saved)
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__changed = {}
+
+    def test_install_replaces_every_model(self):
+        for name, cls in self.saved.items():
+            self.assertTrue(issubclass(classes[name], cls))
+            self.assertTrue(issubclass(classes[name], CompactModel))
+        install()
+        self.assertTrue(issubclass(classes["User"].__bases__[1], User))
+        self.assertIs(BaseModel, classes["BaseModel"].__bases__[1])
+
+    def test_install_keeps_module_classes(self):
+        self.assertIs(Place, models.place.Place)
+        self.assertIs(BaseModel, models.base_model.BaseModel)
+        self.assertEqual("", Place.name)
+        self.assertNotIsInstance(Place(), CompactModel)
+
+    def test_changes_are_tracked(self):
+        pl = classes["Place"]()
+        models.storage.save()
+        pl.number_rooms = 2
+        self.assertEqual({"number_rooms"}, models.storage.changes(pl))
+
+    def test_save_and_reload(self):
+        pl = classes["Place"]()
+        pl.city_id = "c1"
+        pl.color = "red"
+        pl.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        loaded = models.storage.get("Place", pl.id)
+        self.assertIsInstance(loaded, CompactModel)
+        self.assertEqual(pl.to_dict(), loaded.to_dict())
+        self.assertEqual({"Place." + pl.id: loaded},
+                         models.storage.find("Place", city_id="c1"))
+
+    def test_transaction_rollback(self):
+        pl = classes["Place"]()
+        pl.name = "Loft"
+        models.storage.save()
+        with self.assertRaises(ValueError):
+            with models.storage.transaction():
+                pl.name = "Barn"
+                pl.color = "red"
+                raise ValueError
+        self.assertEqual("Loft", pl.name)
+        self.assertNotIn("color", pl.__dict__)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+#!/usr/bin/python3
+"""This script defines unittests for models/engine/binary_snapshot.py
+
+Unittest classes:
+    TestBinarySnapshot_format
+    TestBinarySnapshot_section
+    TestBinarySnapshot_convert
+"""
+import io
+import os
+import sys
+import json
+import tempfile
+import unittest
+import subprocess
+import models
+from models.engine import binary_snapshot
+from models.engine.binary_snapshot import Snapshot
+
+
+RECORDS = [
+    ("State.0b7a3c4e-8f4e-4a8e-9c3f-2f1a5b6c7d8e", {
+        "id": "0b7a3c4e-8f4e-4a8e-9c3f-2f1a5b6c7d8e",
+        "created_at": "2017-09-28T21:05:54.119427",
+        "updated_at": "2017-09-28T21:05:54.119572",
+        "name": "California", "__class__": "State"}),
+    ("City.f1e2d3c4-b5a6-4798-8a9b-0c1d2e3f4a5b", {
+        "id": "f1e2d3c4-b5a6-4798-8a9b-0c1d2e3f4a5b",
+        "created_at": "2017-09-28T21:05:54",
+        "updated_at": "2017-09-28T21:05:54.119572",
+        "state_id": "0b7a3c4e-8f4e-4a8e-9c3f-2f1a5b6c7d8e",
+        "__class__": "City"}),
+    ("City.1234", {
+        "id": "1234", "created_at": "not a date",
+        "updated_at": "2017-09-28T21:05:54.119572",
+        "name": "Reno", "__class__": "City"}),
+]
+
+
+class TestBinarySnapshot_base(unittest.TestCase):
+    """Writes RECORDS to a temporary snapshot file."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as f:
+            binary_snapshot.write(f, iter(RECORDS))
+        self.snap = Snapshot(self.path)
+
+    def tearDown(self):
+        self.snap.close()
+        os.remove(self.path)
+
+
+class TestBinarySnapshot_format(TestBinarySnapshot_base):
+    """Unittests for testing the snapshot file format."""
+
+    def test_records_read_back_equal(self):
+        self.assertEqual(dict(RECORDS), dict(self.snap.items()))
+        self.assertEqual(3, len(self.snap))
+
+    def test_sections_per_class(self):
+        sections = self.snap.sections()
+        self.assertEqual({"State", "City"}, set(sections))
+        self.assertEqual(2, len(sections["City"]))
+
+    def test_timestamps_are_fixed_width(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        self.assertNotIn(b"2017-09-28T21:05:54.119427", data)
+        self.assertIn(b"not a date", data)
+
+    def test_not_a_snapshot(self):
+        with open(self.path, "w") as f:
+            f.write("{}")
+        with self.assertRaises(ValueError):
+            Snapshot(self.path)
+
+    def test_empty_file(self):
+        open(self.path, "w").close()
+        with self.assertRaises(ValueError):
+            Snapshot(self.path)
+
+    def test_empty_snapshot(self):
+        buf = io.BytesIO()
+        binary_snapshot.write(buf, [])
+        with open(self.path, "wb") as f:
+            f.write(buf.getvalue())
+        with Snapshot(self.path) as snap:
+            self.assertEqual(0, len(snap))
+
+
+class TestBinarySnapshot_section(TestBinarySnapshot_base):
+    """Unittests for testing the Section mapping."""
+
+    def setUp(self):
+        super().setUp()
+        self.cities = self.snap.sections()["City"]
+
+    def test_getitem(self):
+        for key, rec in RECORDS[1:]:
+            self.assertEqual(rec, self.cities[key])
+        with self.assertRaises(KeyError):
+            self.cities[RECORDS[0][0]]
+        with self.assertRaises(KeyError):
+            self.cities["City.0b7a3c4e-8f4e-4a8e-9c3f-2f1a5b6c7d8e"]
+
+    def test_contains(self):
+        self.assertIn(RECORDS[1][0], self.cities)
+        self.assertIn("City.1234", self.cities)
+        self.assertNotIn("City.4321", self.cities)
+
+    def test_set_and_delete(self):
+        key = RECORDS[1][0]
+        rec = dict(RECORDS[1][1], name="Fremont")
+        self.cities[key] = rec
+        self.assertEqual(2, len(self.cities))
+        self.assertIs(rec, self.cities[key])
+        self.cities["City.9"] = {"id": "9", "__class__": "City"}
+        self.assertEqual(3, len(self.cities))
+        del self.cities[key]
+        del self.cities["City.1234"]
+        self.assertEqual(["City.9"], list(self.cities))
+        self.assertEqual(1, len(self.cities))
+        with self.assertRaises(KeyError):
+            del self.cities[key]
+
+    def test_pop(self):
+        self.assertEqual(RECORDS[2][1], self.cities.pop("City.1234"))
+        self.assertIsNone(self.cities.pop("City.1234", None))
+        self.assertEqual([RECORDS[1][0]], list(self.cities))
+
+
+class TestBinarySnapshot_convert(unittest.TestCase):
+    """Unittests for testing the conversion from and to JSON."""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.json_path = os.path.join(self.dir, "file.json")
+        self.bin_path = os.path.join(self.dir, "file.bin")
+        with open(self.json_path, "w") as f:
+            json.dump(dict(RECORDS), f)
+
+    def tearDown(self):
+        for name in os.listdir(self.dir):
+            os.remove(os.path.join(self.dir, name))
+        os.rmdir(self.dir)
+
+    def test_round_trip(self):
+        back = os.path.join(self.dir, "back.json")
+        binary_snapshot.json_to_binary(self.json_path, self.bin_path)
+        binary_snapshot.binary_to_json(self.bin_path, back)
+        with open(back) as f:
+            self.assertEqual(dict(RECORDS), json.load(f))
+
+    def test_script_leaves_storage_alone(self):
+        script = os.path.join(os.path.dirname(os.path.dirname(
+            os.path.abspath(models.__file__))), "convert_snapshot.py")
+        journal = os.path.join(self.dir, "file.json.log")
+        with open(journal, "w") as f:
+            f.write('{"State.1": null}\n{"State.2"')
+        subprocess.run([sys.executable, script, "to-binary", "file.json",
+                        "file.bin"], cwd=self.dir, check=True)
+        with open(journal) as f:
+            self.assertEqual('{"State.1": null}\n{"State.2"', f.read())
+        with Snapshot(self.bin_path) as snap:
+            self.assertEqual(dict(RECORDS), dict(snap.items()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""This script defines unittests for models/engine/bitmaps.py
+
+Unittest classes:
+    TestBitmap
+    TestMembershipIndex
+"""
+import unittest
+from models.engine.bitmaps import CHUNK_BITS, Bitmap, MembershipIndex
+from models.place import Place
+
+
+class TestBitmap(unittest.TestCase):
+    """Unittests for testing the Bitmap class."""
+
+    def setUp(self):
+        self.far = 3 << CHUNK_BITS
+        self.bitmap = Bitmap([5, 1, self.far + 7, 0])
+
+    def test_iteration_is_sorted(self):
+        self.assertEqual([0, 1, 5, self.far + 7], list(self.bitmap))
+        self.assertEqual([], list(Bitmap()))
+
+    def test_len_and_contains(self):
+        self.assertEqual(4, len(self.bitmap))
+        self.assertIn(self.far + 7, self.bitmap)
+        self.assertNotIn(2, self.bitmap)
+        self.assertNotIn(self.far, self.bitmap)
+        self.assertFalse(Bitmap())
+
+    def test_add_and_discard(self):
+        self.bitmap.add(2)
+        self.bitmap.discard(5)
+        self.bitmap.discard(self.far + 7)
+        self.bitmap.discard(self.far + 8)
+        self.assertEqual(Bitmap([0, 1, 2]), self.bitmap)
+
+    def test_and_or(self):
+        other = Bitmap([1, 2, self.far + 7, self.far + 9])
+        self.assertEqual([1, self.far + 7], list(self.bitmap & other))
+        self.assertEqual([0, 1, 2, 5, self.far + 7, self.far + 9],
+                         list(self.bitmap | other))
+        self.assertFalse(self.bitmap & Bitmap([self.far]))
+        self.assertEqual([0, 1, 5, self.far + 7], list(self.bitmap))
+
+
+class TestMembershipIndex(unittest.TestCase):
+    """Unittests for testing the MembershipIndex class."""
+
+    def setUp(self):
+        self.index = MembershipIndex("amenity_ids")
+        self.pl1 = Place(id="1", amenity_ids=["wifi", "parking"])
+        self.pl2 = Place(id="2", amenity_ids=["wifi"])
+        self.pl3 = Place(id="3", amenity_ids=["pool", ["sauna"]])
+        self.pl4 = Place(id="4", amenity_ids="wifi")
+        for pl in (self.pl1, self.pl2, self.pl3, self.pl4):
+            self.index.add("Place." + pl.id, pl)
+
+    def test_all_of(self):
+        self.assertEqual({"Place.1": self.pl1},
+                         self.index.having(["wifi", "parking"]))
+        self.assertEqual({"Place.1", "Place.2"},
+                         set(self.index.having(["wifi"])))
+        self.assertEqual({}, self.index.having(["wifi", "pool"]))
+        self.assertEqual({}, self.index.having(["spa"]))
+
+    def test_any_of(self):
+        self.assertEqual({"Place.1", "Place.3"},
+                         set(self.index.having(any_of=["parking", "pool"])))
+        self.assertEqual({"Place.1": self.pl1},
+                         self.index.having(["wifi"], ["parking", "spa"]))
+
+    def test_no_filter(self):
+        self.assertEqual(4, len(self.index.having()))
+
+    def test_unhashable_values(self):
+        self.assertEqual({}, self.index.having([["sauna"]]))
+        self.assertEqual(0, len(self.index.bitmap(["sauna"])))
+
+    def test_discard_and_reuse(self):
+        self.index.discard("Place.1")
+        self.index.discard("Place.9")
+        self.assertEqual({}, self.index.having(["parking"]))
+        pl = Place(id="5", amenity_ids=["parking"])
+        self.index.add("Place.5", pl)
+        self.assertEqual({"Place.5": pl}, self.index.having(["parking"]))
+        self.assertEqual([0], list(self.index.bitmap("parking")))
+        self.assertEqual(4, len(self.index))
+
+    def test_add_replaces_values(self):
+        self.pl2.amenity_ids = ["pool"]
+        self.index.add("Place.2", self.pl2)
+        self.assertEqual({"Place.1": self.pl1}, self.index.having(["wifi"]))
+        self.assertEqual({"Place.2", "Place.3"},
+                         set(self.index.having(["pool"])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+#!/usr/bin/python3
+"""This script defines unittests for models/engine/columns.py
+
+Unittest classes:
+    TestColumnStore
+    TestColumnStore_numpy
+"""
+import unittest
+from unittest.mock import patch
+from models.engine import columns
+from models.engine.columns import ColumnStore
+from models.place import Place
+
+
+class TestColumnStore(unittest.TestCase):
+    """Unittests for testing the ColumnStore class without NumPy."""
+
+    def setUp(self):
+        patcher = patch("models.engine.columns.numpy", self.numpy())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store = ColumnStore({"price_by_night": 0, "max_guest": 0,
+                                  "latitude": 0.0})
+        self.pl1 = Place(id="1", price_by_night=80, max_guest=2,
+                         latitude=37.7)
+        self.pl2 = Place(id="2", price_by_night=120, max_guest=4,
+                         latitude=40.7)
+        self.pl3 = Place(id="3", price_by_night=95, max_guest=6)
+        for pl in (self.pl1, self.pl2, self.pl3):
+            self.store.add("Place." + pl.id, pl)
+
+    def numpy(self):
+        return None
+
+    def test_select(self):
+        self.assertEqual({"Place.1": self.pl1, "Place.3": self.pl3},
+                         self.store.select(("price_by_night", "<", 100)))
+        self.assertEqual({"Place.3": self.pl3},
+                         self.store.select(("price_by_night", "<", 100),
+                                           ("max_guest", ">=", 4)))
+        self.assertEqual(3, len(self.store.select()))
+
+    def test_select_float_column(self):
+        self.assertEqual(["Place.2"],
+                         list(self.store.select(("latitude", ">", 38))))
+        self.assertEqual(["Place.3"],
+                         list(self.store.select(("latitude", "==", 0))))
+
+    def test_aggregate(self):
+        self.assertEqual(3, self.store.aggregate("count", "max_guest"))
+        self.assertEqual(295, self.store.aggregate("sum", "price_by_night"))
+        self.assertEqual(int, type(self.store.aggregate("sum",
+                                                        "price_by_night")))
+        self.assertEqual(80, self.store.aggregate("min", "price_by_night"))
+        self.assertEqual(6, self.store.aggregate("max", "max_guest",
+                                                 ("price_by_night", "<",
+                                                  100)))
+        self.assertEqual(4.0, self.store.aggregate("mean", "max_guest"))
+
+    def test_aggregate_no_value(self):
+        cond = ("max_guest", ">", 10)
+        self.assertEqual(0, self.store.aggregate("count", "max_guest", cond))
+        self.assertEqual(0, self.store.aggregate("sum", "max_guest", cond))
+        self.assertIsNone(self.store.aggregate("mean", "max_guest", cond))
+        self.assertIsNone(self.store.aggregate("max", "max_guest", cond))
+
+    def test_aggregate_unknown_function(self):
+        with self.assertRaises(ValueError):
+            self.store.aggregate("median", "max_guest")
+
+    def test_sort(self):
+        self.assertEqual(["Place.1", "Place.3", "Place.2"],
+                         _ids(self.store.sort("price_by_night")))
+        self.assertEqual(["Place.2", "Place.3", "Place.1"],
+                         _ids(self.store.sort("price_by_night",
+                                              reverse=True)))
+        self.assertEqual(["Place.1", "Place.3"],
+                         _ids(self.store.sort("price_by_night", limit=2)))
+        self.assertEqual(["Place.3", "Place.2"],
+                         _ids(self.store.sort("max_guest",
+                                              ("max_guest", ">", 2),
+                                              reverse=True, limit=2)))
+
+    def test_sort_is_stable(self):
+        pl = Place(id="4", price_by_night=80)
+        self.store.add("Place.4", pl)
+        self.assertEqual(["Place.1", "Place.4", "Place.3"],
+                         _ids(self.store.sort("price_by_night", limit=3)))
+        self.assertEqual(["Place.2", "Place.3", "Place.1", "Place.4"],
+                         _ids(self.store.sort("price_by_night",
+                                              reverse=True)))
+
+    def test_add_existing_key_updates_row(self):
+        self.pl1.__dict__["price_by_night"] = 200
+        self.store.add("Place.1", self.pl1)
+        self.assertEqual(3, len(self.store))
+        self.assertEqual(["Place.1"],
+                         list(self.store.select(("price_by_night", ">",
+                                                 150))))
+
+    def test_discard(self):
+        self.store.discard("Place.1")
+        self.store.discard("Place.4")
+        self.assertNotIn("Place.1", self.store)
+        self.assertEqual(2, len(self.store))
+        self.assertEqual({"Place.3": self.pl3},
+                         self.store.select(("price_by_night", "<", 100)))
+        self.assertEqual(215, self.store.aggregate("sum", "price_by_night"))
+
+    def test_values_not_numbers(self):
+        pl = Place(id="4", price_by_night="90", max_guest=3.5)
+        self.store.add("Place.4", pl)
+        self.assertEqual(["Place.4"],
+                         list(self.store.select(("max_guest", "==", 3.5))))
+        self.assertEqual({}, self.store.select(("price_by_night", "==",
+                                                90)))
+        self.assertEqual(3, self.store.aggregate("count", "price_by_night"))
+        self.assertEqual(["Place.1", "Place.3", "Place.2", "Place.4"],
+                         _ids(self.store.sort("price_by_night")))
+        pl.__dict__["price_by_night"] = 90
+        self.store.add("Place.4", pl)
+        self.assertEqual(385, self.store.aggregate("sum", "price_by_night"))
+
+    def test_nan(self):
+        pl = Place(id="4", latitude=float("nan"))
+        self.store.add("Place.4", pl)
+        self.assertEqual(3, self.store.aggregate("count", "latitude"))
+        self.assertEqual(40.7, self.store.aggregate("max", "latitude"))
+        self.assertEqual(0.0, self.store.aggregate("min", "latitude"))
+        self.assertEqual({}, self.store.select(("latitude", "!=", 0),
+                                               ("latitude", "<", 30)))
+        self.assertEqual(["Place.3", "Place.1", "Place.2", "Place.4"],
+                         _ids(self.store.sort("latitude")))
+        self.assertEqual(["Place.2", "Place.1", "Place.3", "Place.4"],
+                         _ids(self.store.sort("latitude", reverse=True)))
+        self.assertEqual(["Place.2", "Place.1"],
+                         _ids(self.store.sort("latitude", reverse=True,
+                                              limit=2)))
+
+    def test_sort_merges_numbers_of_another_type(self):
+        pl = Place(id="4", price_by_night=90.5, max_guest=6)
+        self.store.add("Place.4", pl)
+        self.assertEqual(["Place.1", "Place.4", "Place.3", "Place.2"],
+                         _ids(self.store.sort("price_by_night")))
+        self.assertEqual(["Place.2", "Place.3", "Place.4"],
+                         _ids(self.store.sort("price_by_night",
+                                              reverse=True, limit=3)))
+        self.assertEqual(["Place.4", "Place.3"],
+                         _ids(self.store.sort("price_by_night",
+                                              ("max_guest", "==", 6))))
+        self.assertEqual(["Place.1", "Place.4"],
+                         _ids(self.store.sort("price_by_night", limit=2)))
+
+    def test_invalid_conditions(self):
+        with self.assertRaises(TypeError):
+            self.store.select(("price_by_night", "<", "100"))
+        with self.assertRaises(ValueError):
+            self.store.select(("price_by_night", "~", 100))
+        with self.assertRaises(KeyError):
+            self.store.select(("name", "==", 1))
+        self.store.add("Place.4", Place(id="4"))
+        self.assertEqual(4, len(self.store))
+
+
+@unittest.skipIf(columns.numpy is None, "NumPy is not installed")
+class TestColumnStore_numpy(TestColumnStore):
+    """Unittests for testing the ColumnStore class with NumPy."""
+
+    def numpy(self):
+        return columns.numpy
+
+
+def _ids(objs):
+    """Returns the keys of the Places objs."""
+    return ["Place." + obj.id for obj in objs]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,454 @@
+#!/usr/bin/python3
+"""This script defines unittests for models/engine/db_storage.py
+
+Unittest classes:
+    TestDBStorage_methods
+    TestDBStorage_persistence
+    TestDBStorage_transaction
+    TestDBStorage_query
+    TestDBStorage_location
+    TestDBStorage_search
+    TestDBStorage_members
+"""
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from models.base_model import BaseModel
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.engine.db_storage import DBStorage
+
+
+class TestDBStorage_base(unittest.TestCase):
+    """Opens a DBStorage on a temporary database, used as models.storage
+    by the models created in the tests."""
+
+    def setUp(self):
+        self.addCleanup(self.restore, DBStorage._DBStorage__db_path,
+                        DBStorage._DBStorage__conn is not None)
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "hbnb.db")
+        DBStorage._DBStorage__db_path = self.path
+        self.storage = DBStorage()
+        self.storage.reload()
+        self.patcher = patch("models.storage", self.storage)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        DBStorage._DBStorage__conn.close()
+        DBStorage._DBStorage__conn = None
+        os.remove(self.path)
+        os.rmdir(self.dir)
+
+    @staticmethod
+    def restore(path, opened):
+        """Puts back the database path of DBStorage, and reopens the
+        database if it was open."""
+        DBStorage._DBStorage__db_path = path
+        if opened:
+            DBStorage().reload()
+
+    def reopen(self):
+        """Reloads the storage, dropping every object held in memory."""
+        self.storage.reload()
+
+
+class TestDBStorage_methods(TestDBStorage_base):
+    """Unittests for testing the DBStorage methods."""
+
+    def test_one_table_per_model(self):
+        conn = sqlite3.connect(self.path)
+        names = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.close()
+        self.assertEqual({"BaseModel", "User", "State", "City", "Place",
+                          "Amenity", "Review"}, names)
+
+    def test_foreign_keys_are_indexed(self):
+        conn = sqlite3.connect(self.path)
+        names = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = 'Place' AND sql IS NOT NULL")}
+        conn.close()
+        self.assertEqual({"Place_city_id", "Place_user_id",
+                          "Place_created_at", "Place_updated_at",
+                          "Place_price_by_night", "Place_location"}, names)
+
+    def test_new_and_all(self):
+        bm = BaseModel()
+        pl = Place()
+        self.assertIs(bm, self.storage.all()["BaseModel." + bm.id])
+        self.assertEqual({"Place." + pl.id: pl}, self.storage.all(Place))
+        self.assertEqual({"Place." + pl.id: pl}, self.storage.all("Place"))
+
+    def test_all_unknown_class(self):
+        self.assertEqual({}, self.storage.all("MyModel"))
+
+    def test_count(self):
+        State()
+        State()
+        City()
+        self.assertEqual(2, self.storage.count(State))
+        self.assertEqual(2, self.storage.count("State"))
+        self.assertEqual(3, self.storage.count())
+        self.assertEqual(0, self.storage.count("MyModel"))
+
+    def test_get(self):
+        st = State()
+        self.assertIs(st, self.storage.get("State", st.id))
+        self.assertIsNone(self.storage.get("State", "nope"))
+        self.assertIsNone(self.storage.get("MyModel", st.id))
+
+    def test_delete(self):
+        st = State()
+        self.storage.save()
+        self.storage.delete(st)
+        self.assertIsNone(self.storage.get(State, st.id))
+        self.assertEqual(0, self.storage.count(State))
+
+    def test_find(self):
+        cy1 = City()
+        cy1.state_id = "CA"
+        cy2 = City()
+        cy2.state_id = "NY"
+        cy2.nickname = "Big Apple"
+        self.assertEqual({"City." + cy1.id: cy1},
+                         self.storage.find(City, state_id="CA"))
+        self.assertEqual({"City." + cy2.id: cy2},
+                         self.storage.find("City", nickname="Big Apple"))
+        self.assertEqual({}, self.storage.find(City, state_id="TX"))
+
+    def test_find_class_default(self):
+        cy = City()
+        cy.save()
+        self.reopen()
+        self.assertEqual(["City." + cy.id],
+                         list(self.storage.find(City, state_id="")))
+        self.assertEqual({}, self.storage.find(City, state_id="CA"))
+
+
+class TestDBStorage_persistence(TestDBStorage_base):
+    """Unittests for testing what DBStorage writes to the database."""
+
+    def test_save_and_reload(self):
+        pl = Place()
+        pl.name = "Loft"
+        pl.number_rooms = 3
+        pl.latitude = 1.5
+        pl.amenity_ids = ["a", "b"]
+        pl.wifi = "yes"
+        pl.save()
+        self.reopen()
+        loaded = self.storage.get(Place, pl.id)
+        self.assertIsNot(pl, loaded)
+        self.assertEqual(pl.to_dict(), loaded.to_dict())
+
+    def test_values_keep_their_type(self):
+        pl = Place()
+        pl.name = 5
+        pl.price_by_night = "12"
+        pl.latitude = 3
+        pl.save()
+        self.reopen()
+        loaded = self.storage.get(Place, pl.id)
+        self.assertEqual((5, int), (loaded.name, type(loaded.name)))
+        self.assertEqual("12", loaded.price_by_night)
+        self.assertEqual((3, int), (loaded.latitude, type(loaded.latitude)))
+
+    def test_values_their_column_cannot_hold(self):
+        pl = Place()
+        pl.amenity_ids = "wifi"
+        pl.name = ["Loft"]
+        pl.save()
+        self.reopen()
+        loaded = self.storage.get(Place, pl.id)
+        self.assertEqual("wifi", loaded.amenity_ids)
+        self.assertEqual(["Loft"], loaded.name)
+        self.assertEqual(1, len(self.storage.all(Place)))
+
+    def test_list_column_holding_raw_text(self):
+        pl = Place()
+        pl.save()
+        DBStorage._DBStorage__conn.execute(
+            'UPDATE "Place" SET "amenity_ids" = ? WHERE "id" = ?',
+            ("wifi", pl.id))
+        DBStorage._DBStorage__conn.commit()
+        self.reopen()
+        self.assertEqual("wifi", self.storage.get(Place, pl.id).amenity_ids)
+
+    def test_unset_attributes_keep_class_defaults(self):
+        cy = City()
+        cy.save()
+        self.reopen()
+        loaded = self.storage.get(City, cy.id)
+        self.assertNotIn("state_id", loaded.__dict__)
+        self.assertEqual("", loaded.state_id)
+
+    def test_unsaved_changes_are_not_committed(self):
+        st = State()
+        st.save()
+        st.name = "California"
+        self.reopen()
+        self.assertNotIn("name", self.storage.get(State, st.id).__dict__)
+
+    def test_deleted_row_is_removed(self):
+        st = State()
+        st.save()
+        self.storage.delete(st)
+        self.storage.save()
+        self.reopen()
+        self.assertIsNone(self.storage.get(State, st.id))
+
+    def test_save_writes_changed_rows_only(self):
+        states = [State() for i in range(3)]
+        self.storage.save()
+        states[1].name = "Nevada"
+        statements = []
+        DBStorage._DBStorage__conn.set_trace_callback(statements.append)
+        self.storage.save()
+        writes = [s for s in statements if s.startswith("INSERT")]
+        self.assertEqual(1, len(writes))
+        self.assertIn(states[1].id, writes[0])
+
+    def test_loaded_object_is_shared(self):
+        st = State()
+        st.save()
+        self.reopen()
+        self.assertIs(self.storage.get(State, st.id),
+                      self.storage.all(State)["State." + st.id])
+
+
+class TestDBStorage_transaction(TestDBStorage_base):
+    """Unittests for testing DBStorage.transaction()."""
+
+    def test_commit(self):
+        with self.storage.transaction():
+            st = State()
+            st.save()
+            cy = City()
+            cy.save()
+        self.reopen()
+        self.assertEqual(2, self.storage.count())
+
+    def test_rollback(self):
+        st = State()
+        st.save()
+        with self.assertRaises(KeyError):
+            with self.storage.transaction():
+                self.storage.delete(st)
+                self.storage.save()
+                State().save()
+                raise KeyError
+        self.assertEqual(1, self.storage.count())
+        self.assertIsNotNone(self.storage.get(State, st.id))
+
+
+class TestDBStorage_query(TestDBStorage_base):
+    """Unittests for testing query() of the DBStorage class."""
+
+    def setUp(self):
+        super().setUp()
+        for i, (price, guests) in enumerate([(80, 2), (120, 4), (95, 6),
+                                             (60, 4), (99, 8)]):
+            pl = Place()
+            pl.price_by_night = price
+            pl.max_guest = guests
+            pl.name = "Place {}".format(i)
+            pl.rating = i
+        self.storage.save()
+        self.storage.reload()
+
+    def prices(self, query):
+        return [pl.price_by_night for pl in query]
+
+    def test_where_order_by_and_limit_in_sql(self):
+        query = self.storage.query(Place).where("price_by_night", "<", 100)
+        query.where(max_guest=4)
+        self.assertEqual([60], self.prices(query))
+        query = self.storage.query("Place").order_by("price_by_night",
+                                                     reverse=True).limit(2)
+        with patch.object(DBStorage, "_DBStorage__from_row",
+                          wraps=self.storage._DBStorage__from_row) as rows:
+            self.assertEqual([120, 99], self.prices(query))
+        self.assertEqual(2, rows.call_count)
+
+    def test_conditions_and_order_in_python(self):
+        query = self.storage.query(Place).where("rating", ">=", 2)
+        self.assertEqual([95, 60, 99],
+                         self.prices(query.order_by("rating")))
+        query.where("price_by_night", "<", 99).order_by("created_at",
+                                                        reverse=True)
+        self.assertEqual([60, 95], self.prices(query.limit(2)))
+
+    def test_value_of_another_type(self):
+        query = self.storage.query(Place).where("price_by_night", "<", "z")
+        self.assertEqual([], query.all())
+
+    def test_order_puts_values_of_another_type_last(self):
+        pl = self.storage.query(Place).where(price_by_night=60).first()
+        pl.price_by_night = "12"
+        self.storage.save()
+        self.storage.reload()
+        query = self.storage.query(Place)
+        self.assertEqual([80, 95, 99, 120, "12"],
+                         self.prices(query.order_by("price_by_night")))
+        self.assertEqual([120, 99, 95, 80, "12"], self.prices(
+            query.order_by("price_by_night", reverse=True)))
+        self.assertEqual([80, 95, 99, 120, "12"],
+                         self.prices(query.order_by("price_by_night")
+                                     .limit(5)))
+
+    def test_unsaved_changes_are_queried(self):
+        pl = self.storage.query(Place).where(price_by_night=60).first()
+        pl.price_by_night = 300
+        query = self.storage.query(Place).order_by("price_by_night")
+        self.assertIs(pl, query.order_by("price_by_night",
+                                         reverse=True).first())
+        self.assertEqual(4, self.storage.query(Place)
+                         .where("price_by_night", "<", 300).count())
+
+    def test_timestamps_in_sql(self):
+        query = self.storage.query(Place).order_by("price_by_night")
+        for i, pl in enumerate(query.all()):
+            pl.updated_at = datetime(2024, 1, 1 + i)
+        self.storage.save()
+        self.storage.reload()
+        query = self.storage.query(Place).where(
+            "updated_at", ">=", datetime(2024, 1, 2)).order_by(
+            "updated_at", reverse=True).limit(3)
+        with patch.object(DBStorage, "_DBStorage__from_row",
+                          wraps=self.storage._DBStorage__from_row) as rows:
+            self.assertEqual([120, 99, 95], self.prices(query))
+        self.assertEqual(3, rows.call_count)
+
+    def test_range_indexes_are_used(self):
+        conn = sqlite3.connect(self.path)
+        plan = conn.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM "Place" WHERE '
+            'COALESCE("price_by_night", 0) > ? ORDER BY '
+            'COALESCE("price_by_night", 0), rowid', (90,)).fetchall()
+        conn.close()
+        self.assertIn("Place_price_by_night", plan[0][3])
+
+    def test_query_unknown_class(self):
+        self.assertEqual([], self.storage.query("MyModel").all())
+
+
+class TestDBStorage_location(TestDBStorage_base):
+    """Unittests for testing within() and nearby() of the DBStorage
+    class."""
+
+    def setUp(self):
+        super().setUp()
+        self.ids = {}
+        for name, lat, lng in (("louvre", 48.8606, 2.3376),
+                               ("orsay", 48.8600, 2.3266),
+                               ("fiji", -17.7, 179.99),
+                               ("samoa", -13.8, -179.9)):
+            pl = Place()
+            pl.latitude = lat
+            pl.longitude = lng
+            self.ids[name] = pl.id
+        Place().name = "Null Island"
+        self.storage.save()
+        self.storage.reload()
+
+    def test_nearby(self):
+        found = self.storage.nearby(Place, 48.8566, 2.3522, 5)
+        self.assertEqual([self.ids["louvre"], self.ids["orsay"]],
+                         [pl.id for pl in found])
+        found = self.storage.nearby("Place", -16.0, 180.0, 500, 1)
+        self.assertEqual([self.ids["fiji"]], [pl.id for pl in found])
+
+    def test_within(self):
+        found = self.storage.within(Place, -20, 179, -10, -179)
+        self.assertEqual({"Place." + self.ids["fiji"],
+                          "Place." + self.ids["samoa"]}, set(found))
+        self.assertEqual(1, len(self.storage.within(Place, -1, -1, 1, 1)))
+        self.assertEqual({}, self.storage.within(State, -90, -180, 90, 180))
+
+    def test_box_reads_only_its_rows(self):
+        with patch.object(DBStorage, "_DBStorage__from_row",
+                          wraps=self.storage._DBStorage__from_row) as rows:
+            self.storage.within(Place, 48, 2, 49, 3)
+        self.assertEqual(2, rows.call_count)
+        conn = sqlite3.connect(self.path)
+        plan = conn.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM "Place" WHERE '
+            'COALESCE("latitude", 0.0) BETWEEN ? AND ? AND '
+            'COALESCE("longitude", 0.0) BETWEEN ? AND ?',
+            (48, 49, 2, 3)).fetchall()
+        conn.close()
+        self.assertIn("Place_location", plan[0][3])
+
+
+class TestDBStorage_search(TestDBStorage_base):
+    """Unittests for testing search() of the DBStorage class."""
+
+    def setUp(self):
+        super().setUp()
+        rv = Review()
+        rv.text = "Great view, friendly host."
+        self.rv_id = rv.id
+        Review().text = "The VIEW was great! Straße 100_000"
+        Review().text = "Greatest viewpoint"
+        self.storage.save()
+        self.storage.reload()
+
+    def test_search(self):
+        self.assertEqual(2, len(self.storage.search(Review, "great view")))
+        found = self.storage.search("Review", "host")
+        self.assertEqual(["Review." + self.rv_id], list(found))
+        self.assertEqual(1, len(self.storage.search(Review, "strasse")))
+        self.assertEqual(1, len(self.storage.search(Review, "100_000")))
+        self.assertEqual({}, self.storage.search(Review, "100x000"))
+        self.assertEqual({}, self.storage.search(State, "great"))
+
+    def test_unsaved_changes_are_searched(self):
+        rv = self.storage.get(Review, self.rv_id)
+        rv.text = "Noisy street"
+        self.assertEqual(1, len(self.storage.search(Review, "view")))
+        self.assertIs(rv, self.storage.search(Review, "noisy")[
+            "Review." + self.rv_id])
+
+
+class TestDBStorage_members(TestDBStorage_base):
+    """Unittests for testing having() of the DBStorage class."""
+
+    def setUp(self):
+        super().setUp()
+        self.ids = {}
+        for name, amenity_ids in (("both", ["wifi", "parking"]),
+                                  ("wifi", ["wifi"]),
+                                  ("odd", ["50%_off", ["wifi"]])):
+            pl = Place()
+            pl.amenity_ids = amenity_ids
+            self.ids[name] = "Place." + pl.id
+        Place()
+        self.storage.save()
+        self.storage.reload()
+
+    def having(self, *args, **kwargs):
+        return set(self.storage.having(Place, "amenity_ids", *args,
+                                       **kwargs))
+
+    def test_having(self):
+        self.assertEqual({self.ids["both"]},
+                         self.having(["wifi", "parking"]))
+        self.assertEqual({self.ids["both"], self.ids["wifi"]},
+                         self.having(["wifi"]))
+        self.assertEqual({self.ids["both"], self.ids["odd"]},
+                         self.having(any_of=["parking", "50%_off"]))
+        self.assertEqual(set(), self.having(["50x_off"]))
+        self.assertEqual(4, len(self.having()))
+        self.assertEqual({}, self.storage.having(Place, "name", ["x"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
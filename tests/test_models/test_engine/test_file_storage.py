@@ -4,12 +4,32 @@
 Unittest classes:
     TestFileStorage_instantiation
     TestFileStorage_methods
+    TestFileStorage_journal
+    TestFileStorage_compaction
+    TestFileStorage_dirty_tracking
+    TestFileStorage_class_index
+    TestFileStorage_find
+    TestFileStorage_columns
+    TestFileStorage_query
+    TestFileStorage_ranges
+    TestFileStorage_location
+    TestFileStorage_search
+    TestFileStorage_members
+    TestFileStorage_lazy
+    TestFileStorage_atomic_save
+    TestFileStorage_group_commit
+    TestFileStorage_transaction
+    TestFileStorage_binary
+    TestFileStorage_interning
 """
 import os
 import json
 import models
 import unittest
+import tracemalloc
 from datetime import datetime
+from io import StringIO
+from unittest.mock import patch
 from models.base_model import BaseModel
 from models.engine.file_storage import FileStorage
 from models.user import User
@@ -67,9 +87,13 @@ class TestFileStorage_methods(unittest.TestCase):
     def test_all(self):
         self.assertEqual(dict, type(models.storage.all()))
 
-    def test_all_with_arg(self):
+    def test_all_with_none(self):
+        self.assertIs(FileStorage._FileStorage__objects,
+                      models.storage.all(None))
+
+    def test_all_with_two_args(self):
         with self.assertRaises(TypeError):
-            models.storage.all(None)
+            models.storage.all(BaseModel, None)
 
     def test_new(self):
         bm = BaseModel()
@@ -167,5 +191,1641 @@ class TestFileStorage_methods(unittest.TestCase):
             models.storage.reload(None)
 
 
+class TestFileStorage_journal(unittest.TestCase):
+    """Unittests for testing the append-only journal mode of the
+    FileStorage class."""
+
+    @classmethod
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__changed = {}
+        FileStorage._FileStorage__journal = True
+
+    @classmethod
+    def tearDown(self):
+        FileStorage._FileStorage__journal = False
+        for name in ("file.json", "file.json.log", "file.json.log.1"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__changed = {}
+
+    def test_save_appends_only_changes(self):
+        bm = BaseModel()
+        us = User()
+        models.storage.save()
+        self.assertFalse(os.path.exists("file.json"))
+        us.first_name = "Betty"
+        us.save()
+        with open("file.json.log", "r") as f:
+            lines = f.readlines()
+        self.assertEqual(2, len(lines))
+        self.assertEqual({"BaseModel." + bm.id, "User." + us.id},
+                         set(json.loads(lines[0])))
+        self.assertEqual(["User." + us.id], list(json.loads(lines[1])))
+        self.assertEqual("Betty", json.loads(lines[1])["User." + us.id]
+                         ["first_name"])
+
+    def test_save_without_changes_writes_nothing(self):
+        models.storage.save()
+        self.assertFalse(os.path.exists("file.json.log"))
+
+    def test_delete_is_journaled(self):
+        bm = BaseModel()
+        models.storage.save()
+        models.storage.delete(bm)
+        models.storage.save()
+        self.assertNotIn("BaseModel." + bm.id, models.storage.all())
+        with open("file.json.log", "r") as f:
+            last = json.loads(f.readlines()[-1])
+        self.assertEqual({"BaseModel." + bm.id: None}, last)
+
+    def test_reload_replays_journal_over_snapshot(self):
+        st = State()
+        cy = City()
+        FileStorage._FileStorage__journal = False
+        models.storage.save()
+        FileStorage._FileStorage__journal = True
+        st.name = "California"
+        st.save()
+        models.storage.delete(cy)
+        am = Amenity()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        objs = FileStorage._FileStorage__objects
+        self.assertEqual("California", objs["State." + st.id].name)
+        self.assertNotIn("City." + cy.id, objs)
+        self.assertIn("Amenity." + am.id, objs)
+
+    def test_reload_merges_partial_record_over_snapshot(self):
+        us = User()
+        FileStorage._FileStorage__journal = False
+        models.storage.save()
+        FileStorage._FileStorage__journal = True
+        us.email = "betty@hbtn.io"
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual("betty@hbtn.io",
+                         models.storage.all()["User." + us.id].email)
+
+    def test_reload_streams_snapshot(self):
+        BaseModel()
+        FileStorage._FileStorage__journal = False
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        with patch("json.load", side_effect=AssertionError):
+            models.storage.reload()
+        self.assertEqual(1, models.storage.count())
+
+    def test_reload_ignores_torn_last_line(self):
+        bm = BaseModel()
+        models.storage.save()
+        with open("file.json.log", "a") as f:
+            f.write('{"BaseModel.torn": {"id": "to')
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertIn("BaseModel." + bm.id, models.storage.all())
+        self.assertNotIn("BaseModel.torn", models.storage.all())
+
+    def test_reload_drops_torn_transaction_whole(self):
+        BaseModel().save()
+        with models.storage.transaction():
+            st = State()
+            st.save()
+            cy = City()
+            cy.state_id = st.id
+            cy.save()
+        with open("file.json.log", "r+") as f:
+            f.truncate(len(f.read()) - 20)
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(1, models.storage.count())
+        self.assertNotIn("State." + st.id, models.storage.all())
+        self.assertNotIn("City." + cy.id, models.storage.all())
+
+    def test_snapshot_save_folds_journal(self):
+        bm = BaseModel()
+        models.storage.save()
+        FileStorage._FileStorage__journal = False
+        models.storage.save()
+        self.assertFalse(os.path.exists("file.json.log"))
+        with open("file.json", "r") as f:
+            self.assertIn("BaseModel." + bm.id, f.read())
+
+    def test_reload_truncates_torn_line_before_next_append(self):
+        BaseModel()
+        models.storage.save()
+        with open("file.json.log", "a") as f:
+            f.write('{"BaseModel.torn": {"id": "to')
+        models.storage.reload()
+        us = User()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertIn("User." + us.id, models.storage.all())
+
+
+class TestFileStorage_compaction(unittest.TestCase):
+    """Unittests for testing compaction of the FileStorage journal."""
+
+    @classmethod
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__changed = {}
+        FileStorage._FileStorage__journal = True
+
+    @classmethod
+    def tearDown(self):
+        models.storage.wait_compaction()
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__compact_size = 4 << 20
+        for name in ("file.json", "file.json.log", "file.json.log.1"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__changed = {}
+
+    def test_compact_folds_journal_into_snapshot(self):
+        bm = BaseModel()
+        us = User()
+        models.storage.save()
+        models.storage.delete(bm)
+        models.storage.save()
+        models.storage.compact()
+        self.assertFalse(os.path.exists("file.json.log"))
+        self.assertFalse(os.path.exists("file.json.log.1"))
+        with open("file.json", "r") as f:
+            snapshot = json.load(f)
+        self.assertEqual(["User." + us.id], list(snapshot))
+
+    def test_size_threshold_starts_background_compaction(self):
+        FileStorage._FileStorage__compact_size = 1
+        st = State()
+        models.storage.save()
+        models.storage.wait_compaction()
+        self.assertFalse(os.path.exists("file.json.log"))
+        with open("file.json", "r") as f:
+            self.assertIn("State." + st.id, f.read())
+
+    def test_compact_without_journal(self):
+        models.storage.compact()
+        self.assertFalse(os.path.exists("file.json"))
+
+    def test_leftover_rotated_journal_is_folded_first(self):
+        cy = City()
+        models.storage.save()
+        os.rename("file.json.log", "file.json.log.1")
+        pl = Place()
+        models.storage.save()
+        models.storage.compact()
+        self.assertFalse(os.path.exists("file.json.log.1"))
+        self.assertTrue(os.path.exists("file.json.log"))
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertIn("City." + cy.id, models.storage.all())
+        self.assertIn("Place." + pl.id, models.storage.all())
+
+    def test_reload_replays_rotated_journal(self):
+        rv = Review()
+        models.storage.save()
+        os.rename("file.json.log", "file.json.log.1")
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertIn("Review." + rv.id, models.storage.all())
+
+
+class TestFileStorage_dirty_tracking(unittest.TestCase):
+    """Unittests for testing change tracking and serialization caching
+    of the FileStorage class."""
+
+    @classmethod
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__changed = {}
+
+    @classmethod
+    def tearDown(self):
+        FileStorage._FileStorage__journal = False
+        for name in ("file.json", "file.json.log"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__changed = {}
+
+    def test_new_object_is_wholly_changed(self):
+        self.assertIsNone(models.storage.changes(User()))
+
+    def test_list_changed_in_place_is_saved(self):
+        pl = Place()
+        pl.amenity_ids = []
+        pl.save()
+        pl.amenity_ids.append("wifi")
+        models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(["wifi"],
+                             json.load(f)["Place." + pl.id]["amenity_ids"])
+
+    def test_list_changed_in_place_is_journaled(self):
+        FileStorage._FileStorage__journal = True
+        pl = Place()
+        pl.amenity_ids = []
+        pl.name = "Loft"
+        models.storage.save()
+        pl.amenity_ids.append("wifi")
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        loaded = models.storage.get(Place, pl.id)
+        self.assertEqual(["wifi"], loaded.amenity_ids)
+        loaded.amenity_ids.append("pool")
+        loaded.max_guest = 2
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        loaded = models.storage.get(Place, pl.id)
+        self.assertEqual(["wifi", "pool"], loaded.amenity_ids)
+        self.assertEqual(2, loaded.max_guest)
+        with open("file.json.log", "r") as f:
+            self.assertEqual(3, len(f.readlines()))
+        models.storage.save()
+        with open("file.json.log", "r") as f:
+            self.assertEqual(3, len(f.readlines()))
+
+    def test_setattr_records_attribute_names(self):
+        us = User()
+        models.storage.save()
+        self.assertEqual(set(), models.storage.changes(us))
+        us.first_name = "Betty"
+        us.last_name = "Holberton"
+        self.assertEqual({"first_name", "last_name"},
+                         models.storage.changes(us))
+
+    def test_delattr_marks_whole_object(self):
+        us = User()
+        us.email = "a@b.c"
+        models.storage.save()
+        del us.email
+        self.assertIsNone(models.storage.changes(us))
+
+    def test_unregistered_object_is_not_tracked(self):
+        bm = BaseModel(id="345")
+        bm.name = "x"
+        self.assertNotIn("BaseModel.345",
+                         FileStorage._FileStorage__changed)
+
+    def test_save_serializes_only_changed_objects(self):
+        objs = [BaseModel() for i in range(5)]
+        models.storage.save()
+        objs[2].name = "changed"
+        with patch.object(BaseModel, "to_dict",
+                          autospec=True,
+                          side_effect=BaseModel.to_dict) as to_dict:
+            models.storage.save()
+        self.assertEqual(1, to_dict.call_count)
+        with open("file.json", "r") as f:
+            snapshot = json.load(f)
+        self.assertEqual(5, len(snapshot))
+        self.assertEqual("changed",
+                         snapshot["BaseModel." + objs[2].id]["name"])
+
+    def test_save_keeps_json_format(self):
+        bm = BaseModel()
+        us = User()
+        models.storage.save()
+        ob_dct = FileStorage._FileStorage__objects
+        with open("file.json", "r") as f:
+            self.assertEqual(
+                json.dumps({k: o.to_dict() for k, o in ob_dct.items()}),
+                f.read())
+
+    def test_clean_save_allocates_no_copy_of_store(self):
+        for i in range(2000):
+            Place().name = "Place {}".format(i)
+        models.storage.save()
+        size = os.path.getsize("file.json")
+        tracemalloc.start()
+        models.storage.save()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self.assertLess(peak, size // 10)
+
+    def test_cache_is_pruned(self):
+        bm = BaseModel()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.save()
+        self.assertEqual({}, FileStorage._FileStorage__cache)
+
+    def test_journal_caches_nothing(self):
+        FileStorage._FileStorage__journal = True
+        FileStorage._FileStorage__cache = {}
+        for i in range(10):
+            Place().name = "Place {}".format(i)
+        models.storage.save()
+        self.assertEqual({}, FileStorage._FileStorage__cache)
+
+    def test_journal_drops_stale_cache(self):
+        st = State()
+        st.name = "California"
+        models.storage.save()
+        FileStorage._FileStorage__journal = True
+        st.name = "Nevada"
+        models.storage.save()
+        FileStorage._FileStorage__journal = False
+        models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual("Nevada", json.load(f)["State." + st.id]["name"])
+
+    def test_journal_writes_changed_attributes_only(self):
+        FileStorage._FileStorage__journal = True
+        pl = Place()
+        pl.name = "Loft"
+        models.storage.save()
+        pl.max_guest = 4
+        models.storage.save()
+        with open("file.json.log", "r") as f:
+            last = json.loads(f.readlines()[-1])
+        self.assertEqual({"Place." + pl.id: {"max_guest": 4}}, last)
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        reloaded = models.storage.all()["Place." + pl.id]
+        self.assertEqual("Loft", reloaded.name)
+        self.assertEqual(4, reloaded.max_guest)
+
+
+class TestFileStorage_class_index(unittest.TestCase):
+    """Unittests for testing all(cls) and count(cls) of the FileStorage
+    class."""
+
+    @classmethod
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    @classmethod
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_all_by_class_and_name(self):
+        cy1 = City()
+        cy2 = City()
+        State()
+        expected = {"City." + cy1.id: cy1, "City." + cy2.id: cy2}
+        self.assertEqual(expected, models.storage.all(City))
+        self.assertEqual(expected, models.storage.all("City"))
+
+    def test_all_unknown_class(self):
+        BaseModel()
+        self.assertEqual({}, models.storage.all("MyModel"))
+
+    def test_all_cls_returns_copy(self):
+        cy = City()
+        models.storage.all(City).clear()
+        self.assertIn("City." + cy.id, models.storage.all(City))
+
+    def test_count(self):
+        City()
+        City()
+        State()
+        self.assertEqual(3, models.storage.count())
+        self.assertEqual(2, models.storage.count(City))
+        self.assertEqual(1, models.storage.count("State"))
+        self.assertEqual(0, models.storage.count("Review"))
+
+    def test_delete_updates_index(self):
+        cy = City()
+        models.storage.delete(cy)
+        self.assertEqual(0, models.storage.count(City))
+        self.assertEqual({}, models.storage.all(City))
+
+    def test_reload_updates_index(self):
+        am = Amenity()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual(0, models.storage.count(Amenity))
+        models.storage.reload()
+        self.assertEqual(1, models.storage.count(Amenity))
+        self.assertIn("Amenity." + am.id, models.storage.all(Amenity))
+
+    def test_direct_removal_rebuilds_index(self):
+        rv = Review()
+        del models.storage.all()["Review." + rv.id]
+        self.assertEqual(0, models.storage.count(Review))
+
+    def test_direct_replacement_rebuilds_index(self):
+        cy1 = City()
+        models.storage.find(City, state_id="")
+        self.assertEqual({"City." + cy1.id: cy1}, models.storage.all(City))
+        cy2 = City.from_dict({})
+        del models.storage.all()["City." + cy1.id]
+        models.storage.all()["City." + cy2.id] = cy2
+        self.assertEqual({"City." + cy2.id: cy2}, models.storage.all(City))
+        self.assertEqual(["City." + cy2.id],
+                         list(models.storage.find(City, state_id="")))
+
+
+class TestFileStorage_find(unittest.TestCase):
+    """Unittests for testing find() and the attribute indexes of the
+    FileStorage class."""
+
+    @classmethod
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    @classmethod
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_find_by_indexed_attribute(self):
+        cy1 = City()
+        cy1.state_id = "CA"
+        cy2 = City()
+        cy2.state_id = "NY"
+        self.assertEqual({"City." + cy1.id: cy1},
+                         models.storage.find(City, state_id="CA"))
+        self.assertEqual({"City." + cy2.id: cy2},
+                         models.storage.find("City", state_id="NY"))
+
+    def test_find_by_several_attributes(self):
+        rv1 = Review()
+        rv1.place_id = "p1"
+        rv1.user_id = "u1"
+        rv2 = Review()
+        rv2.place_id = "p1"
+        rv2.user_id = "u2"
+        rv2.text = "Great"
+        self.assertEqual(2, len(models.storage.find(Review, place_id="p1")))
+        self.assertEqual({"Review." + rv2.id: rv2},
+                         models.storage.find(Review, place_id="p1",
+                                             user_id="u2"))
+        self.assertEqual({"Review." + rv2.id: rv2},
+                         models.storage.find(Review, text="Great"))
+
+    def test_find_follows_updates(self):
+        pl = Place()
+        pl.city_id = "c1"
+        self.assertEqual(1, len(models.storage.find(Place, city_id="c1")))
+        pl.city_id = "c2"
+        self.assertEqual({}, models.storage.find(Place, city_id="c1"))
+        self.assertEqual(1, len(models.storage.find(Place, city_id="c2")))
+
+    def test_find_follows_new_and_delete(self):
+        cy1 = City()
+        cy1.state_id = "CA"
+        self.assertEqual(1, len(models.storage.find(City, state_id="CA")))
+        cy2 = City()
+        cy2.state_id = "CA"
+        self.assertEqual(2, len(models.storage.find(City, state_id="CA")))
+        models.storage.delete(cy1)
+        self.assertEqual({"City." + cy2.id: cy2},
+                         models.storage.find(City, state_id="CA"))
+
+    def test_find_after_reload(self):
+        cy = City()
+        cy.state_id = "CA"
+        models.storage.save()
+        models.storage.find(City, state_id="CA")
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual({}, models.storage.find(City, state_id="CA"))
+        models.storage.reload()
+        found = models.storage.find(City, state_id="CA")
+        self.assertEqual(["City." + cy.id], list(found))
+        self.assertIsNot(cy, found["City." + cy.id])
+
+    def test_find_unknown_class(self):
+        self.assertEqual({}, models.storage.find("MyModel", id="1"))
+
+
+class TestFileStorage_columns(unittest.TestCase):
+    """Unittests for testing columns() and the column store of the
+    FileStorage class."""
+
+    @classmethod
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    @classmethod
+    def tearDown(self):
+        FileStorage._FileStorage__lazy = False
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+
+    def test_columns_of_existing_objects(self):
+        pl1 = Place()
+        pl1.price_by_night = 80
+        pl2 = Place()
+        pl2.price_by_night = 120
+        store = models.storage.columns(Place)
+        self.assertIs(store, models.storage.columns("Place"))
+        self.assertEqual({"Place." + pl1.id: pl1},
+                         store.select(("price_by_night", "<", 100)))
+        self.assertEqual(200, store.aggregate("sum", "price_by_night"))
+
+    def test_columns_of_class_without_columns(self):
+        self.assertIsNone(models.storage.columns(City))
+        self.assertIsNone(models.storage.columns("MyModel"))
+
+    def test_columns_follow_updates(self):
+        pl = Place()
+        store = models.storage.columns(Place)
+        pl.max_guest = 4
+        self.assertEqual(4, store.aggregate("max", "max_guest"))
+        pl.save()
+        self.assertEqual(4, store.aggregate("max", "max_guest"))
+        del pl.max_guest
+        self.assertEqual(0, store.aggregate("max", "max_guest"))
+
+    def test_columns_follow_new_and_delete(self):
+        store = models.storage.columns(Place)
+        pl1 = Place()
+        pl2 = Place()
+        self.assertEqual(2, len(store))
+        models.storage.delete(pl1)
+        self.assertEqual(["Place." + pl2.id], list(store.select()))
+
+    def test_columns_follow_rollback(self):
+        pl = Place()
+        pl.price_by_night = 80
+        store = models.storage.columns(Place)
+        with self.assertRaises(ValueError):
+            with models.storage.transaction():
+                pl.price_by_night = 500
+                Place()
+                raise ValueError("abort")
+        self.assertEqual(1, len(store))
+        self.assertEqual(80, store.aggregate("max", "price_by_night"))
+
+    def test_columns_after_reload(self):
+        pl = Place()
+        pl.latitude = 37.7
+        models.storage.save()
+        FileStorage._FileStorage__lazy = True
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        store = models.storage.columns(Place)
+        self.assertEqual(["Place." + pl.id],
+                         list(store.select(("latitude", ">", 37))))
+
+
+class TestFileStorage_query(unittest.TestCase):
+    """Unittests for testing query() of the FileStorage class."""
+
+    @classmethod
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+        self.pls = []
+        for i, (price, guests) in enumerate([(80, 2), (120, 4), (95, 6),
+                                             (60, 4), (99, 8)]):
+            pl = Place()
+            pl.price_by_night = price
+            pl.max_guest = guests
+            pl.name = "Place {}".format(i)
+            pl.city_id = "c{}".format(i % 2)
+            self.pls.append(pl)
+
+    @classmethod
+    def tearDown(self):
+        FileStorage._FileStorage__lazy = False
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+
+    def prices(self, query):
+        return [pl.price_by_night for pl in query]
+
+    def test_where(self):
+        query = models.storage.query(Place).where("price_by_night", "<", 100)
+        self.assertEqual({60, 80, 95, 99}, set(self.prices(query)))
+        query.where("max_guest", ">=", 4).where(city_id="c0")
+        self.assertEqual({95, 99}, set(self.prices(query)))
+
+    def test_order_by_and_limit(self):
+        query = models.storage.query("Place").order_by("price_by_night")
+        self.assertEqual([60, 80, 95, 99, 120], self.prices(query))
+        query.where("max_guest", ">=", 4).limit(2)
+        self.assertEqual([60, 95], self.prices(query))
+        query.order_by("name", reverse=True)
+        self.assertEqual([99, 60], self.prices(query))
+
+    def test_order_by_columnar_attribute_with_other_conditions(self):
+        query = models.storage.query(Place).where(city_id="c1")
+        query.order_by("max_guest", reverse=True)
+        self.assertEqual([self.pls[1], self.pls[3]], query.all())
+        query = models.storage.query(Place).where("name", "<", "Place 3")
+        query.order_by("max_guest", reverse=True).limit(1)
+        self.assertEqual([self.pls[2]], query.all())
+
+    def test_first_and_count(self):
+        query = models.storage.query(Place).where("name", ">=", "Place 3")
+        self.assertEqual(2, query.count())
+        self.assertEqual(60, query.order_by("name").first().price_by_night)
+        self.assertIsNone(models.storage.query(Place)
+                          .where("max_guest", ">", 8).first())
+
+    def test_query_follows_updates(self):
+        query = models.storage.query(Place).where("price_by_night", ">", 100)
+        self.assertEqual([120], self.prices(query))
+        self.pls[0].price_by_night = 150
+        models.storage.delete(self.pls[1])
+        self.assertEqual([150], self.prices(query))
+
+    def test_query_stops_at_limit(self):
+        query = models.storage.query(Place).limit(2)
+        with patch("models.engine.file_storage.matches",
+                   return_value=True) as matches:
+            self.assertEqual(2, len(query.all()))
+        self.assertEqual(2, matches.call_count)
+
+    def test_query_builds_only_what_it_uses(self):
+        def built():
+            return sorted(FileStorage._FileStorage__registry.get("Place",
+                                                                 ()))
+
+        query = models.storage.query(Place).where(name="Place 2")
+        self.assertEqual([95], self.prices(query))
+        self.assertEqual([], built())
+        query = models.storage.query(Place).order_by("updated_at")
+        self.assertEqual(self.pls, query.all())
+        self.assertEqual([("range", "updated_at")], built())
+        query = models.storage.query(Place).where("price_by_night", "<", 90)
+        self.assertEqual({60, 80}, set(self.prices(query)))
+        self.assertEqual([("range", "price_by_night"),
+                          ("range", "updated_at")], built())
+        query = models.storage.query(Place).order_by("max_guest").limit(1)
+        self.assertEqual([80], self.prices(query))
+        self.assertEqual([("column", None), ("range", "price_by_night"),
+                          ("range", "updated_at")], built())
+        query = models.storage.query(Place).where(city_id="c1")
+        self.assertEqual({60, 120}, set(self.prices(query)))
+        self.assertIn(("value", "city_id"), built())
+        self.assertNotIn(("value", "user_id"), built())
+
+    def test_query_unknown_class(self):
+        self.assertEqual([], models.storage.query("MyModel").all())
+
+    def test_lazy_query_builds_matches_only(self):
+        models.storage.save()
+        FileStorage._FileStorage__lazy = True
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        query = models.storage.query(Place).where("max_guest", ">=", 4)
+        query.order_by("price_by_night").limit(2)
+        self.assertEqual([60, 95], self.prices(query))
+        self.assertEqual(2, len(FileStorage._FileStorage__objects))
+        self.assertEqual(5, models.storage.count(Place))
+
+    def test_lazy_query_on_timestamps(self):
+        models.storage.save()
+        FileStorage._FileStorage__lazy = True
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        since = self.pls[3].created_at
+        query = models.storage.query(Place).where("created_at", ">=", since)
+        self.assertEqual([60, 99], self.prices(query.order_by("created_at")))
+
+    def test_order_puts_incomparable_values_last(self):
+        self.pls[0].city_id = "b"
+        self.pls[0].price_by_night = 3
+        self.pls[1].city_id = "b"
+        self.pls[1].price_by_night = "12"
+        query = models.storage.query(Place).where(city_id="b")
+        self.assertEqual([3, "12"],
+                         self.prices(query.order_by("price_by_night")))
+        self.assertEqual([3, "12"], self.prices(
+            query.order_by("price_by_night", reverse=True)))
+
+
+class TestFileStorage_ranges(unittest.TestCase):
+    """Unittests for testing the range indexes of the FileStorage
+    class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+        self.pls = []
+        for i, price in enumerate([80, 120, 95, 60, 99, 45]):
+            pl = Place()
+            pl.price_by_night = price
+            pl.updated_at = datetime(2024, 1, 1 + i)
+            self.pls.append(pl)
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+
+    def prices(self, query):
+        return [pl.price_by_night for pl in query]
+
+    def test_price_band(self):
+        query = models.storage.query(Place)
+        query.where("price_by_night", ">=", 80).where("price_by_night", "<",
+                                                      100)
+        self.assertEqual({80, 95, 99}, set(self.prices(query)))
+        self.assertEqual([80, 95, 99],
+                         self.prices(query.order_by("price_by_night")))
+
+    def test_band_walks_only_its_range(self):
+        query = models.storage.query(Place).where("price_by_night", ">", 90)
+        query.where("price_by_night", "<=", 99).where(max_guest=0)
+        with patch("models.engine.file_storage.matches",
+                   return_value=True) as matches:
+            self.assertEqual({95, 99}, set(self.prices(query)))
+        self.assertEqual(2, matches.call_count)
+        self.assertEqual([("max_guest", "==", 0)], matches.call_args[0][1])
+
+    def test_top_k_stops_at_limit(self):
+        query = models.storage.query(Place).where("max_guest", ">=", 0)
+        query.order_by("price_by_night", reverse=True).limit(2)
+        with patch("models.engine.file_storage.matches",
+                   return_value=True) as matches:
+            self.assertEqual([120, 99], self.prices(query))
+        self.assertEqual(2, matches.call_count)
+
+    def test_recently_updated(self):
+        query = models.storage.query(Place).order_by("updated_at",
+                                                     reverse=True)
+        self.assertEqual([45, 99], self.prices(query.limit(2)))
+        self.pls[2].save()
+        self.assertEqual([95, 45], self.prices(query))
+        query = models.storage.query(Place).where(
+            "updated_at", "<", datetime(2024, 1, 3))
+        self.assertEqual({80, 120}, set(self.prices(query)))
+
+    def test_writes_reindex_covering_indexes_only(self):
+        query = models.storage.query(Place).order_by("updated_at")
+        self.assertEqual(self.pls, query.all())
+        query.order_by("price_by_night").first()
+        with patch("models.engine.indexes.RangeIndex.add",
+                   autospec=True) as add:
+            self.pls[0].name = "Loft"
+            self.assertEqual(0, add.call_count)
+            self.pls[0].save()
+            self.assertEqual(1, add.call_count)
+            self.assertEqual("updated_at", add.call_args[0][0].attr)
+
+    def test_created_at(self):
+        query = models.storage.query(Place).order_by("created_at")
+        self.assertEqual(self.pls, query.all())
+
+    def test_follows_updates(self):
+        query = models.storage.query(Place).order_by("price_by_night")
+        self.assertEqual([45, 60], self.prices(query.limit(2)))
+        self.pls[0].price_by_night = 10
+        models.storage.delete(self.pls[5])
+        self.assertEqual([10, 60], self.prices(query))
+        pl = Place()
+        pl.price_by_night = 20
+        self.assertEqual([10, 20], self.prices(query))
+
+    def test_follows_console_update(self):
+        from console import my_command
+        with patch("sys.stdout", new=StringIO()):
+            my_command().onecmd('update Place {} price_by_night "30"'.format(
+                self.pls[1].id))
+        query = models.storage.query(Place).order_by("price_by_night")
+        self.assertEqual([self.pls[1]], query.limit(1).all())
+        self.assertEqual(30, self.pls[1].price_by_night)
+
+    def test_values_out_of_order_still_match(self):
+        self.pls[0].price_by_night = "80"
+        query = models.storage.query(Place).order_by("price_by_night")
+        self.assertEqual([45, 60, 95, 99, 120, "80"], self.prices(query))
+        query.where("price_by_night", "!=", 60)
+        self.assertEqual([45, 95, 99, 120, "80"], self.prices(query))
+
+
+class TestFileStorage_location(unittest.TestCase):
+    """Unittests for testing within() and nearby() of the FileStorage
+    class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+        self.pls = {}
+        for name, lat, lng in (("louvre", 48.8606, 2.3376),
+                               ("orsay", 48.8600, 2.3266),
+                               ("versailles", 48.8049, 2.1204),
+                               ("london", 51.5074, -0.1278)):
+            pl = self.pls[name] = Place()
+            pl.latitude = lat
+            pl.longitude = lng
+
+    def tearDown(self):
+        FileStorage._FileStorage__lazy = False
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+
+    def test_nearby(self):
+        found = models.storage.nearby(Place, 48.8566, 2.3522, 5)
+        self.assertEqual([self.pls["louvre"], self.pls["orsay"]], found)
+        found = models.storage.nearby("Place", 48.8566, 2.3522, 400, 3)
+        self.assertEqual([self.pls["louvre"], self.pls["orsay"],
+                          self.pls["versailles"]], found)
+
+    def test_within(self):
+        found = models.storage.within(Place, 48, 2, 49, 3)
+        self.assertEqual({"Place." + self.pls[name].id
+                          for name in ("louvre", "orsay", "versailles")},
+                         set(found))
+
+    def test_follows_updates(self):
+        self.assertEqual(1, len(models.storage.within(Place, 51, -1, 52, 0)))
+        self.pls["louvre"].latitude = 51.5
+        self.pls["louvre"].longitude = -0.12
+        models.storage.delete(self.pls["london"])
+        pl = Place()
+        pl.latitude = 51.51
+        pl.longitude = -0.13
+        self.assertEqual([self.pls["louvre"], pl],
+                         models.storage.nearby(Place, 51.5, -0.12, 10))
+
+    def test_no_location(self):
+        self.assertEqual({}, models.storage.within(User, -90, -180, 90, 180))
+        self.assertEqual([], models.storage.nearby("User", 0, 0, 100))
+        self.assertEqual([], models.storage.nearby("MyModel", 0, 0, 100))
+
+    def test_lazy_reload(self):
+        models.storage.save()
+        FileStorage._FileStorage__lazy = True
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        found = models.storage.nearby(Place, 48.8566, 2.3522, 5)
+        self.assertEqual([self.pls["louvre"].id, self.pls["orsay"].id],
+                         [pl.id for pl in found])
+
+
+class TestFileStorage_search(unittest.TestCase):
+    """Unittests for testing search() of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+        self.rv1 = Review()
+        self.rv1.text = "Great view, friendly host."
+        self.rv2 = Review()
+        self.rv2.text = "The view was great!"
+        self.pl = Place()
+        self.pl.name = "Sunny loft"
+        self.pl.description = "Great view on the river"
+
+    def tearDown(self):
+        FileStorage._FileStorage__lazy = False
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+
+    def keys(self, *objs):
+        return {"{}.{}".format(type(obj).__name__, obj.id) for obj in objs}
+
+    def test_search(self):
+        self.assertEqual(self.keys(self.rv1, self.rv2),
+                         set(models.storage.search(Review, "great VIEW")))
+        self.assertEqual(self.keys(self.rv1),
+                         set(models.storage.search("Review", "host")))
+        self.assertEqual(self.keys(self.pl),
+                         set(models.storage.search(Place, "loft river")))
+        self.assertEqual({}, models.storage.search(Review, "river"))
+
+    def test_not_searchable(self):
+        self.assertEqual({}, models.storage.search(User, "great"))
+        self.assertEqual({}, models.storage.search("MyModel", "great"))
+
+    def test_follows_changes(self):
+        self.assertEqual(2, len(models.storage.search(Review, "view")))
+        self.rv1.text = "Noisy street"
+        models.storage.delete(self.rv2)
+        rv = Review()
+        rv.text = "Nice view"
+        self.assertEqual(self.keys(rv),
+                         set(models.storage.search(Review, "view")))
+        self.assertEqual(self.keys(self.rv1),
+                         set(models.storage.search(Review, "noisy")))
+
+    def test_lazy_reload(self):
+        models.storage.save()
+        FileStorage._FileStorage__lazy = True
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(self.keys(self.rv1, self.rv2),
+                         set(models.storage.search(Review, "great")))
+
+
+class TestFileStorage_members(unittest.TestCase):
+    """Unittests for testing having() of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+        self.wifi = Amenity()
+        self.parking = Amenity()
+        self.pool = Amenity()
+        self.pl1 = Place()
+        self.pl1.amenity_ids = [self.wifi.id, self.parking.id]
+        self.pl2 = Place()
+        self.pl2.amenity_ids = [self.wifi.id, self.pool.id]
+        self.pl3 = Place()
+
+    def tearDown(self):
+        FileStorage._FileStorage__lazy = False
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+
+    def having(self, *args, **kwargs):
+        return set(models.storage.having(Place, "amenity_ids", *args,
+                                         **kwargs).values())
+
+    def test_all_of_and_any_of(self):
+        self.assertEqual({self.pl1}, self.having([self.wifi.id,
+                                                  self.parking.id]))
+        self.assertEqual({self.pl1, self.pl2},
+                         self.having(any_of=[self.parking.id, self.pool.id]))
+        self.assertEqual({self.pl2}, self.having(
+            [self.wifi.id], [self.pool.id, "spa"]))
+        self.assertEqual({self.pl1, self.pl2, self.pl3}, self.having())
+
+    def test_not_indexed(self):
+        self.assertEqual({}, models.storage.having(Place, "name", ["x"]))
+        self.assertEqual({}, models.storage.having("User", "amenity_ids"))
+
+    def test_follows_changes(self):
+        self.assertEqual({self.pl1}, self.having([self.parking.id]))
+        self.pl2.amenity_ids = [self.parking.id]
+        models.storage.delete(self.pl1)
+        pl = Place()
+        pl.amenity_ids = [self.parking.id, self.pool.id]
+        self.assertEqual({self.pl2, pl}, self.having([self.parking.id]))
+        self.assertEqual({pl}, self.having([self.pool.id]))
+
+    def test_lazy_reload(self):
+        models.storage.save()
+        FileStorage._FileStorage__lazy = True
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        found = models.storage.having(Place, "amenity_ids", [self.wifi.id])
+        self.assertEqual({"Place." + self.pl1.id, "Place." + self.pl2.id},
+                         set(found))
+
+
+class TestFileStorage_lazy(unittest.TestCase):
+    """Unittests for testing the lazy reload mode of the FileStorage
+    class."""
+
+    @classmethod
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+        self.st = State()
+        self.cy1 = City()
+        self.cy1.state_id = self.st.id
+        self.cy2 = City()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy = True
+        models.storage.reload()
+
+    @classmethod
+    def tearDown(self):
+        FileStorage._FileStorage__lazy = False
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+
+    def test_reload_builds_no_objects(self):
+        self.assertEqual({}, FileStorage._FileStorage__objects)
+
+    def test_count_without_building(self):
+        self.assertEqual(3, models.storage.count())
+        self.assertEqual(2, models.storage.count(City))
+        self.assertEqual(1, models.storage.count("State"))
+        self.assertEqual({}, FileStorage._FileStorage__objects)
+
+    def test_get_builds_one_object(self):
+        cy = models.storage.get(City, self.cy1.id)
+        self.assertEqual(self.st.id, cy.state_id)
+        self.assertEqual(["City." + self.cy1.id],
+                         list(FileStorage._FileStorage__objects))
+        self.assertIs(cy, models.storage.get("City", self.cy1.id))
+        self.assertEqual(2, models.storage.count(City))
+
+    def test_get_missing(self):
+        self.assertIsNone(models.storage.get(City, "nope"))
+        self.assertIsNone(models.storage.get(User, self.cy1.id))
+
+    def test_all_cls_builds_class(self):
+        self.assertEqual(2, len(models.storage.all(City)))
+        self.assertNotIn("State." + self.st.id,
+                         FileStorage._FileStorage__objects)
+
+    def test_all_builds_everything(self):
+        self.assertEqual(3, len(models.storage.all()))
+        self.assertEqual({}, FileStorage._FileStorage__pending)
+
+    def test_find_builds_class(self):
+        found = models.storage.find(City, state_id=self.st.id)
+        self.assertEqual(["City." + self.cy1.id], list(found))
+
+    def test_save_keeps_pending_records(self):
+        st = models.storage.get(State, self.st.id)
+        st.name = "Nevada"
+        models.storage.save()
+        with open("file.json", "r") as f:
+            snapshot = json.load(f)
+        self.assertEqual(3, len(snapshot))
+        self.assertEqual("Nevada", snapshot["State." + self.st.id]["name"])
+        self.assertEqual(self.st.id,
+                         snapshot["City." + self.cy1.id]["state_id"])
+
+    def test_new_replaces_pending_record(self):
+        cy = City(id=self.cy2.id, name="Reno")
+        models.storage.new(cy)
+        self.assertEqual(2, models.storage.count(City))
+        self.assertIs(cy, models.storage.get(City, self.cy2.id))
+
+    def test_delete_after_get(self):
+        models.storage.delete(models.storage.get(City, self.cy2.id))
+        models.storage.save()
+        self.assertEqual(1, models.storage.count(City))
+        with open("file.json", "r") as f:
+            self.assertNotIn(self.cy2.id, f.read())
+
+
+class TestFileStorage_atomic_save(unittest.TestCase):
+    """Unittests for testing that FileStorage.save() replaces the file
+    atomically."""
+
+    @classmethod
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    @classmethod
+    def tearDown(self):
+        FileStorage._FileStorage__fsync_dir = False
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_save_leaves_no_temp_file(self):
+        BaseModel()
+        models.storage.save()
+        self.assertEqual([], [n for n in os.listdir(".")
+                              if n.startswith("file.json.")])
+
+    def test_failed_save_keeps_previous_file(self):
+        bm = BaseModel()
+        models.storage.save()
+        with open("file.json", "r") as f:
+            before = f.read()
+        BaseModel()
+        with patch.object(BaseModel, "to_dict", side_effect=OSError):
+            with self.assertRaises(OSError):
+                models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(before, f.read())
+        self.assertEqual([], [n for n in os.listdir(".")
+                              if n.startswith("file.json.")])
+        models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(2, len(json.load(f)))
+
+    def test_save_fsyncs_file_and_directory(self):
+        FileStorage._FileStorage__fsync_dir = True
+        BaseModel()
+        with patch("os.fsync", wraps=os.fsync) as fsync:
+            models.storage.save()
+        self.assertEqual(2, fsync.call_count)
+
+
+class TestFileStorage_group_commit(unittest.TestCase):
+    """Unittests for testing the group commit mode of the FileStorage
+    class."""
+
+    @classmethod
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__changed = {}
+
+    @classmethod
+    def tearDown(self):
+        FileStorage._FileStorage__group_size = 0
+        FileStorage._FileStorage__group_window = 0
+        FileStorage._FileStorage__deferred = 0
+        FileStorage._FileStorage__deferred_since = None
+        FileStorage._FileStorage__journal = False
+        for name in ("file.json", "file.json.log"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__changed = {}
+
+    def test_group_size_coalesces_saves(self):
+        FileStorage._FileStorage__group_size = 3
+        BaseModel().save()
+        BaseModel().save()
+        self.assertFalse(os.path.exists("file.json"))
+        BaseModel().save()
+        with open("file.json", "r") as f:
+            self.assertEqual(3, len(json.load(f)))
+
+    def test_group_window_coalesces_saves(self):
+        FileStorage._FileStorage__group_window = 0.05
+        with patch("models.engine.file_storage.monotonic") as clock:
+            clock.return_value = 100.0
+            BaseModel().save()
+            clock.return_value = 100.01
+            BaseModel().save()
+            self.assertFalse(os.path.exists("file.json"))
+            self.assertEqual(2, FileStorage._FileStorage__deferred)
+            clock.return_value = 100.1
+            BaseModel().save()
+        self.assertEqual(0, FileStorage._FileStorage__deferred)
+        with open("file.json", "r") as f:
+            self.assertEqual(3, len(json.load(f)))
+
+    def test_flush_writes_deferred_saves(self):
+        FileStorage._FileStorage__group_size = 100
+        bm = BaseModel()
+        bm.save()
+        models.storage.flush()
+        with open("file.json", "r") as f:
+            self.assertIn("BaseModel." + bm.id, f.read())
+
+    def test_flush_without_deferred_saves(self):
+        BaseModel()
+        models.storage.flush()
+        self.assertFalse(os.path.exists("file.json"))
+
+    def test_journal_batch_is_one_append(self):
+        FileStorage._FileStorage__journal = True
+        FileStorage._FileStorage__group_size = 10
+        for i in range(9):
+            BaseModel().save()
+        self.assertFalse(os.path.exists("file.json.log"))
+        with patch("builtins.open", wraps=open) as opened:
+            BaseModel().save()
+        self.assertEqual(1, opened.call_count)
+        with open("file.json.log", "r") as f:
+            self.assertEqual(10, len(json.loads(f.read())))
+
+
+class TestFileStorage_transaction(unittest.TestCase):
+    """Unittests for testing transactions of the FileStorage class."""
+
+    @classmethod
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__changed = {}
+
+    @classmethod
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__changed = {}
+
+    def test_commit_writes_once(self):
+        with patch("models.engine.file_storage.replace",
+                   wraps=os.replace) as replace:
+            with models.storage.transaction():
+                pl = Place()
+                pl.save()
+                for i in range(3):
+                    rv = Review()
+                    rv.place_id = pl.id
+                    rv.save()
+            self.assertEqual(1, replace.call_count)
+        with open("file.json", "r") as f:
+            self.assertEqual(4, len(json.load(f)))
+
+    def test_no_write_inside_transaction(self):
+        with models.storage.transaction():
+            BaseModel().save()
+            self.assertFalse(os.path.exists("file.json"))
+
+    def test_commit_without_save_writes_nothing(self):
+        with models.storage.transaction():
+            BaseModel()
+        self.assertFalse(os.path.exists("file.json"))
+
+    def test_rollback_restores_objects(self):
+        st = State()
+        st.name = "California"
+        cy = City()
+        cy.state_id = st.id
+        models.storage.save()
+        models.storage.find(City, state_id=st.id)
+        with self.assertRaises(ValueError):
+            with models.storage.transaction():
+                st.name = "Nevada"
+                del st.name
+                models.storage.delete(cy)
+                am = Amenity()
+                am.save()
+                raise ValueError
+        self.assertEqual("California", st.name)
+        self.assertIs(cy, models.storage.get(City, cy.id))
+        self.assertEqual({"City." + cy.id: cy},
+                         models.storage.find(City, state_id=st.id))
+        self.assertNotIn("Amenity." + am.id, models.storage.all())
+        self.assertEqual(2, models.storage.count())
+        self.assertIsNone(models.storage.changes(st))
+
+    def test_rollback_restores_indexes(self):
+        pl = Place()
+        pl.city_id = "c1"
+        models.storage.find(Place, city_id="c1")
+        with self.assertRaises(KeyError):
+            with models.storage.transaction():
+                pl.city_id = "c2"
+                raise KeyError
+        self.assertEqual({"Place." + pl.id: pl},
+                         models.storage.find(Place, city_id="c1"))
+        self.assertEqual({}, models.storage.find(Place, city_id="c2"))
+
+    def test_rollback_writes_nothing(self):
+        with self.assertRaises(ValueError):
+            with models.storage.transaction():
+                BaseModel().save()
+                raise ValueError
+        self.assertFalse(os.path.exists("file.json"))
+
+    def test_rollback_keeps_earlier_changes(self):
+        us = User()
+        models.storage.save()
+        us.email = "a@b.c"
+        with self.assertRaises(ValueError):
+            with models.storage.transaction():
+                us.email = "x@y.z"
+                raise ValueError
+        self.assertEqual("a@b.c", us.email)
+        self.assertIsNone(models.storage.changes(us))
+
+    def test_flush_inside_transaction_is_deferred(self):
+        pl = Place()
+        pl.name = "orig"
+        models.storage.save()
+        with self.assertRaises(ValueError):
+            with models.storage.transaction():
+                pl.name = "rolled"
+                pl.save()
+                models.storage.flush()
+                raise ValueError
+        with open("file.json", "r") as f:
+            self.assertEqual("orig", json.load(f)["Place." + pl.id]["name"])
+
+    def test_rollback_marks_restored_objects_changed(self):
+        pl = Place()
+        pl.name = "orig"
+        models.storage.save()
+        with self.assertRaises(ValueError):
+            with models.storage.transaction():
+                pl.name = "rolled"
+                raise ValueError
+        self.assertIsNone(models.storage.changes(pl))
+        models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual("orig", json.load(f)["Place." + pl.id]["name"])
+
+    def test_nested_transaction_joins_outer(self):
+        with self.assertRaises(ValueError):
+            with models.storage.transaction():
+                bm = BaseModel()
+                with models.storage.transaction():
+                    bm.save()
+                self.assertFalse(os.path.exists("file.json"))
+                raise ValueError
+        self.assertNotIn("BaseModel." + bm.id, models.storage.all())
+
+
+class TestFileStorage_binary(unittest.TestCase):
+    """Unittests for testing the binary snapshot format of the
+    FileStorage class."""
+
+    @classmethod
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+        FileStorage._FileStorage__changed = {}
+        FileStorage._FileStorage__binary = True
+        FileStorage._FileStorage__file_path = "file.bin"
+
+    @classmethod
+    def tearDown(self):
+        FileStorage._FileStorage__binary = False
+        FileStorage._FileStorage__file_path = "file.json"
+        FileStorage._FileStorage__lazy = False
+        FileStorage._FileStorage__journal = False
+        for path in ("file.bin", "file.json.log"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+        FileStorage._FileStorage__changed = {}
+
+    def fill(self):
+        """Saves a State and two Cities, then empties the storage."""
+        self.st = State()
+        self.st.name = "California"
+        self.cy1 = City()
+        self.cy1.state_id = self.st.id
+        self.cy2 = City(id="not-a-uuid",
+                        created_at="2017-09-28T21:05:54.119427",
+                        updated_at="2017-09-28T21:05:54.119427")
+        models.storage.new(self.cy2)
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+
+    def test_save_writes_binary_file(self):
+        self.fill()
+        with open("file.bin", "rb") as f:
+            self.assertEqual(b"HBNBSNP1", f.read(8))
+
+    def test_reload(self):
+        self.fill()
+        models.storage.reload()
+        objs = FileStorage._FileStorage__objects
+        self.assertEqual(3, len(objs))
+        self.assertEqual(self.st.to_dict(),
+                         objs["State." + self.st.id].to_dict())
+        self.assertEqual(self.cy2.to_dict(),
+                         objs["City.not-a-uuid"].to_dict())
+
+    def test_lazy_reload_maps_snapshot(self):
+        self.fill()
+        FileStorage._FileStorage__lazy = True
+        models.storage.reload()
+        self.assertEqual({}, FileStorage._FileStorage__objects)
+        self.assertEqual(3, models.storage.count())
+        cy = models.storage.get(City, self.cy1.id)
+        self.assertEqual(self.st.id, cy.state_id)
+        self.assertEqual(["City." + self.cy1.id],
+                         list(FileStorage._FileStorage__objects))
+        self.assertEqual(2, models.storage.count(City))
+        self.assertEqual(1, len(models.storage.find(
+            City, state_id=self.st.id)))
+
+    def test_lazy_save_keeps_pending_records(self):
+        self.fill()
+        FileStorage._FileStorage__lazy = True
+        models.storage.reload()
+        st = models.storage.get(State, self.st.id)
+        st.name = "Nevada"
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+        models.storage.reload()
+        self.assertEqual(3, models.storage.count())
+        self.assertEqual("Nevada",
+                         models.storage.get(State, self.st.id).name)
+
+    def test_journal_over_lazy_snapshot(self):
+        self.fill()
+        FileStorage._FileStorage__journal = True
+        FileStorage._FileStorage__lazy = True
+        models.storage.reload()
+        st = models.storage.get(State, self.st.id)
+        st.name = "Nevada"
+        models.storage.delete(models.storage.get(City, self.cy1.id))
+        bm = BaseModel()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+        models.storage.reload()
+        self.assertEqual(3, models.storage.count())
+        self.assertEqual("Nevada",
+                         models.storage.get(State, self.st.id).name)
+        self.assertIsNone(models.storage.get(City, self.cy1.id))
+        self.assertIsNotNone(models.storage.get(BaseModel, bm.id))
+
+
+class TestFileStorage_interning(unittest.TestCase):
+    """Unittests for testing that FileStorage shares the strings
+    repeated across the records it reads."""
+
+    @classmethod
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+        self.pl = Place()
+        for i in range(2):
+            rv = Review()
+            rv.place_id = "-".join(["place"] * 8)
+            rv.user_id = self.pl.id
+        self.pl.amenity_ids = ["-".join(["amenity"] * 6)]
+        pl = Place()
+        pl.amenity_ids = ["-".join(["amenity"] * 6)]
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+
+    @classmethod
+    def tearDown(self):
+        FileStorage._FileStorage__lazy = False
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+
+    def test_foreign_keys_are_shared(self):
+        models.storage.reload()
+        rv1, rv2 = models.storage.all(Review).values()
+        self.assertIsNot(rv1, rv2)
+        self.assertIs(rv1.place_id, rv2.place_id)
+        self.assertIs(rv1.user_id, rv2.user_id)
+        pl1, pl2 = models.storage.all(Place).values()
+        self.assertIs(pl1.amenity_ids[0], pl2.amenity_ids[0])
+
+    def test_pending_records_are_shared(self):
+        FileStorage._FileStorage__lazy = True
+        models.storage.reload()
+        rv1, rv2 = FileStorage._FileStorage__pending["Review"].values()
+        self.assertIs(rv1["place_id"], rv2["place_id"])
+        self.assertIs(rv1["__class__"], rv2["__class__"])
+        for name1, name2 in zip(rv1, rv2):
+            self.assertIs(name1, name2)
+
+    def test_reloaded_objects_are_equal(self):
+        models.storage.reload()
+        self.assertEqual(self.pl.to_dict(),
+                         models.storage.get(Place, self.pl.id).to_dict())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+"""This script defines unittests for models/engine/geo.py
+
+Unittest classes:
+    TestGridIndex
+    TestGeo_helpers
+"""
+import unittest
+from models.engine.geo import (GridIndex, bounding_box, closest, distance,
+                               in_box, located)
+from models.place import Place
+
+PARIS = (48.8566, 2.3522)
+LONDON = (51.5074, -0.1278)
+
+
+class TestGridIndex(unittest.TestCase):
+    """Unittests for testing the GridIndex class."""
+
+    def setUp(self):
+        self.grid = GridIndex(("latitude", "longitude"))
+        self.pls = {}
+        for id, (lat, lng) in (("louvre", (48.8606, 2.3376)),
+                               ("orsay", (48.8600, 2.3266)),
+                               ("versailles", (48.8049, 2.1204)),
+                               ("london", LONDON),
+                               ("fiji", (-17.7, 179.99)),
+                               ("samoa", (-13.8, -179.9))):
+            self.add(id, latitude=lat, longitude=lng)
+
+    def add(self, id, **kwargs):
+        pl = self.pls[id] = Place(id=id, **kwargs)
+        self.grid.add("Place." + id, pl)
+        return pl
+
+    def ids(self, objs):
+        return sorted(key.split(".")[1] for key in objs)
+
+    def test_nearby(self):
+        found = self.grid.nearby(*PARIS, 5)
+        self.assertEqual(["louvre", "orsay"],
+                         [key.split(".")[1] for dist, key, obj in found])
+        self.assertLess(found[0][0], found[1][0])
+        self.assertIs(self.pls["louvre"], found[0][2])
+        found = self.grid.nearby(*PARIS, 400)
+        self.assertEqual(4, len(found))
+        self.assertEqual([], self.grid.nearby(0.0, 0.0, 100))
+
+    def test_nearby_across_the_180th_meridian(self):
+        found = self.grid.nearby(-16.0, 180.0, 500)
+        self.assertEqual(["fiji", "samoa"], self.ids(key for dist, key, obj
+                                                     in found))
+
+    def test_within(self):
+        self.assertEqual(["louvre", "orsay", "versailles"],
+                         self.ids(self.grid.within(48, 2, 49, 3)))
+        self.assertEqual(["fiji", "samoa"],
+                         self.ids(self.grid.within(-20, 179, -10, -179)))
+        self.assertEqual(6, len(self.grid.within(-90, -180, 90, 180)))
+
+    def test_discard_and_move(self):
+        self.grid.discard("Place.louvre")
+        self.grid.discard("Place.unknown")
+        pl = self.pls["london"]
+        pl.latitude, pl.longitude = 48.85, 2.35
+        self.grid.discard("Place.london")
+        self.grid.add("Place.london", pl)
+        self.assertEqual(["london", "orsay", "versailles"],
+                         self.ids(self.grid.within(48, 2, 49, 3)))
+        self.assertEqual(5, len(self.grid))
+
+    def test_invalid_positions_are_left_out(self):
+        self.add("text", latitude="48.86", longitude=2.34)
+        self.add("nan", latitude=float("nan"), longitude=2.34)
+        self.add("far", latitude=48.86, longitude=200.0)
+        self.assertEqual(6, len(self.grid))
+        self.grid.discard("Place.text")
+        self.assertEqual(6, len(self.grid))
+
+
+class TestGeo_helpers(unittest.TestCase):
+    """Unittests for testing the functions of the geo module."""
+
+    def test_distance(self):
+        self.assertAlmostEqual(343.5, distance(*PARIS, *LONDON), delta=0.5)
+        self.assertEqual(0.0, distance(*PARIS, *PARIS))
+        self.assertAlmostEqual(20015.1, distance(0, 0, 0, 180), delta=0.1)
+
+    def test_bounding_box(self):
+        south, west, north, east = bounding_box(*PARIS, 10)
+        self.assertLess(south, PARIS[0])
+        self.assertGreater(north, PARIS[0])
+        self.assertAlmostEqual(10, distance(south, PARIS[1], *PARIS))
+        self.assertAlmostEqual(10, distance(PARIS[0], east, *PARIS),
+                               delta=0.01)
+        self.assertLess(west, PARIS[1])
+
+    def test_bounding_box_across_the_180th_meridian(self):
+        south, west, north, east = bounding_box(0, 179.9, 50)
+        self.assertGreater(west, east)
+
+    def test_bounding_box_around_a_pole(self):
+        south, west, north, east = bounding_box(-89.9, 30, 50)
+        self.assertEqual((-90, -180, 180), (south, west, east))
+        self.assertLess(north, -89)
+
+    def test_in_box(self):
+        self.assertTrue(in_box(PARIS, 48, 2, 49, 3))
+        self.assertFalse(in_box(LONDON, 48, 2, 49, 3))
+        self.assertTrue(in_box((0, 179.5), -1, 179, 1, -179))
+        self.assertFalse(in_box((0, 0), -1, 179, 1, -179))
+        self.assertFalse(in_box(None, -90, -180, 90, 180))
+
+    def test_located(self):
+        attrs = ("latitude", "longitude")
+        self.assertEqual(PARIS, located(Place(latitude=PARIS[0],
+                                              longitude=PARIS[1]), attrs))
+        self.assertIsNone(located(Place(latitude="1", longitude=2), attrs))
+        self.assertIsNone(located(Place(latitude=91, longitude=2), attrs))
+
+    def test_closest(self):
+        items = [("a", Place(latitude=LONDON[0], longitude=LONDON[1])),
+                 ("b", Place(latitude=PARIS[0], longitude=PARIS[1])),
+                 ("c", Place(latitude=None, longitude=None))]
+        found = closest(*PARIS, 500, items, ("latitude", "longitude"))
+        self.assertEqual(["b", "a"], [key for dist, key, obj in found])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+"""This script defines unittests for models/engine/indexes.py
+
+Unittest classes:
+    TestValueIndex
+    TestRangeIndex
+"""
+import unittest
+from models.city import City
+from models.place import Place
+from models.engine.indexes import RangeIndex, ValueIndex
+
+
+class TestValueIndex(unittest.TestCase):
+    """Unittests for testing the ValueIndex class."""
+
+    def setUp(self):
+        self.index = ValueIndex("state_id")
+        self.cy1 = City(id="1", state_id="CA")
+        self.cy2 = City(id="2", state_id="CA")
+        self.cy3 = City(id="3", state_id="NY")
+        for cy in (self.cy1, self.cy2, self.cy3):
+            self.index.add("City." + cy.id, cy)
+
+    def test_lookup(self):
+        self.assertEqual({"City.1": self.cy1, "City.2": self.cy2},
+                         self.index.lookup("CA"))
+        self.assertEqual({"City.3": self.cy3}, self.index.lookup("NY"))
+
+    def test_lookup_missing_value(self):
+        self.assertEqual({}, self.index.lookup("TX"))
+
+    def test_lookup_unhashable_value(self):
+        self.assertEqual({}, self.index.lookup(["CA"]))
+
+    def test_discard(self):
+        self.index.discard("City.1")
+        self.index.discard("City.3")
+        self.index.discard("City.4")
+        self.assertEqual({"City.2": self.cy2}, self.index.lookup("CA"))
+        self.assertEqual({}, self.index.lookup("NY"))
+
+    def test_unhashable_values_are_candidates(self):
+        cy = City(id="4", state_id=["CA"])
+        self.index.add("City.4", cy)
+        self.assertIn("City.4", self.index.lookup("NY"))
+        self.index.discard("City.4")
+        self.assertNotIn("City.4", self.index.lookup("NY"))
+
+    def test_default_value_is_indexed(self):
+        cy = City(id="5")
+        self.index.add("City.5", cy)
+        self.assertEqual({"City.5": cy}, self.index.lookup(""))
+
+
+class TestRangeIndex(unittest.TestCase):
+    """Unittests for testing the RangeIndex class."""
+
+    def setUp(self):
+        self.index = RangeIndex("price_by_night", (int, float))
+        self.pls = [Place(id=str(i), price_by_night=price)
+                    for i, price in enumerate([80, 120, 95, 60, 95])]
+        self.index.extend(("Place." + pl.id, pl) for pl in self.pls)
+
+    def prices(self, *args, **kwargs):
+        return [pl.price_by_night
+                for pl in self.index.irange(*args, **kwargs)]
+
+    def test_irange(self):
+        self.assertEqual([60, 80, 95, 95, 120], self.prices())
+        self.assertEqual([120, 95, 95, 80, 60], self.prices(reverse=True))
+        self.assertEqual([80, 95, 95], self.prices((80, True), (95, True)))
+        self.assertEqual([95, 95], self.prices((80, False), (120, False)))
+        self.assertEqual([], self.prices((100, True), (90, True)))
+
+    def test_irange_orders_ties_by_key(self):
+        ties = list(self.index.irange((95, True), (95, True)))
+        self.assertEqual([self.pls[2], self.pls[4]], ties)
+        ties = list(self.index.irange((95, True), (95, True), True))
+        self.assertEqual([self.pls[4], self.pls[2]], ties)
+
+    def test_add_and_discard(self):
+        pl = Place(id="5", price_by_night=70)
+        self.index.add("Place.5", pl)
+        self.assertEqual([60, 70, 80], self.prices(high=(80, True)))
+        self.index.discard("Place.2")
+        self.index.discard("Place.0")
+        self.index.discard("Place.9")
+        self.assertEqual([60, 70, 95, 120], self.prices())
+        self.assertEqual(4, len(self.index))
+
+    def test_values_kept_unordered(self):
+        odd = [Place(id="5", price_by_night="80"),
+               Place(id="6", price_by_night=float("nan"))]
+        for pl in odd:
+            self.index.add("Place." + pl.id, pl)
+        self.assertEqual({"Place.5": odd[0], "Place.6": odd[1]},
+                         self.index.unordered())
+        self.assertEqual([60, 80, 95, 95, 120], self.prices())
+        self.index.discard("Place.5")
+        self.assertEqual({"Place.6": odd[1]}, self.index.unordered())
+
+    def test_bounds(self):
+        conditions = [("price_by_night", ">", 60), ("max_guest", "<", 4),
+                      ("price_by_night", "<=", "100"),
+                      ("price_by_night", "<=", 100),
+                      ("price_by_night", "<", 90)]
+        self.assertEqual(((60, False), (100, True)),
+                         self.index.bounds(conditions))
+        self.assertEqual(((95, True), (95, True)),
+                         self.index.bounds([("price_by_night", "==", 95)]))
+        self.assertEqual((None, None),
+                         self.index.bounds([("price_by_night", "!=", 95)]))
+
+    def test_count(self):
+        self.assertEqual(5, self.index.count())
+        self.assertEqual(3, self.index.count((90, True)))
+        self.assertEqual(0, self.index.count((100, True), (90, True)))
+        self.assertEqual(0, self.index.count(("90", True)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+"""This script defines unittests for models/engine/json_stream.py
+
+Unittest classes:
+    TestJsonStream_write
+    TestJsonStream_iter
+"""
+import json
+import unittest
+from io import StringIO
+from models.engine import json_stream
+
+
+class TestJsonStream_write(unittest.TestCase):
+    """Unittests for testing the streaming JSON writer."""
+
+    def test_fragment(self):
+        self.assertEqual('"a.1": {"id": "1"}',
+                         json_stream.fragment("a.1", {"id": "1"}))
+
+    def test_write_object_matches_json_dump(self):
+        records = {"a.1": {"id": "1", "n": [1, 2]}, "b.é": {"x": None}}
+        f = StringIO()
+        json_stream.write_object(
+            f, (json_stream.fragment(k, v) for k, v in records.items()))
+        self.assertEqual(json.dumps(records), f.getvalue())
+
+    def test_write_empty_object(self):
+        f = StringIO()
+        json_stream.write_object(f, iter(()))
+        self.assertEqual("{}", f.getvalue())
+
+    def test_write_object_consumes_lazily(self):
+        f = StringIO()
+        seen = []
+
+        def fragments():
+            for i in range(3):
+                seen.append(f.getvalue())
+                yield json_stream.fragment(str(i), i)
+        json_stream.write_object(f, fragments())
+        self.assertEqual(['{', '{"0": 0', '{"0": 0, "1": 1'], seen)
+
+
+class TestJsonStream_iter(unittest.TestCase):
+    """Unittests for testing the streaming JSON object parser."""
+
+    records = {
+        "BaseModel.{}".format(i): {
+            "id": str(i),
+            "number": i * 12345,
+            "text": "x" * (i % 40),
+            "list": [1.5, None, True, {"é": "\u00e9"}]
+        } for i in range(200)
+    }
+
+    def test_iter_object_any_chunk_size(self):
+        text = json.dumps(self.records)
+        for chunk_size in (1, 2, 3, 7, 64, 1 << 16):
+            members = json_stream.iter_object(StringIO(text), chunk_size)
+            self.assertEqual(self.records, dict(members))
+
+    def test_iter_object_keeps_order(self):
+        text = json.dumps(self.records)
+        keys = [k for k, v in json_stream.iter_object(StringIO(text), 5)]
+        self.assertEqual(list(self.records), keys)
+
+    def test_iter_object_numbers_split_across_chunks(self):
+        members = json_stream.iter_object(StringIO('{"a": 12345}'), 2)
+        self.assertEqual([("a", 12345)], list(members))
+
+    def test_iter_object_white_space(self):
+        text = ' \n{ "a" :\t{ } ,\n "b" : [ ] }\n'
+        members = json_stream.iter_object(StringIO(text), 3)
+        self.assertEqual({"a": {}, "b": []}, dict(members))
+
+    def test_iter_empty_object(self):
+        self.assertEqual([], list(json_stream.iter_object(StringIO("{}"))))
+
+    def test_iter_object_is_lazy(self):
+        members = json_stream.iter_object(StringIO('{"a": 1, "b": '), 4)
+        self.assertEqual(("a", 1), next(members))
+        with self.assertRaises(ValueError):
+            next(members)
+
+    def test_iter_invalid_documents(self):
+        for text in ("", "[]", '{"a" 1}', '{"a": 1', '{"a": 1 "b": 2}',
+                     "{1: 2}", '{"a": 1,}'):
+            with self.assertRaises(ValueError):
+                list(json_stream.iter_object(StringIO(text), 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+"""This script defines unittests for models/engine/query.py
+
+Unittest classes:
+    TestQuery
+    TestQuery_helpers
+"""
+import unittest
+from models.engine.query import MISSING, Query, matches, ordered
+from models.place import Place
+
+
+class TestQuery(unittest.TestCase):
+    """Unittests for testing the Query class."""
+
+    def setUp(self):
+        self.runs = []
+        self.query = Query("Place", self.fake_run)
+
+    def fake_run(self, *args):
+        self.runs.append(args)
+        return iter(["a", "b"])
+
+    def test_chained_calls_return_query(self):
+        self.assertIs(self.query, self.query.where("max_guest", ">", 2))
+        self.assertIs(self.query, self.query.where(city_id="c1"))
+        self.assertIs(self.query, self.query.order_by("price_by_night"))
+        self.assertIs(self.query, self.query.limit(5))
+
+    def test_iteration_runs_query(self):
+        self.query.where("max_guest", ">", 2).where(city_id="c1")
+        self.query.order_by("name", reverse=True).limit(5)
+        self.assertEqual(["a", "b"], self.query.all())
+        self.assertEqual([("Place", (("max_guest", ">", 2),
+                                     ("city_id", "==", "c1")),
+                           "name", True, 5)], self.runs)
+
+    def test_default_query(self):
+        self.assertEqual(2, self.query.count())
+        self.assertEqual([("Place", (), None, False, None)], self.runs)
+
+    def test_first(self):
+        self.assertEqual("a", self.query.first())
+        self.assertEqual(1, self.runs[0][4])
+        self.query.limit(0).first()
+        self.assertEqual(0, self.runs[1][4])
+
+    def test_invalid_where(self):
+        with self.assertRaises(TypeError):
+            self.query.where("max_guest", ">")
+        with self.assertRaises(ValueError):
+            self.query.where("max_guest", "=>", 2)
+
+    def test_negative_limit(self):
+        with self.assertRaises(ValueError):
+            self.query.limit(-1)
+
+
+class TestQuery_helpers(unittest.TestCase):
+    """Unittests for testing the functions of the query module."""
+
+    def test_matches(self):
+        pl = Place(id="1", price_by_night=80, name="Loft")
+        self.assertTrue(matches(pl, [("price_by_night", "<", 100),
+                                     ("name", "==", "Loft")]))
+        self.assertFalse(matches(pl, [("price_by_night", ">=", 100)]))
+        self.assertTrue(matches(pl, []))
+
+    def test_matches_incomparable_values(self):
+        pl = Place(id="1", price_by_night="80")
+        self.assertFalse(matches(pl, [("price_by_night", "<", 100)]))
+        self.assertFalse(matches(pl, [("rating", "==", None)]))
+        self.assertTrue(matches(pl, [("rating", "!=", None)]))
+
+    def test_ordered(self):
+        items = [3, 1, 2, MISSING, 1]
+        self.assertEqual([1, 1, 2, 3, MISSING],
+                         ordered(items, lambda item: item))
+        self.assertEqual([3, 2], ordered(items, lambda item: item,
+                                         reverse=True, limit=2))
+        self.assertEqual([], ordered(items, lambda item: item, limit=0))
+
+    def test_ordered_is_stable(self):
+        items = [("b", 1), ("a", 2), ("c", 1), ("d", 2)]
+        self.assertEqual([("b", 1), ("c", 1), ("a", 2), ("d", 2)],
+                         ordered(items, lambda item: item[1]))
+        self.assertEqual([("a", 2), ("d", 2), ("b", 1)],
+                         ordered(items, lambda item: item[1],
+                                 reverse=True, limit=3))
+
+    def test_ordered_incomparable_values_last(self):
+        nan = float("nan")
+        items = [3, "12", MISSING, nan, 1, "4", 2.5]
+        found = ordered(items, lambda item: item)
+        self.assertEqual([1, 2.5, 3, "12", "4"], found[:5])
+        self.assertIs(nan, found[5])
+        self.assertIs(MISSING, found[6])
+        self.assertEqual([3, 2.5], ordered(items, lambda item: item,
+                                           reverse=True, limit=2))
+        self.assertEqual([3, "12"], ordered([3, "12"], lambda item: item))
+        self.assertEqual([(1,), ("a",)],
+                         ordered([(1,), ("a",)], lambda item: item))
+
+
+if __name__ == "__main__":
+    unittest.main()
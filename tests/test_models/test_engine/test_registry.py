@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""This script defines unittests for models/engine/registry.py
+
+Unittest classes:
+    TestRegistry_build
+"""
+import unittest
+from datetime import datetime
+from models.amenity import Amenity
+from models.engine import registry
+from models.engine.bitmaps import MembershipIndex
+from models.engine.columns import ColumnStore
+from models.engine.geo import GridIndex
+from models.engine.indexes import RangeIndex, ValueIndex
+from models.engine.text import TextIndex
+from models.place import Place
+
+
+class TestRegistry_build(unittest.TestCase):
+    """Unittests for testing the build() function."""
+
+    def setUp(self):
+        self.pl1 = Place(id="1", city_id="c1", price_by_night=80,
+                         name="Sunny loft", amenity_ids=["a1"])
+        self.pl2 = Place(id="2", city_id="c2", price_by_night=60,
+                         name="Garden house", amenity_ids=[])
+        self.items = [("Place.1", self.pl1), ("Place.2", self.pl2)]
+
+    def test_every_kind(self):
+        kinds = {"value": ValueIndex, "range": RangeIndex,
+                 "member": MembershipIndex, "column": ColumnStore,
+                 "location": GridIndex, "text": TextIndex}
+        self.assertEqual(set(kinds), set(registry.KINDS))
+        attrs = {"value": "city_id", "range": "price_by_night",
+                 "member": "amenity_ids"}
+        for kind, cls in kinds.items():
+            index = registry.build(kind, Place, attrs.get(kind), self.items)
+            self.assertIs(cls, type(index))
+
+    def test_holds_items(self):
+        index = registry.build("value", Place, "city_id", self.items)
+        self.assertEqual({"Place.2": self.pl2}, index.lookup("c2"))
+        index = registry.build("range", Place, "price_by_night",
+                               iter(self.items))
+        self.assertEqual([self.pl2, self.pl1], list(index.irange()))
+        index = registry.build("text", Place, None, self.items)
+        self.assertEqual({"Place.1": self.pl1}, index.search("loft"))
+
+    def test_range_types(self):
+        index = registry.build("range", Place, "updated_at", [])
+        self.assertEqual((datetime,), index.types)
+        index = registry.build("range", Place, "price_by_night", [])
+        self.assertEqual((int, float), index.types)
+
+    def test_undeclared(self):
+        self.assertIsNone(registry.build("value", Place, "name", []))
+        self.assertIsNone(registry.build("range", Place, None, []))
+        self.assertIsNone(registry.build("column", Amenity, None, []))
+        self.assertIsNone(registry.build("location", Amenity, None, []))
+        self.assertIsNone(registry.build("text", None, None, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""This script defines unittests for models/engine/text.py
+
+Unittest classes:
+    TestTextIndex
+    TestText_helpers
+"""
+import unittest
+from models.engine.text import TextIndex, tokenize
+from models.place import Place
+
+
+class TestTextIndex(unittest.TestCase):
+    """Unittests for testing the TextIndex class."""
+
+    def setUp(self):
+        self.index = TextIndex(("name", "description"))
+        self.pl1 = Place(id="1", name="Sunny loft",
+                         description="A loft near the Louvre.")
+        self.pl2 = Place(id="2", name="Garden house",
+                         description="Quiet, sunny and near the park.")
+        self.pl3 = Place(id="3", name="Studio", description=None)
+        for pl in (self.pl1, self.pl2, self.pl3):
+            self.index.add("Place." + pl.id, pl)
+
+    def test_search(self):
+        self.assertEqual({"Place.1": self.pl1}, self.index.search("loft"))
+        self.assertEqual({"Place.1": self.pl1, "Place.2": self.pl2},
+                         self.index.search("SUNNY near"))
+        self.assertEqual({"Place.2": self.pl2},
+                         self.index.search("sunny, quiet!"))
+        self.assertEqual({"Place.3": self.pl3}, self.index.search("studio"))
+
+    def test_search_no_match(self):
+        self.assertEqual({}, self.index.search("loft park"))
+        self.assertEqual({}, self.index.search("castle"))
+        self.assertEqual({}, self.index.search("lof"))
+        self.assertEqual({}, self.index.search(" ,. "))
+
+    def test_discard(self):
+        self.index.discard("Place.1")
+        self.index.discard("Place.4")
+        self.assertEqual({}, self.index.search("loft"))
+        self.assertEqual({"Place.2": self.pl2}, self.index.search("sunny"))
+        self.assertEqual(2, len(self.index))
+
+    def test_add_replaces_words(self):
+        self.pl1.name = "Dark cellar"
+        self.index.discard("Place.1")
+        self.index.add("Place.1", self.pl1)
+        self.assertEqual({}, self.index.search("sunny loft louvre"))
+        self.assertEqual({"Place.1": self.pl1},
+                         self.index.search("cellar louvre"))
+
+
+class TestText_helpers(unittest.TestCase):
+    """Unittests for testing the functions of the text module."""
+
+    def test_tokenize(self):
+        self.assertEqual(["great", "view", "5", "stars", "café"],
+                         tokenize("Great view; 5 stars, CAFÉ!"))
+        self.assertEqual(["strasse"], tokenize("Straße"))
+        self.assertEqual([], tokenize(""))
+        self.assertEqual([], tokenize(None))
+        self.assertEqual([], tokenize(42))
+
+
+if __name__ == "__main__":
+    unittest.main()